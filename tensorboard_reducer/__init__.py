@@ -5,10 +5,22 @@ Author: Janosh Riebesell (2021-04-04)
 
 from importlib.metadata import PackageNotFoundError, version
 
-from tensorboard_reducer.load import load_tb_events
+from tensorboard_reducer.check import check_tb_events
+from tensorboard_reducer.hooks import JsonLinesObserver, Observer
+from tensorboard_reducer.load import RaggedScalars, load_tb_events
 from tensorboard_reducer.main import main
-from tensorboard_reducer.reduce import reduce_events
-from tensorboard_reducer.write import write_data_file, write_tb_events
+from tensorboard_reducer.pyramid import add_pyramid_levels
+from tensorboard_reducer.reduce import (
+    iter_reduced_tags,
+    reduce_events,
+    register_reduce_op,
+)
+from tensorboard_reducer.write import (
+    read_npy_dir,
+    write_data_file,
+    write_npy_dir,
+    write_tb_events,
+)
 
 try:
     __version__ = version("tensorboard-reducer")
@@ -0,0 +1,79 @@
+"""Bootstrap confidence intervals of the mean across runs."""
+
+from __future__ import annotations
+
+import functools
+
+import numpy as np
+
+from tensorboard_reducer import robust
+
+# upper bound on the number of resampled means (steps x resamples) held at once
+_MAX_CHUNK_VALUES = 2**24
+
+
+@functools.lru_cache(maxsize=16)
+def resample_counts(n_runs: int, n_resamples: int, seed: int) -> np.ndarray:
+    """Draw bootstrap resamples of n_runs runs with replacement.
+
+    Drawn once per (n_runs, n_resamples, seed) and shared by all steps and tags, so
+    every step uses the same resamples and results are reproducible.
+
+    Args:
+        n_runs (int): Number of runs to resample.
+        n_resamples (int): Number of bootstrap resamples.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        np.ndarray: Read-only array of shape (n_runs, n_resamples) counting how often
+            each run was drawn into each resample.
+    """
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n_runs, size=(n_resamples, n_runs))
+    flat_ids = (draws + n_runs * np.arange(n_resamples)[:, None]).ravel()
+    counts = np.bincount(flat_ids, minlength=n_resamples * n_runs)
+    counts = counts.reshape(n_resamples, n_runs).T.astype(np.float64)
+    counts.setflags(write=False)
+    return counts
+
+
+def mean_ci(
+    block: np.ndarray, *, level: float = 95, n_resamples: int = 1000, seed: int = 0
+) -> np.ndarray:
+    """Percentile bootstrap confidence interval of the mean of each row.
+
+    Resampled means of all steps are computed at once as a matrix product of the
+    block with the resample counts, in chunks of steps to bound memory. Runs that
+    didn't record a step (NaN) are left out of that step's resampled means.
+
+    Args:
+        block (np.ndarray): Array of shape (n_steps, n_runs).
+        level (float, optional): Confidence level in percent. Defaults to 95.
+        n_resamples (int, optional): Number of bootstrap resamples. Defaults to 1000.
+        seed (int, optional): Seed for drawing resamples. Defaults to 0.
+
+    Returns:
+        np.ndarray: Array of shape (n_steps, 2) with lower and upper bounds. NaN for
+            steps without values.
+    """
+    n_steps, n_runs = block.shape
+    counts = resample_counts(n_runs, n_resamples, seed)
+    valid = ~np.isnan(block)
+    values = np.where(valid, block, 0)
+    tail = (100 - level) / 2
+    kth = [
+        *robust.percentile_kth(n_resamples, tail),
+        *robust.percentile_kth(n_resamples, 100 - tail),
+    ]
+
+    bounds = np.empty((n_steps, 2))
+    chunk_len = max(1, _MAX_CHUNK_VALUES // n_resamples)
+    for lo in range(0, n_steps, chunk_len):
+        rows = slice(lo, lo + chunk_len)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # NaN for resamples that only drew runs missing a step
+            means = (values[rows] @ counts) / (valid[rows] @ counts)
+        part = robust.partition_rows(means, kth)
+        bounds[rows, 0] = robust.percentile(part, tail)
+        bounds[rows, 1] = robust.percentile(part, 100 - tail)
+    return bounds
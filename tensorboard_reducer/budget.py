@@ -0,0 +1,129 @@
+"""Plan loading and reducing tags in batches that fit a memory budget.
+
+Footprints are estimated from a cheap preflight scan of each run's per-tag step
+counts (see check_tb_events()): parsed runs take a step and a value per record
+and reducing a tag needs a few copies of its aligned (n_steps, n_runs) array.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import itertools
+import math
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+# rough memory overhead of each per-run DataFrame
+_DF_OVERHEAD = 4096
+# copies of a tag's aligned array alive while reducing it: the array itself, its
+# float64 upcast and a sorted/partitioned or masked copy
+_WORK_COPIES = 3
+_STEP_BYTES = np.dtype(np.int64).itemsize
+
+
+class TagBatch(NamedTuple):
+    """Tags to load and reduce together. If step_ranges isn't None, the batch is a
+    single tag too large for the budget, to be reduced one step range at a time.
+    """
+
+    tags: list[str]
+    step_ranges: list[tuple[int, int]] | None = None
+
+
+def tag_footprints(
+    run_stats: dict[str, dict[str, dict[str, int]]],
+    *,
+    itemsize: int,
+    tags: Collection[str] | None = None,
+) -> dict[str, tuple[int, int]]:
+    """Estimate the memory needed to load and to reduce each tag.
+
+    Args:
+        run_stats (dict[str, dict[str, dict[str, int]]]): The 'runs' entry of
+            check_tb_events().
+        itemsize (int): Bytes per loaded value (8 for float64, 4 for float32).
+        tags (Collection[str] | None, optional): Only include tags matching these
+            patterns. Defaults to None meaning all tags.
+
+    Returns:
+        dict[str, tuple[int, int]]: Map of tag to the bytes of its parsed values
+            across all runs and the extra bytes needed while reducing it.
+    """
+    footprints: dict[str, tuple[int, int]] = {}
+    all_tags = dict.fromkeys(tag for stats in run_stats.values() for tag in stats)
+    for tag in all_tags:
+        if tags is not None and not any(fnmatch.fnmatchcase(tag, p) for p in tags):
+            continue
+        tag_stats = [stats[tag] for stats in run_stats.values() if tag in stats]
+        loaded = sum(
+            (st["n_steps"] + st["n_duplicates"]) * (_STEP_BYTES + itemsize)
+            + _DF_OVERHEAD
+            for st in tag_stats
+        )
+        n_rows = max(st["n_steps"] for st in tag_stats)
+        working = n_rows * len(tag_stats) * np.dtype(np.float64).itemsize
+        footprints[tag] = (loaded, working * _WORK_COPIES)
+    return footprints
+
+
+def _split_steps(first: int, last: int, n_chunks: int) -> list[tuple[int, int]]:
+    """Cut the inclusive range [first, last] into n_chunks similar ranges."""
+    edges = np.linspace(first, last + 1, n_chunks + 1).round().astype(int)
+    return [(int(lo), int(hi) - 1) for lo, hi in itertools.pairwise(edges) if hi > lo]
+
+
+def plan_batches(
+    run_stats: dict[str, dict[str, dict[str, int]]],
+    max_memory: int,
+    *,
+    itemsize: int = 8,
+    tags: Collection[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+) -> list[TagBatch]:
+    """Group tags into batches whose parsed values plus the working memory of the
+    largest tag stay within max_memory. Tags that don't fit on their own are
+    split into step ranges, assuming steps are spread evenly over their range.
+
+    Args:
+        run_stats (dict[str, dict[str, dict[str, int]]]): The 'runs' entry of
+            check_tb_events().
+        max_memory (int): Memory budget in bytes.
+        itemsize (int, optional): Bytes per loaded value. Defaults to 8.
+        tags (Collection[str] | None, optional): Tag patterns to include. Defaults
+            to None meaning all tags.
+        steps (tuple[int | None, int | None] | None, optional): Inclusive step
+            range to load. Defaults to None meaning all steps.
+
+    Returns:
+        list[TagBatch]: Batches covering every tag exactly once.
+    """
+    batches: list[TagBatch] = []
+    batch: list[str] = []
+    batch_loaded = batch_working = 0
+    first_step, last_step = steps or (None, None)
+    footprints = tag_footprints(run_stats, itemsize=itemsize, tags=tags)
+    for tag, (loaded, working) in footprints.items():
+        if loaded + working > max_memory:
+            tag_stats = [stats[tag] for stats in run_stats.values() if tag in stats]
+            first = min(st["first_step"] for st in tag_stats)
+            last = max(st["last_step"] for st in tag_stats)
+            if first_step is not None:
+                first = max(first, first_step)
+            if last_step is not None:
+                last = min(last, last_step)
+            n_chunks = math.ceil((loaded + working) / max_memory)
+            batches.append(TagBatch([tag], _split_steps(first, last, n_chunks)))
+            continue
+        if batch and batch_loaded + loaded + max(batch_working, working) > max_memory:
+            batches.append(TagBatch(batch))
+            batch, batch_loaded, batch_working = [], 0, 0
+        batch.append(tag)
+        batch_loaded += loaded
+        batch_working = max(batch_working, working)
+    if batch:
+        batches.append(TagBatch(batch))
+    return batches
@@ -0,0 +1,195 @@
+"""Fast preflight validation of TensorBoard runs before loading them."""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from tensorboard_reducer.event_loader import EventAccumulator
+from tensorboard_reducer.load import _check_input_dirs
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from tensorboard_reducer.load import HandleDupSteps
+
+
+class _StepScanner(EventAccumulator):
+    """EventAccumulator that only records which steps each scalar tag was logged at
+    instead of keeping every value in memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        verify_crc: bool = True,
+        tags: Collection[str] | None = None,
+        steps: tuple[int | None, int | None] | None = None,
+    ) -> None:
+        super().__init__(path, verify_crc=verify_crc, tags=tags, steps=steps)
+        self.steps: dict[str, set[int]] = {}
+        self.n_records: dict[str, int] = {}
+
+    def _process_scalar(
+        self, tag: str, wall_time: float, step: int, scalar: float
+    ) -> None:
+        del wall_time, scalar  # only steps matter here
+        self.steps.setdefault(tag, set()).add(step)
+        self.n_records[tag] = self.n_records.get(tag, 0) + 1
+
+
+def _scan_run(
+    path: str,
+    verify_crc: bool,  # noqa: FBT001
+    tags: Collection[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+) -> dict[str, dict[str, int]]:
+    """Summarize the steps of every scalar tag in a run directory that passes the
+    tags and steps filters.
+
+    Returns:
+        dict[str, dict[str, int]]: Map of tag to n_steps (unique), n_duplicates,
+            first_step and last_step.
+    """
+    scanner = _StepScanner(path, verify_crc=verify_crc, tags=tags, steps=steps)
+    scanner.reload()
+    return {
+        tag: {
+            "n_steps": len(steps),
+            "n_duplicates": scanner.n_records[tag] - len(steps),
+            "first_step": min(steps),
+            "last_step": max(steps),
+        }
+        for tag, steps in sorted(scanner.steps.items())
+    }
+
+
+def check_tb_events(
+    input_dirs: list[str],
+    *,
+    strict_tags: bool = True,
+    strict_steps: bool = True,
+    handle_dup_steps: HandleDupSteps = None,
+    verify_crc: bool = True,
+    tags: Collection[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """Validate runs against the same safety checks load_tb_events() applies (equal
+    tags, equal step counts, no duplicate steps) without building any DataFrames.
+
+    Runs are scanned in parallel processes and only step numbers are kept in memory,
+    so a mistyped glob or a crashed seed is reported in seconds rather than after
+    fully loading all runs.
+
+    Args:
+        input_dirs (list[str]): Directory names containing TensorBoard runs.
+        strict_tags (bool, optional): Whether runs with different sets of tags count
+            as a problem. Defaults to True.
+        strict_steps (bool, optional): Whether equal tags with unequal numbers of
+            steps across runs count as a problem. Defaults to True.
+        handle_dup_steps (str|None, optional): Duplicate steps only count as a problem
+            if this is None, same as in load_tb_events(). Defaults to None.
+        verify_crc (bool, optional): Whether to validate record checksums.
+            Defaults to True.
+        tags (Collection[str] | None, optional): Only check scalars whose tag
+            matches one of these patterns, see load_tb_events(). A pattern matching
+            no tag in any run is reported as no scalar data. Defaults to None.
+        steps (tuple[int | None, int | None] | None, optional): Only check scalars
+            in this inclusive step range, see load_tb_events(). Defaults to None.
+        workers (int | None, optional): Number of processes to scan runs with.
+            Defaults to None meaning one per CPU core. 1 scans in the current process.
+
+    Returns:
+        dict[str, Any]: JSON-serializable report with keys 'runs' (per-run tag step
+            stats), 'missing_tags' (run -> tags other runs have), 'unequal_steps'
+            (tag -> run -> n_steps), 'duplicate_steps' (run -> tag -> n_duplicates)
+            and 'ok' (whether no problems were found).
+    """
+    _check_input_dirs(input_dirs)
+
+    if workers == 1 or len(input_dirs) == 1:
+        run_stats = [
+            _scan_run(in_dir, verify_crc, tags, steps) for in_dir in input_dirs
+        ]
+    else:
+        n_runs = len(input_dirs)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            run_stats = list(
+                pool.map(
+                    _scan_run,
+                    input_dirs,
+                    [verify_crc] * n_runs,
+                    [tags] * n_runs,
+                    [steps] * n_runs,
+                )
+            )
+    runs = dict(zip(input_dirs, run_stats, strict=True))
+
+    all_tags = sorted({tag for stats in run_stats for tag in stats})
+    missing_tags = {
+        in_dir: missing
+        for in_dir, stats in runs.items()
+        if (missing := [tag for tag in all_tags if tag not in stats])
+    }
+    unequal_steps = {}
+    for tag in all_tags:
+        n_steps = {
+            in_dir: stats[tag]["n_steps"]
+            for in_dir, stats in runs.items()
+            if tag in stats
+        }
+        if len(set(n_steps.values())) > 1:
+            unequal_steps[tag] = n_steps
+    duplicate_steps = {}
+    for in_dir, stats in runs.items():
+        dups = {tag: s["n_duplicates"] for tag, s in stats.items() if s["n_duplicates"]}
+        if dups:
+            duplicate_steps[in_dir] = dups
+
+    ok = not (
+        (strict_tags and missing_tags)
+        or (strict_steps and unequal_steps)
+        or (handle_dup_steps is None and duplicate_steps)
+        or not all_tags
+    )
+    return {
+        "runs": runs,
+        "missing_tags": missing_tags,
+        "unequal_steps": unequal_steps,
+        "duplicate_steps": duplicate_steps,
+        "ok": ok,
+    }
+
+
+def format_check_report(report: dict[str, Any], *, as_json: bool = False) -> str:
+    """Turn a check_tb_events() report into a human-readable summary or JSON.
+
+    Args:
+        report (dict[str, Any]): Output of check_tb_events().
+        as_json (bool, optional): Whether to return the full report as JSON.
+            Defaults to False.
+
+    Returns:
+        str: Report text.
+    """
+    if as_json:
+        return json.dumps(report, indent=2)
+
+    runs = report["runs"]
+    n_tags = len({tag for stats in runs.values() for tag in stats})
+    lines = [f"Checked {len(runs)} runs with {n_tags} scalar tags"]
+    if n_tags == 0:
+        lines.append("- no scalar data found in any run")
+    for in_dir, tags in report["missing_tags"].items():
+        lines.append(f"- {in_dir} missing tags: {', '.join(tags)}")
+    for tag, n_steps in report["unequal_steps"].items():
+        counts = ", ".join(f"{in_dir}: {n}" for in_dir, n in n_steps.items())
+        lines.append(f"- unequal number of steps for tag '{tag}': {counts}")
+    for in_dir, dups in report["duplicate_steps"].items():
+        counts = ", ".join(f"'{tag}': {n}" for tag, n in dups.items())
+        lines.append(f"- {in_dir} has duplicate steps: {counts}")
+    lines.append("OK" if report["ok"] else "Found problems, see above")
+    return "\n".join(lines)
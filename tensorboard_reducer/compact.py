@@ -0,0 +1,204 @@
+"""Rewrite run directories into scalar-only event files so later loads don't have
+to wade through images, histograms and other non-scalar records.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, TYPE_CHECKING, Any
+
+from tensorboard.compat.proto.event_pb2 import Event
+
+from tensorboard_reducer.event_loader import (
+    _SCALARS_PLUGIN,
+    EventAccumulator,
+    _masked_crc32c,
+)
+from tensorboard_reducer.write import _rm_rf_or_raise
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from tensorboard.compat.proto.summary_pb2 import Summary
+
+
+def _write_record(file: IO[bytes], payload: bytes) -> None:
+    """Append payload to file as a TFRecord (length, CRCs and payload)."""
+    header = struct.pack("<Q", len(payload))
+    file.write(header)
+    file.write(struct.pack("<I", _masked_crc32c(header)))
+    file.write(payload)
+    file.write(struct.pack("<I", _masked_crc32c(payload)))
+
+
+class _ScalarCompactor(EventAccumulator):
+    """EventAccumulator that writes every event's scalar summary values (filtered by
+    tags and steps) to a new event file instead of keeping them in memory.
+
+    Summary values are copied as is, so steps, wall times and value dtypes (e.g. TF2
+    double tensors) are preserved exactly.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        file: IO[bytes],
+        *,
+        verify_crc: bool = True,
+        tags: Sequence[str] | None = None,
+        steps: tuple[int | None, int | None] | None = None,
+    ) -> None:
+        super().__init__(path, verify_crc=verify_crc, tags=tags, steps=steps)
+        self._file = file
+        self.n_scalars = 0
+        # TF2 tensor tags whose plugin metadata was already written, see _keep_value()
+        self._tagged: set[str] = set()
+
+    def _process_event(self, event: Event) -> None:
+        if self._first_event_timestamp is None:
+            # open the new file at the source run's start so elapsed times measured
+            # from the first event (see load_run(wall_time=True)) stay the same
+            self._first_event_timestamp = event.wall_time
+            self.write_file_version()
+        if not event.HasField("summary"):
+            return
+        values = [val for val in event.summary.value if self._keep_value(val, event)]
+        if not values:
+            return
+        out = Event(wall_time=event.wall_time, step=event.step)
+        out.summary.value.extend(values)
+        _write_record(self._file, out.SerializeToString())
+        self.n_scalars += len(values)
+
+    def write_file_version(self) -> None:
+        """Write the file_version record every event file starts with, stamped with
+        the first event's wall time or the current time if there was none.
+        """
+        wall_time = self._first_event_timestamp or time.time()
+        out = Event(wall_time=wall_time, file_version="brain.Event:2")
+        _write_record(self._file, out.SerializeToString())
+
+    def _keep_value(self, value: Summary.Value, event: Event) -> bool:
+        if value.HasField("simple_value"):
+            return self._keep(value.tag, event.step)
+        if not (value.HasField("tensor") and self._is_scalar_tensor(value)):
+            return False
+        if not self._keep(value.tag, event.step):
+            return False
+        # TF2 only writes plugin metadata with a tag's first value. If that value was
+        # filtered out, add the metadata to the first one kept so the tag is still
+        # recognized as scalar.
+        if value.tag not in self._tagged:
+            self._tagged.add(value.tag)
+            value.metadata.plugin_data.plugin_name = _SCALARS_PLUGIN
+        return True
+
+
+def compact_run(
+    in_dir: str,
+    out_dir: str,
+    *,
+    verify_crc: bool = True,
+    tags: Sequence[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    overwrite: bool = False,
+) -> dict[str, Any]:
+    """Copy the scalars of one run directory into a single scalar-only event file.
+
+    Args:
+        in_dir (str): Run directory or fsspec URL to compact.
+        out_dir (str): Local directory to write the new event file to.
+        verify_crc (bool, optional): Whether to validate record checksums.
+            Defaults to True.
+        tags (Sequence[str] | None, optional): Tag patterns to keep, see
+            load_tb_events(). Defaults to None meaning all scalar tags.
+        steps (tuple[int | None, int | None] | None, optional): Inclusive step range
+            to keep. Defaults to None meaning all steps.
+        overwrite (bool, optional): Whether to overwrite an existing out_dir.
+            Defaults to False.
+
+    Returns:
+        dict[str, Any]: Path of the new event file ('event_file') and number of
+            scalar values it holds ('n_scalars').
+    """
+    _rm_rf_or_raise(out_dir, overwrite=overwrite)
+    os.makedirs(out_dir)
+    # same naming scheme as TensorBoard's writers so all loaders pick the file up
+    event_file = os.path.join(
+        out_dir, f"events.out.tfevents.{int(time.time())}.{socket.gethostname()}"
+    )
+    with open(event_file, "wb") as file:
+        compactor = _ScalarCompactor(
+            in_dir, file, verify_crc=verify_crc, tags=tags, steps=steps
+        )
+        compactor.reload()
+        if compactor.first_event_timestamp is None:  # source run has no events
+            compactor.write_file_version()
+    return {"event_file": event_file, "n_scalars": compactor.n_scalars}
+
+
+def _compact_run_star(args: tuple[str, str, dict[str, Any]]) -> dict[str, Any]:
+    in_dir, out_dir, kwargs = args
+    return compact_run(in_dir, out_dir, **kwargs)
+
+
+def compact_runs(
+    input_dirs: Sequence[str],
+    out_root: str,
+    *,
+    verify_crc: bool = True,
+    tags: Sequence[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    overwrite: bool = False,
+    workers: int | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Compact many run directories in parallel processes, see compact_run().
+
+    Each run is written to a directory of the same name in out_root, so the
+    compacted runs can be passed to load_tb_events() in place of the originals.
+
+    Args:
+        input_dirs (Sequence[str]): Run directories to compact.
+        out_root (str): Directory to create the compacted run directories in.
+        verify_crc (bool, optional): See compact_run(). Defaults to True.
+        tags (Sequence[str] | None, optional): See compact_run(). Defaults to None.
+        steps (tuple[int | None, int | None] | None, optional): See compact_run().
+            Defaults to None.
+        overwrite (bool, optional): See compact_run(). Defaults to False.
+        workers (int | None, optional): Number of processes. Defaults to None
+            meaning one per CPU core. 1 compacts in the current process.
+
+    Returns:
+        dict[str, dict[str, Any]]: Map of compacted run directory to the output of
+            compact_run().
+    """
+    out_dirs = [
+        os.path.join(out_root, os.path.basename(os.path.normpath(in_dir)))
+        for in_dir in input_dirs
+    ]
+    if len(set(out_dirs)) < len(out_dirs):
+        raise ValueError(
+            "Run directories to compact must have unique names, got duplicates in "
+            f"{input_dirs}"
+        )
+    os.makedirs(out_root, exist_ok=True)
+    kwargs = {
+        "verify_crc": verify_crc,
+        "tags": tags,
+        "steps": steps,
+        "overwrite": overwrite,
+    }
+
+    jobs = [
+        (in_dir, out, kwargs) for in_dir, out in zip(input_dirs, out_dirs, strict=True)
+    ]
+    if workers == 1 or len(jobs) == 1:
+        results = [_compact_run_star(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_compact_run_star, jobs))
+    return dict(zip(out_dirs, results, strict=True))
@@ -2,18 +2,121 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import fnmatch
+import functools
+import mmap
+import os
+import queue
+import struct
 import threading
+from collections import deque
 from typing import TYPE_CHECKING, NamedTuple
 
+import numpy as np
+from google.protobuf.message import DecodeError
 from tensorboard.backend.event_processing import (
     directory_watcher,
     event_file_loader,
     io_wrapper,
     reservoir,
 )
+from tensorboard.compat.proto import types_pb2
+from tensorboard.compat.proto.event_pb2 import Event
 
 if TYPE_CHECKING:
-    from tensorboard.compat.proto.event_pb2 import Event
+    from collections.abc import Callable, Collection, Iterator
+
+    from tensorboard.compat.proto.summary_pb2 import Summary
+    from tensorboard.compat.proto.tensor_pb2 import TensorProto
+
+    # called with an event file's path and size (None if unknown) before parsing it
+    FileStartHook = Callable[[str, int | None], None]
+
+try:
+    import fsspec
+except ImportError:
+    fsspec = None
+
+try:  # hardware-accelerated CRC32C if available, see _crc32c() for the fallback
+    from google_crc32c import value as _crc32c_native
+except ImportError:
+    _crc32c_native = None
+
+# TFRecord framing: uint64 payload length + uint32 masked CRC32C of that length,
+# followed by the payload and a uint32 masked CRC32C of the payload
+_HEADER_SIZE = 12
+_FOOTER_SIZE = 4
+_CRC_MASK = 0xFFFFFFFF
+
+# plugin name TF2's tf.summary.scalar() stores in the SummaryMetadata of each tag
+_SCALARS_PLUGIN = "scalars"
+_TENSOR_DTYPES = {
+    types_pb2.DT_FLOAT: np.dtype("<f4"),
+    types_pb2.DT_DOUBLE: np.dtype("<f8"),
+    types_pb2.DT_HALF: np.dtype("<f2"),
+    types_pb2.DT_INT32: np.dtype("<i4"),
+    types_pb2.DT_INT64: np.dtype("<i8"),
+}
+
+
+def _make_crc32c_tables() -> tuple[tuple[int, ...], ...]:
+    """Lookup tables for slicing-by-8 CRC32C (Castagnoli, reflected poly 0x82F63B78).
+
+    Table k maps a byte to its CRC contribution when followed by k zero bytes, which
+    lets _crc32c() fold 8 input bytes per loop iteration instead of 1.
+    """
+    table_0 = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ (0x82F63B78 if crc & 1 else 0)
+        table_0.append(crc)
+    tables = [tuple(table_0)]
+    for _ in range(7):
+        prev = tables[-1]
+        tables.append(tuple((crc >> 8) ^ table_0[crc & 0xFF] for crc in prev))
+    return tuple(tables)
+
+
+_CRC_TABLES = _make_crc32c_tables()
+
+
+def _crc32c(data: bytes | memoryview) -> int:
+    """Compute the CRC32C checksum of data.
+
+    Uses google-crc32c (SSE4.2/ARMv8 CRC instructions) when installed. Otherwise falls
+    back to a slicing-by-8 implementation which is about twice as fast as the
+    byte-at-a-time loop in TensorBoard's pure-Python record reader.
+    """
+    if _crc32c_native is not None:
+        return _crc32c_native(data)
+
+    t0, t1, t2, t3, t4, t5, t6, t7 = _CRC_TABLES
+    crc = _CRC_MASK
+    n_blocks = len(data) // 8 * 8
+    for lo, hi in struct.iter_unpack("<II", data[:n_blocks]):
+        lo ^= crc  # noqa: PLW2901
+        crc = (
+            t7[lo & 0xFF]
+            ^ t6[(lo >> 8) & 0xFF]
+            ^ t5[(lo >> 16) & 0xFF]
+            ^ t4[lo >> 24]
+            ^ t3[hi & 0xFF]
+            ^ t2[(hi >> 8) & 0xFF]
+            ^ t1[(hi >> 16) & 0xFF]
+            ^ t0[hi >> 24]
+        )
+    for byte in bytes(data[n_blocks:]):
+        crc = t0[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ _CRC_MASK
+
+
+def _masked_crc32c(data: bytes | memoryview) -> int:
+    """CRC32C as stored in TFRecord files (rotated and offset by a constant)."""
+    crc = _crc32c(data)
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & _CRC_MASK
 
 
 class ScalarEvent(NamedTuple):
@@ -52,21 +155,53 @@ class EventAccumulator:
         scalars: A reservoir.Reservoir of scalar summaries.
     """
 
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self,
+        path: str,
+        *,
+        verify_crc: bool = True,
+        tags: Collection[str] | None = None,
+        steps: tuple[int | None, int | None] | None = None,
+        on_file_start: FileStartHook | None = None,
+    ) -> None:
         """Create a new EventAccumulator which is a generator that yields Event objects
         as well as a Reservoir object to store the last 10,000 Events.
 
         Args:
             path (str): The path to the event file.
+            verify_crc (bool, optional): Whether to validate the CRC32C checksum of
+                every record in local event files. Skipping validation speeds up
+                loading of large trusted files. Defaults to True.
+            tags (Collection[str] | None, optional): Only keep scalars whose tag
+                matches one of these fnmatch-style patterns (e.g. 'train/*').
+                Defaults to None meaning all tags.
+            steps (tuple[int | None, int | None] | None, optional): Only keep scalars
+                logged at steps in this inclusive (first, last) range. None for either
+                bound leaves that side open. Defaults to None meaning all steps.
+            on_file_start (FileStartHook | None, optional): Called with the path and
+                size (None if unknown) of each event file before it's parsed.
+                Defaults to None.
         """
         self._first_event_timestamp = None
         self._scalars = reservoir.Reservoir(size=10000)
 
         self._generator_mutex = threading.Lock()
         self.path = path
-        self._generator = _generator_from_path(path)
+        self._verify_crc = verify_crc
+        self._on_file_start = on_file_start
+        self._generator = _generator_from_path(
+            path, verify_crc=verify_crc, on_file_start=on_file_start
+        )
 
         self.file_version: float | None = None
+        # TF2 only writes a tag's plugin metadata with its first value, so remember it
+        self._plugin_names: dict[str, str] = {}
+
+        self._tag_patterns = None if tags is None else tuple(tags)
+        self._tag_matches: dict[str, bool] = {}
+        first_step, last_step = steps or (None, None)
+        self._first_step = -np.inf if first_step is None else first_step
+        self._last_step = np.inf if last_step is None else last_step
 
     def reload(self) -> EventAccumulator:
         """Synchronously load all events added since last calling Reload. If Reload was
@@ -80,7 +215,7 @@ class EventAccumulator:
                 self._process_event(event)
         return self
 
-    def _process_event(self, event: Event) -> None:  # ty: ignore[invalid-type-form]
+    def _process_event(self, event: Event) -> None:
         """Called whenever an event is loaded."""
         if self._first_event_timestamp is None:
             self._first_event_timestamp = event.wall_time
@@ -92,9 +227,59 @@ class EventAccumulator:
         if event.HasField("summary"):
             for value in event.summary.value:
                 if value.HasField("simple_value"):
+                    if not self._keep(value.tag, event.step):
+                        continue
                     datum = value.simple_value
-                    tag = value.tag
-                    self._process_scalar(tag, event.wall_time, event.step, datum)
+                # check plugin metadata before filtering as it's only on the first value
+                elif value.HasField("tensor") and self._is_scalar_tensor(value):
+                    if not self._keep(value.tag, event.step):
+                        continue
+                    datum = _decode_scalar_tensor(value.tensor)
+                    if datum is None:
+                        continue
+                else:
+                    continue
+                self._process_scalar(value.tag, event.wall_time, event.step, datum)
+
+    def _keep(self, tag: str, step: int) -> bool:
+        """Whether a scalar passes the tags and steps filters. Pattern matches are
+        cached per tag.
+        """
+        return self._first_step <= step <= self._last_step and self._keep_tag(tag)
+
+    def _keep_tag(self, tag: str) -> bool:
+        """Whether tag matches the tags filter."""
+        if self._tag_patterns is None:
+            return True
+        keep = self._tag_matches.get(tag)
+        if keep is None:
+            keep = any(fnmatch.fnmatchcase(tag, pat) for pat in self._tag_patterns)
+            self._tag_matches[tag] = keep
+        return keep
+
+    def _is_scalar_tensor(self, value: Summary.Value) -> bool:
+        """Whether a tensor-valued summary was written by TF2's tf.summary.scalar(),
+        judged by the plugin name in the first metadata seen for its tag.
+        """
+        tag = value.tag
+        plugin_name = self._plugin_names.get(tag)
+        if plugin_name is None:
+            if not value.HasField("metadata"):
+                return False
+            plugin_name = value.metadata.plugin_data.plugin_name
+            self._plugin_names[tag] = plugin_name
+        return plugin_name == _SCALARS_PLUGIN
+
+    @property
+    def first_event_timestamp(self) -> float | None:
+        """Return the wall time of the run's first event (usually the file_version
+        event opening its first event file), regardless of the tags and steps
+        filters.
+
+        Returns:
+            float | None: Seconds since the epoch or None if no event was read yet.
+        """
+        return self._first_event_timestamp
 
     @property
     def scalar_tags(self) -> list[str]:
@@ -127,11 +312,376 @@ class EventAccumulator:
         self._scalars.AddItem(tag, sv)
 
 
-def _generator_from_path(path: str) -> directory_watcher.DirectoryWatcher:
-    """Create an event generator for file or directory at given path string."""
+def _decode_scalar_tensor(tensor: TensorProto) -> float | None:
+    """Extract the value of a rank-0 TensorProto as written by tf.summary.scalar().
+
+    Reads packed tensor_content with np.frombuffer (no per-element proto access) and
+    falls back to the repeated typed fields (float_val, double_val, ...) otherwise.
+
+    Returns:
+        float | None: The scalar or None if the tensor has an unsupported dtype or
+            holds no data.
+    """
+    dtype = _TENSOR_DTYPES.get(tensor.dtype)
+    if dtype is None:
+        return None
+    if tensor.tensor_content:
+        values = np.frombuffer(tensor.tensor_content, dtype=dtype, count=1)
+        return float(values[0])
+    if tensor.dtype == types_pb2.DT_HALF and tensor.half_val:
+        # half_val stores the raw float16 bit patterns as ints
+        return float(np.array(tensor.half_val[0], dtype=np.uint16).view(np.float16))
+    typed_fields = (
+        tensor.float_val,
+        tensor.double_val,
+        tensor.int_val,
+        tensor.int64_val,
+    )
+    for field in typed_fields:
+        if field:
+            return float(field[0])
+    return None
+
+
+@contextlib.contextmanager
+def _mapped_file(file_path: str) -> Iterator[memoryview]:
+    """Memory-map a local file read-only and expose it as a memoryview."""
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield memoryview(b"")  # mmap refuses to map empty files
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                yield view
+            finally:
+                # all exported buffers must be released before the map can close
+                view.release()
+
+
+def _iter_records(
+    view: memoryview,
+    start: int,
+    *,
+    verify_crc: bool,
+    file_path: str,
+    base_offset: int = 0,
+) -> Iterator[tuple[Event, int]]:
+    """Parse complete TFRecords in view beginning at byte start.
+
+    Stops silently at a truncated trailing record so callers can resume from the last
+    returned end offset once more bytes are available. The length field of such a
+    record is always checksummed so a corrupted one raises instead of ending the
+    file early.
+
+    Args:
+        view (memoryview): Buffer holding (part of) an event file.
+        start (int): Offset in view of the first record to parse.
+        verify_crc (bool): Whether to validate record checksums.
+        file_path (str): Event file name for error messages.
+        base_offset (int, optional): Position of view[0] in the file, only used for
+            error messages. Defaults to 0.
+
+    Yields:
+        tuple[Event, int]: Parsed event and the offset in view right after its record.
+    """
+    size = len(view)
+    while start + _HEADER_SIZE <= size:
+        length, length_crc = struct.unpack_from("<QI", view, start)
+        end = start + _HEADER_SIZE + length + _FOOTER_SIZE
+        # a corrupted length running past the end would silently hide the rest of
+        # the file, so it's checked at that point even without verify_crc
+        if verify_crc or end > size:
+            with view[start : start + 8] as length_bytes:
+                if _masked_crc32c(length_bytes) != length_crc:
+                    raise ValueError(
+                        f"Corrupted record header at byte {base_offset + start} of "
+                        f"{file_path!r}"
+                    )
+        if end > size:
+            break  # truncated trailing record
+
+        with view[start + _HEADER_SIZE : end - _FOOTER_SIZE] as payload:
+            if verify_crc:
+                (payload_crc,) = struct.unpack_from("<I", view, end - _FOOTER_SIZE)
+                if _masked_crc32c(payload) != payload_crc:
+                    raise ValueError(
+                        f"Corrupted record payload at byte {base_offset + start} of "
+                        f"{file_path!r}"
+                    )
+            try:
+                event = Event.FromString(payload)
+            except DecodeError as exc:
+                raise ValueError(
+                    f"Failed to parse record at byte {base_offset + start} of "
+                    f"{file_path!r}. The file may be corrupted, load it with "
+                    "verify_crc=True to check record checksums."
+                ) from exc
+        yield event, end
+        start = end
+
+
+class MmapEventFileLoader:
+    """Event file loader that parses TFRecord payloads straight out of a memory map.
+
+    Drop-in replacement for TensorBoard's LegacyEventFileLoader (same Load() API, so
+    DirectoryWatcher can drive it) for files on the local filesystem. Instead of
+    copying every record into a fresh bytes object via buffered reads, payloads are
+    handed to the protobuf parser as zero-copy memoryview slices of the mapped file.
+    Repeated reads of the same file are served from the OS page cache.
+
+    The loader remembers the offset of the last complete record, so calling Load()
+    again after the file has grown resumes where the previous call stopped. A
+    truncated trailing record (e.g. from a job that is still writing) ends the
+    current Load() and is re-read once it is complete.
+    """
+
+    def __init__(self, file_path: str, *, verify_crc: bool = True) -> None:
+        """Create a loader for a single event file.
+
+        Args:
+            file_path (str): Path to a TensorBoard event file on the local filesystem.
+            verify_crc (bool, optional): Whether to validate record checksums.
+                Defaults to True.
+        """
+        self._file_path = file_path
+        self._verify_crc = verify_crc
+        self._offset = 0
+
+    def Load(self) -> Iterator[Event]:  # noqa: N802 (matches TensorBoard loader API)
+        """Load all events added to the file since the last call.
+
+        Yields:
+            Event: Parsed event protos in file order.
+        """
+        with _mapped_file(self._file_path) as view:
+            yield from self._parse_records(view)
+
+    def _parse_records(self, view: memoryview) -> Iterator[Event]:
+        """Parse complete records in view starting at the current offset."""
+        for event, end in _iter_records(
+            view, self._offset, verify_crc=self._verify_crc, file_path=self._file_path
+        ):
+            self._offset = end
+            yield event
+
+
+class FsspecRunLoader:
+    """Event loader for run directories (or single event files) on any fsspec
+    filesystem, e.g. 's3://bucket/runs/run_1', 'gcs://...' or 'memory://...'.
+
+    Implements the Load() API of DirectoryWatcher so EventAccumulator can use it
+    interchangeably. Event files are fetched in block_size range reads issued from an
+    asyncio event loop in a background thread. Up to max_concurrency reads are in
+    flight at once and finished blocks are buffered ahead of the parser, so network
+    latency overlaps with protobuf parsing instead of adding to it.
+
+    Like MmapEventFileLoader, it remembers how far each event file was read so
+    repeated Load() calls only fetch newly appended records.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        verify_crc: bool = True,
+        block_size: int = 8 * 2**20,
+        max_concurrency: int = 8,
+        on_file_start: FileStartHook | None = None,
+    ) -> None:
+        """Create a loader for an fsspec URL.
+
+        Args:
+            url (str): fsspec URL of a run directory or a single event file.
+            verify_crc (bool, optional): Whether to validate record checksums.
+                Defaults to True.
+            block_size (int, optional): Size in bytes of each range read. Defaults to
+                8 MiB.
+            max_concurrency (int, optional): Max number of range reads in flight
+                (and blocks buffered ahead of the parser). Defaults to 8.
+            on_file_start (FileStartHook | None, optional): Called with the path and
+                size of each event file before new records are fetched from it.
+                Defaults to None.
+        """
+        if fsspec is None:
+            raise ImportError(
+                f"Loading {url!r} requires fsspec, install it with "
+                "pip install 'tensorboard-reducer[remote]'"
+            )
+        self._fs, self._root = fsspec.core.url_to_fs(url)
+        self._url = url
+        self._verify_crc = verify_crc
+        self._block_size = block_size
+        self._max_concurrency = max_concurrency
+        self._on_file_start = on_file_start
+        self._offsets: dict[str, int] = {}
+
+    def _event_files(self) -> list[str]:
+        """Event file paths under the loader's root in the order TensorBoard reads
+        them (sorted by name, which starts with the creation timestamp).
+        """
+        if self._fs.isfile(self._root):
+            return [self._root]
+        paths = self._fs.ls(self._root, detail=False)
+        return sorted(path for path in paths if io_wrapper.IsSummaryEventsFile(path))
+
+    def Load(self) -> Iterator[Event]:  # noqa: N802 (matches TensorBoard loader API)
+        """Load all events added to the run since the last call.
+
+        Yields:
+            Event: Parsed event protos, file by file in file order.
+        """
+        for path in self._event_files():
+            start = self._offsets.get(path, 0)
+            size = self._fs.size(path)
+            if size <= start:
+                continue
+            if self._on_file_start is not None:
+                self._on_file_start(path, size)
+
+            buffer = bytearray()
+            buffer_offset = start  # file position of buffer[0]
+            for block in _prefetch_blocks(
+                self._fs,
+                path,
+                start,
+                size,
+                block_size=self._block_size,
+                max_concurrency=self._max_concurrency,
+            ):
+                buffer += block
+                consumed = 0
+                view = memoryview(buffer)
+                try:
+                    for event, end in _iter_records(
+                        view,
+                        0,
+                        verify_crc=self._verify_crc,
+                        file_path=path,
+                        base_offset=buffer_offset,
+                    ):
+                        consumed = end
+                        self._offsets[path] = buffer_offset + end
+                        yield event
+                finally:
+                    view.release()
+                # drop parsed records, keep a partial trailing one for the next block
+                del buffer[:consumed]
+                buffer_offset += consumed
+
+
+def _prefetch_blocks(
+    fs: fsspec.AbstractFileSystem,
+    path: str,
+    start: int,
+    end: int,
+    *,
+    block_size: int,
+    max_concurrency: int,
+) -> Iterator[bytes]:
+    """Yield the bytes of path[start:end] as consecutive blocks, fetched ahead of time.
+
+    A background thread runs an asyncio loop that keeps a sliding window of at most
+    max_concurrency range reads in flight and hands completed blocks to the caller in
+    order through a bounded queue. Memory use is therefore capped at about
+    2 * max_concurrency * block_size regardless of file size.
+    """
+    ranges = [(lo, min(lo + block_size, end)) for lo in range(start, end, block_size)]
+    blocks: queue.Queue[bytes | BaseException | None] = queue.Queue(max_concurrency)
+    stop = threading.Event()
+
+    def put(item: bytes | BaseException | None) -> bool:
+        """Block until item is queued or the consumer went away."""
+        while not stop.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    async def fetch_all() -> None:
+        # fs.cat_file is blocking for sync filesystems and loop-bound for async
+        # ones, so run each read in the default thread pool either way
+        def fetch(lo: int, hi: int) -> asyncio.Future[bytes]:
+            return asyncio.ensure_future(
+                asyncio.to_thread(fs.cat_file, path, start=lo, end=hi)
+            )
+
+        pending = deque(fetch(lo, hi) for lo, hi in ranges[:max_concurrency])
+        try:
+            for lo, hi in ranges[max_concurrency:]:
+                block = await pending.popleft()
+                pending.append(fetch(lo, hi))
+                if not await asyncio.to_thread(put, block):
+                    return
+            while pending:
+                if not await asyncio.to_thread(put, await pending.popleft()):
+                    return
+        finally:
+            # consumer gone or a read failed: drop reads still in flight
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def run() -> None:
+        try:
+            asyncio.run(fetch_all())
+        except Exception as exc:  # noqa: BLE001 (re-raised in consumer thread)
+            put(exc)
+        else:
+            put(None)
+
+    thread = threading.Thread(target=run, name="tb-reducer-prefetch", daemon=True)
+    thread.start()
+    try:
+        while (item := blocks.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _loader_factory(
+    path: str, *, verify_crc: bool, on_file_start: FileStartHook | None = None
+) -> Callable[[str], object]:
+    """Pick the event file loader for a run directory or event file path.
+
+    Local files are read through a memory map. Remote paths (gs://, s3://, ...) can't
+    be mapped so if fsspec isn't installed (see _generator_from_path), they go through
+    TensorBoard's own tf.io.gfile-backed loader which always verifies checksums.
+    """
+    if "://" in path:
+        factory = event_file_loader.LegacyEventFileLoader
+    else:
+        factory = functools.partial(MmapEventFileLoader, verify_crc=verify_crc)
+    if on_file_start is None:
+        return factory
+
+    def observed_factory(file_path: str) -> object:
+        # DirectoryWatcher creates one loader per event file, when it starts on it
+        size = None if "://" in file_path else os.path.getsize(file_path)
+        on_file_start(file_path, size)
+        return factory(file_path)
+
+    return observed_factory
+
+
+def _generator_from_path(
+    path: str, *, verify_crc: bool = True, on_file_start: FileStartHook | None = None
+) -> directory_watcher.DirectoryWatcher | FsspecRunLoader:
+    """Create an event generator for file or directory at given path string.
+
+    URLs are read with FsspecRunLoader if fsspec is installed, local paths with
+    DirectoryWatcher + MmapEventFileLoader.
+    """
+    if "://" in path and fsspec is not None:
+        return FsspecRunLoader(path, verify_crc=verify_crc, on_file_start=on_file_start)
     return directory_watcher.DirectoryWatcher(
         path,
-        event_file_loader.LegacyEventFileLoader,
+        _loader_factory(path, verify_crc=verify_crc, on_file_start=on_file_start),
         io_wrapper.IsSummaryEventsFile,
     )
 
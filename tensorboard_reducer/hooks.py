@@ -0,0 +1,159 @@
+"""Instrumentation hooks to feed load, reduce and write timings, sizes and failures
+into external metrics systems.
+
+Pass an Observer (or any object with the same methods) as observer= to
+load_tb_events(), reduce_events(), iter_reduced_tags(), write_tb_events() or
+write_data_file(). Without one, no timings are taken and no hooks are called.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from typing import IO, Self
+
+
+class Observer:
+    """Base class for instrumentation hooks. All hooks do nothing, so subclasses
+    only override the ones they need.
+
+    Hooks may be called from worker threads, see JsonLinesObserver for a
+    thread-safe example.
+    """
+
+    def on_file_start(self, path: str, *, size: int | None) -> None:
+        """Called when parsing of an event file starts.
+
+        Args:
+            path (str): Event file path or URL.
+            size (int | None): File size in bytes if known.
+        """
+
+    def on_run_loaded(
+        self, run_dir: str, *, n_tags: int, n_scalars: int, n_bytes: int, seconds: float
+    ) -> None:
+        """Called when a run directory was parsed.
+
+        Args:
+            run_dir (str): Run directory or URL.
+            n_tags (int): Number of scalar tags loaded.
+            n_scalars (int): Total number of scalar values loaded.
+            n_bytes (int): Size of all event files read.
+            seconds (float): Wall time spent parsing the run.
+        """
+
+    def on_run_failed(
+        self, run_dir: str, *, error: BaseException, seconds: float
+    ) -> None:
+        """Called when parsing a run directory raised. The error is re-raised after.
+
+        Args:
+            run_dir (str): Run directory or URL.
+            error (BaseException): The exception raised.
+            seconds (float): Wall time until the error.
+        """
+
+    def on_tag_reduced(
+        self, tag: str, *, n_steps: int, n_runs: int, ops: list[str], seconds: float
+    ) -> None:
+        """Called when all reduce ops of a tag were computed.
+
+        Args:
+            tag (str): The reduced tag.
+            n_steps (int): Number of steps of the tag's aligned array.
+            n_runs (int): Number of runs of the tag's aligned array.
+            ops (list[str]): Names of the reduce ops.
+            seconds (float): Wall time spent reducing (summed over threads if the
+                tag was split across several).
+        """
+
+    def on_output_written(self, path: str, *, n_bytes: int, seconds: float) -> None:
+        """Called when a data file or TensorBoard run directory was written.
+
+        Args:
+            path (str): Data file or run directory.
+            n_bytes (int): Size of the data file or of all files in the directory.
+            seconds (float): Wall time spent writing it.
+        """
+
+
+class JsonLinesObserver(Observer):
+    """Observer writing one JSON object per hook call, e.g.
+    {"event": "run_loaded", "time": 1700000000.0, "run_dir": "runs/1", ...}.
+    """
+
+    def __init__(self, file: str | IO[str]) -> None:
+        """Create an emitter.
+
+        Args:
+            file (str | IO[str]): Path of a file to append to ('-' for stderr) or an
+                open text file.
+        """
+        self._owns_file = isinstance(file, str) and file != "-"
+        if file == "-":
+            file = sys.stderr
+        elif isinstance(file, str):
+            file = open(file, "a", encoding="utf-8")  # noqa: SIM115
+        self._file = file
+        self._lock = threading.Lock()
+
+    def _emit(self, event: str, **fields: object) -> None:
+        line = json.dumps({"event": event, "time": time.time(), **fields}) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def on_file_start(self, path: str, *, size: int | None) -> None:  # noqa: D102
+        self._emit("file_start", path=path, size=size)
+
+    def on_run_loaded(  # noqa: D102
+        self, run_dir: str, *, n_tags: int, n_scalars: int, n_bytes: int, seconds: float
+    ) -> None:
+        self._emit(
+            "run_loaded",
+            run_dir=run_dir,
+            n_tags=n_tags,
+            n_scalars=n_scalars,
+            n_bytes=n_bytes,
+            seconds=seconds,
+        )
+
+    def on_run_failed(  # noqa: D102
+        self, run_dir: str, *, error: BaseException, seconds: float
+    ) -> None:
+        self._emit(
+            "run_failed",
+            run_dir=run_dir,
+            error=f"{type(error).__name__}: {error}",
+            seconds=seconds,
+        )
+
+    def on_tag_reduced(  # noqa: D102
+        self, tag: str, *, n_steps: int, n_runs: int, ops: list[str], seconds: float
+    ) -> None:
+        self._emit(
+            "tag_reduced",
+            tag=tag,
+            n_steps=n_steps,
+            n_runs=n_runs,
+            ops=ops,
+            seconds=seconds,
+        )
+
+    def on_output_written(  # noqa: D102
+        self, path: str, *, n_bytes: int, seconds: float
+    ) -> None:
+        self._emit("output_written", path=path, n_bytes=n_bytes, seconds=seconds)
+
+    def close(self) -> None:
+        """Close the file if it was opened by this emitter."""
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> Self:  # noqa: D105
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:  # noqa: D105
+        self.close()
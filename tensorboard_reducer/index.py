@@ -0,0 +1,245 @@
+"""Sidecar index of scalar record offsets for selective loading of event files."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from tensorboard.backend.event_processing import io_wrapper
+
+from tensorboard_reducer.event_loader import (
+    _SCALARS_PLUGIN,
+    EventAccumulator,
+    _iter_records,
+    _mapped_file,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from tensorboard_reducer.event_loader import FileStartHook
+
+INDEX_FILE_NAME = ".tb-reducer-index.json"
+_INDEX_VERSION = 1
+
+
+class _IndexBuilder(EventAccumulator):
+    """EventAccumulator that records the file offset and step of every scalar record
+    instead of its value.
+    """
+
+    def __init__(
+        self, path: str, *, verify_crc: bool, scalar_tags: Collection[str]
+    ) -> None:
+        super().__init__(path, verify_crc=verify_crc)
+        # tags indexed in an earlier pass may be TF2 tensor scalars whose plugin
+        # metadata (only present on their first value) was already consumed
+        self._plugin_names.update(dict.fromkeys(scalar_tags, _SCALARS_PLUGIN))
+        self.record_offset = 0
+        self.entries: dict[str, tuple[list[int], list[int]]] = {}
+
+    def _process_scalar(
+        self, tag: str, wall_time: float, step: int, scalar: float
+    ) -> None:
+        del wall_time, scalar  # only where to find the record matters
+        offsets, steps = self.entries.setdefault(tag, ([], []))
+        offsets.append(self.record_offset)
+        steps.append(step)
+
+
+class IndexedEventAccumulator(EventAccumulator):
+    """EventAccumulator that uses a run's sidecar index to parse only the records
+    holding scalars that pass its tags and steps filters, seeking straight to them
+    instead of scanning whole event files.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        index: dict[str, Any],
+        *,
+        verify_crc: bool = True,
+        tags: Collection[str] | None = None,
+        steps: tuple[int | None, int | None] | None = None,
+        on_file_start: FileStartHook | None = None,
+    ) -> None:
+        """Create an accumulator for a local run directory with an up-to-date index.
+
+        Args:
+            path (str): Run directory.
+            index (dict[str, Any]): Output of update_index() for path.
+            verify_crc (bool, optional): Whether to validate record checksums.
+                Defaults to True.
+            tags (Collection[str] | None, optional): Tag patterns to keep, see
+                EventAccumulator. Defaults to None.
+            steps (tuple[int | None, int | None] | None, optional): Step range to
+                keep, see EventAccumulator. Defaults to None.
+            on_file_start (FileStartHook | None, optional): Called with the path and
+                indexed size of each event file with records to parse. Defaults to
+                None.
+        """
+        super().__init__(
+            path,
+            verify_crc=verify_crc,
+            tags=tags,
+            steps=steps,
+            on_file_start=on_file_start,
+        )
+        self._index = index
+        files = index["files"].values()
+        scalar_tags = {tag for entry in files for tag in entry["tags"]}
+        self._plugin_names.update(dict.fromkeys(scalar_tags, _SCALARS_PLUGIN))
+
+    def reload(self) -> IndexedEventAccumulator:
+        """Load all indexed scalars that pass the filters.
+
+        Returns:
+            IndexedEventAccumulator
+        """
+        file_entries = sorted(self._index["files"].items())
+        if file_entries and self._first_event_timestamp is None:
+            # the run starts with the first record of its first file, which the
+            # filters below would skip
+            file_path = os.path.join(self.path, file_entries[0][0])
+            with _mapped_file(file_path) as view:
+                records = _iter_records(
+                    view, 0, verify_crc=self._verify_crc, file_path=file_path
+                )
+                first = next(records, None)
+                records.close()
+            if first is not None:
+                self._first_event_timestamp = first[0].wall_time
+        for name, entry in file_entries:
+            selected = []
+            for tag, tag_entry in entry["tags"].items():
+                if not self._keep_tag(tag):
+                    continue
+                steps = np.asarray(tag_entry["steps"])
+                in_range = (steps >= self._first_step) & (steps <= self._last_step)
+                selected.append(np.asarray(tag_entry["offsets"])[in_range])
+            if not selected:
+                continue
+            # records can hold several wanted tags, parse each only once in file order
+            offsets = np.unique(np.concatenate(selected))
+            file_path = os.path.join(self.path, name)
+            if self._on_file_start is not None:
+                self._on_file_start(file_path, entry["size"])
+            with _mapped_file(file_path) as view:
+                for offset in offsets.tolist():
+                    records = _iter_records(
+                        view, offset, verify_crc=self._verify_crc, file_path=file_path
+                    )
+                    event, _ = next(records)
+                    records.close()  # release the memoryview slices it holds
+                    self._process_event(event)
+        return self
+
+
+def _index_path(run_dir: str) -> str:
+    return os.path.join(run_dir, INDEX_FILE_NAME)
+
+
+def read_index(run_dir: str) -> dict[str, Any] | None:
+    """Read a run directory's sidecar index.
+
+    Args:
+        run_dir (str): Run directory.
+
+    Returns:
+        dict[str, Any] | None: The index or None if it doesn't exist, can't be read
+            or is from an incompatible version.
+    """
+    try:
+        with open(_index_path(run_dir)) as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != _INDEX_VERSION:
+        return None
+    return index
+
+
+def update_index(run_dir: str, *, verify_crc: bool = True) -> dict[str, Any]:
+    """Create or refresh the sidecar index of a local run directory.
+
+    The index records for every event file in run_dir the byte offset and step of
+    each record holding a scalar, grouped by tag. Event files are append-only, so a
+    refresh only scans bytes written since the last one. If an indexed file vanished
+    or shrank, the index is rebuilt from scratch.
+
+    The index is saved as INDEX_FILE_NAME in run_dir. If run_dir isn't writable, the
+    index is still returned, just not persisted.
+
+    Args:
+        run_dir (str): Run directory containing TensorBoard event files.
+        verify_crc (bool, optional): Whether to validate record checksums while
+            scanning. Defaults to True.
+
+    Returns:
+        dict[str, Any]: The index with keys 'version' and 'files' which maps event
+            file names to their indexed 'size' in bytes and a 'tags' dict of
+            {tag: {'offsets': [...], 'steps': [...]}}.
+    """
+    event_files = sorted(
+        name for name in os.listdir(run_dir) if io_wrapper.IsSummaryEventsFile(name)
+    )
+    sizes = {name: os.path.getsize(os.path.join(run_dir, name)) for name in event_files}
+
+    index = read_index(run_dir)
+    changed = index is None
+    if index is not None and any(
+        sizes.get(name, -1) < entry["size"] for name, entry in index["files"].items()
+    ):
+        index, changed = None, True
+    if index is None:
+        index = {"version": _INDEX_VERSION, "files": {}}
+
+    files = index["files"]
+    scalar_tags = {tag for entry in files.values() for tag in entry["tags"]}
+    for name in event_files:
+        entry = files.setdefault(name, {"size": 0, "tags": {}})
+        if sizes[name] <= entry["size"]:
+            continue
+        file_path = os.path.join(run_dir, name)
+        builder = _IndexBuilder(
+            file_path, verify_crc=verify_crc, scalar_tags=scalar_tags
+        )
+        start = entry["size"]
+        with _mapped_file(file_path) as view:
+            for event, end in _iter_records(
+                view, start, verify_crc=verify_crc, file_path=file_path
+            ):
+                builder.record_offset = start
+                builder._process_event(event)  # noqa: SLF001
+                start = end
+        changed |= start > entry["size"]
+        entry["size"] = start  # end of last complete record
+        for tag, (offsets, steps) in builder.entries.items():
+            tag_entry = entry["tags"].setdefault(tag, {"offsets": [], "steps": []})
+            tag_entry["offsets"] += offsets
+            tag_entry["steps"] += steps
+        scalar_tags |= set(builder.entries)
+
+    if changed:
+        _save_index(run_dir, index)
+    return index
+
+
+def _save_index(run_dir: str, index: dict[str, Any]) -> None:
+    """Replace the run's index atomically so concurrent readers or a crash never
+    see a partially written file. The index is only a cache, so failing to write
+    it (e.g. in a read-only run dir) is silently ignored.
+    """
+    path = _index_path(run_dir)
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w") as file:
+            json.dump(index, file)
+        os.replace(tmp_path, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
@@ -0,0 +1,272 @@
+"""Run many reductions described in a TOML job file in one invocation, parsing each
+run directory only once no matter how many jobs use it.
+
+A job file has an optional [defaults] table and one [[jobs]] table per reduction:
+
+    [defaults]
+    reduce_ops = ["mean", "std"]
+
+    [[jobs]]
+    input_dirs = ["runs/lr_1e-3/*"]
+    outpath = "reduced/lr_1e-3.csv"
+
+    [[jobs]]
+    input_dirs = ["runs/lr_1e-3/*", "runs/lr_1e-4/*"]
+    outpath = "reduced/all"
+    strict_steps = false
+    tags = ["val/*"]
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import tomllib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from glob import glob
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from tqdm import tqdm
+
+from tensorboard_reducer.load import (
+    _check_input_dirs,
+    _check_run_args,
+    combine_runs,
+    load_run,
+)
+from tensorboard_reducer.pyramid import add_pyramid_levels
+from tensorboard_reducer.reduce import reduce_events
+from tensorboard_reducer.write import (
+    _known_extensions,
+    write_data_file,
+    write_npy_dir,
+    write_tb_events,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import pandas as pd
+
+    from tensorboard_reducer.load import HandleDupSteps
+
+# job keys and their defaults, same names and meaning as in the Python API
+_JOB_DEFAULTS: dict[str, Any] = {
+    "reduce_ops": ["mean"],
+    "overwrite": False,
+    "strict_tags": True,
+    "strict_steps": True,
+    "handle_dup_steps": None,
+    "min_runs_per_step": None,
+    "tags": None,
+    "steps": None,
+    "smooth_runs": None,
+    "pyramid": None,
+}
+_REQUIRED_KEYS = ("input_dirs", "outpath")
+
+
+def _resolve_path(root: str, path: str) -> str:
+    """Make relative local paths relative to the job file's directory."""
+    if "://" in path or os.path.isabs(path):
+        return path
+    return os.path.join(root, path)
+
+
+def read_jobs(path: str) -> list[dict[str, Any]]:
+    """Read and validate a TOML job file.
+
+    Relative paths in input_dirs and outpath are relative to the job file's
+    directory. Glob patterns in input_dirs are expanded.
+
+    Args:
+        path (str): Path to the job file.
+
+    Raises:
+        ValueError: If a job has unknown or missing keys, its input_dirs match no
+            or the same directory twice or its outpath is also another job's.
+
+    Returns:
+        list[dict[str, Any]]: One dict per job with all keys of _JOB_DEFAULTS plus
+            input_dirs and outpath.
+    """
+    with open(path, "rb") as file:
+        config = tomllib.load(file)
+    if unknown := set(config) - {"defaults", "jobs"}:
+        raise ValueError(f"Unknown tables {sorted(unknown)} in job file {path!r}")
+    if not config.get("jobs"):
+        raise ValueError(f"No [[jobs]] in job file {path!r}")
+
+    root = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for idx, job_config in enumerate(config["jobs"]):
+        job = {**_JOB_DEFAULTS, **config.get("defaults", {}), **job_config}
+        if unknown := set(job) - set(_JOB_DEFAULTS) - set(_REQUIRED_KEYS):
+            raise ValueError(f"Unknown keys {sorted(unknown)} in job {idx}")
+        if missing := [key for key in _REQUIRED_KEYS if key not in job]:
+            raise ValueError(f"Missing keys {missing} in job {idx}")
+        _check_run_args(job["handle_dup_steps"], "float64")
+
+        input_dirs = []
+        for pattern in job["input_dirs"]:
+            pattern = _resolve_path(root, pattern)  # noqa: PLW2901
+            input_dirs += [pattern] if "://" in pattern else sorted(glob(pattern))
+        if not input_dirs:
+            raise ValueError(f"input_dirs of job {idx} match no run directories")
+        try:
+            _check_input_dirs(input_dirs)
+        except ValueError as exc:
+            raise ValueError(f"{exc} in job {idx}") from exc
+        job["input_dirs"] = input_dirs
+        job["outpath"] = _resolve_path(root, job["outpath"])
+        if isinstance(job["reduce_ops"], str):
+            job["reduce_ops"] = job["reduce_ops"].split(",")
+        if job["steps"] is not None:
+            job["steps"] = tuple(job["steps"])
+        if any(other["outpath"] == job["outpath"] for other in jobs):
+            raise ValueError(f"outpath {job['outpath']!r} of job {idx} is not unique")
+        jobs.append(job)
+    return jobs
+
+
+def _covering_filters(
+    jobs: Sequence[dict[str, Any]],
+) -> tuple[list[str] | None, tuple[int | None, int | None] | None]:
+    """Tag patterns and step range that include everything any of jobs needs."""
+    if any(job["tags"] is None for job in jobs):
+        tags = None
+    else:
+        tags = sorted({tag for job in jobs for tag in job["tags"]})
+    if any(job["steps"] is None for job in jobs):
+        return tags, None
+    firsts = [job["steps"][0] for job in jobs]
+    lasts = [job["steps"][1] for job in jobs]
+    first = None if None in firsts else min(firsts)
+    last = None if None in lasts else max(lasts)
+    return tags, (first, last)
+
+
+def _load_run_star(args: tuple[str, dict[str, Any]]) -> dict[str, pd.DataFrame]:
+    in_dir, kwargs = args
+    return load_run(in_dir, **kwargs)
+
+
+def _filter_run(
+    run: dict[str, pd.DataFrame],
+    tags: Sequence[str] | None,
+    steps: tuple[int | None, int | None] | None,
+) -> dict[str, pd.DataFrame]:
+    """Narrow a run loaded for several jobs down to one job's tags and steps."""
+    if tags is not None:
+        run = {
+            tag: df
+            for tag, df in run.items()
+            if any(fnmatch.fnmatchcase(tag, pat) for pat in tags)
+        }
+    if steps is not None:
+        first, last = steps
+        lo = -np.inf if first is None else first
+        hi = np.inf if last is None else last
+        run = {tag: df[(df.index >= lo) & (df.index <= hi)] for tag, df in run.items()}
+    return run
+
+
+def _run_job(
+    job: dict[str, Any],
+    runs: dict[tuple[str, HandleDupSteps], dict[str, pd.DataFrame]],
+) -> list[str]:
+    """Combine, reduce and write one job from already loaded runs."""
+    job_runs = {
+        in_dir: _filter_run(
+            runs[in_dir, job["handle_dup_steps"]], job["tags"], job["steps"]
+        )
+        for in_dir in job["input_dirs"]
+    }
+    events_dict = combine_runs(
+        job_runs,
+        strict_tags=job["strict_tags"],
+        strict_steps=job["strict_steps"],
+        min_runs_per_step=job["min_runs_per_step"],
+        ragged=not job["strict_steps"],
+    )
+    reduced = reduce_events(
+        events_dict, job["reduce_ops"], smooth_runs=job["smooth_runs"]
+    )
+    if job["pyramid"] is not None:
+        reduced = add_pyramid_levels(reduced, factor=job["pyramid"])
+
+    out_path = job["outpath"]
+    basename = os.path.basename(out_path).lower()
+    if any(ext in basename for ext in _known_extensions):
+        return [write_data_file(reduced, out_path, overwrite=job["overwrite"])]
+    if out_path.rstrip("/\\").lower().endswith(".npy"):
+        return [write_npy_dir(reduced, out_path, overwrite=job["overwrite"])]
+    return write_tb_events(reduced, out_path, overwrite=job["overwrite"])
+
+
+def run_jobs(
+    jobs: Sequence[dict[str, Any]],
+    *,
+    verify_crc: bool = True,
+    dtype: str = "float64",
+    index: bool = False,
+    workers: int | None = None,
+    verbose: bool = False,
+) -> list[str]:
+    """Run jobs from read_jobs() together.
+
+    First every unique run directory (per handle_dup_steps setting) is parsed
+    exactly once, in parallel processes, with the union of the tags and steps
+    filters of all jobs using it. Then jobs are combined, reduced and written
+    concurrently, each filtering the shared runs down to its own tags and steps.
+
+    Args:
+        jobs (Sequence[dict[str, Any]]): Jobs to run.
+        verify_crc (bool, optional): See load_tb_events(). Defaults to True.
+        dtype (str, optional): See load_tb_events(). Defaults to 'float64'.
+        index (bool, optional): See load_tb_events(). Defaults to False.
+        workers (int | None, optional): Number of processes to parse runs with and
+            threads to run jobs with. Defaults to None meaning one per CPU core.
+        verbose (bool, optional): Whether to print progress. Defaults to False.
+
+    Returns:
+        list[str]: Paths of all data files and run directories written.
+    """
+    users: dict[tuple[str, HandleDupSteps], list[dict[str, Any]]] = {}
+    for job in jobs:
+        for in_dir in job["input_dirs"]:
+            users.setdefault((in_dir, job["handle_dup_steps"]), []).append(job)
+
+    load_args = []
+    for (in_dir, handle_dup_steps), dir_jobs in users.items():
+        tags, steps = _covering_filters(dir_jobs)
+        kwargs = {
+            "handle_dup_steps": handle_dup_steps,
+            "verify_crc": verify_crc,
+            "dtype": dtype,
+            "tags": tags,
+            "steps": steps,
+            "index": index,
+        }
+        load_args.append((in_dir, kwargs))
+
+    progress = {"disable": not verbose, "total": len(load_args), "desc": "Loading runs"}
+    if workers == 1 or len(load_args) == 1:
+        loaded = [_load_run_star(args) for args in tqdm(load_args, **progress)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            loaded = list(tqdm(pool.map(_load_run_star, load_args), **progress))
+    runs = dict(zip(users, loaded, strict=True))
+    if verbose:
+        print(f"Parsed {len(runs)} runs once for {len(jobs)} jobs")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        out_paths = [
+            path
+            for paths in pool.map(_run_job, jobs, [runs] * len(jobs))
+            for path in paths
+        ]
+    if verbose:
+        print("Wrote\n- " + "\n- ".join(out_paths))
+    return out_paths
@@ -2,82 +2,339 @@
 
 from __future__ import annotations
 
+import os
+import time
 from collections import defaultdict
-from typing import Literal, get_args
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, get_args
 
+import numpy as np
 import pandas as pd
+from tensorboard.backend.event_processing import io_wrapper
 from tqdm import tqdm
 
 from tensorboard_reducer.event_loader import EventAccumulator
+from tensorboard_reducer.index import IndexedEventAccumulator, update_index
+
+try:  # only needed to load runs on remote filesystems
+    import fsspec
+except ImportError:
+    fsspec = None
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, Sequence
+
+    from tensorboard_reducer.event_loader import FileStartHook
+    from tensorboard_reducer.hooks import Observer
 
 HandleDupSteps = Literal["keep-first", "keep-last", "mean", None]  # noqa: PYI061
+Align = Literal["steps", "interpolate", "elapsed"]
 
 
-def load_tb_events(
-    input_dirs: list[str],
-    *,
-    strict_tags: bool = True,
-    strict_steps: bool = True,
-    handle_dup_steps: HandleDupSteps = None,
-    min_runs_per_step: int | None = None,
-    verbose: bool = False,
-) -> dict[str, pd.DataFrame]:
-    """Read all TensorBoard event files found in input_dirs and return their scalar data
-    as a dict with tags as keys (e.g. 'training/loss', 'validation/mae') and 2d arrays
-    of shape (n_steps, n_runs) as values.
+class RaggedScalars(NamedTuple):
+    """CSR-style storage of one tag's scalars across runs that logged different steps.
 
-    Args:
-        input_dirs (list[str]): Directory names containing TensorBoard runs to read
-            from disk.
-        strict_tags (bool, optional): If true, throw error if different runs have
-            different sets of tags. Defaults to True.
-        strict_steps (bool, optional): If true, throw error if equal tags across
-            different runs have unequal numbers of steps. Defaults to True.
-        handle_dup_steps (str|None, optional): How to handle duplicate values recorded
-            for the same tag and step in a single run directory (can come from multiple
-            event files in the same run directory or even from duplicate values in a
-            single event file). One of 'keep-first', 'keep-last' or 'mean' which will
-            keep the first/last occurrence of duplicate steps and compute their mean,
-            respectively. Defaults to None which will raise an error on duplicate steps.
-        min_runs_per_step (int|None, optional): Minimum number of runs across which a
-            given step must be recorded to be kept. Steps present across less runs are
-            dropped. Only plays a role if strict_steps=False. **Warning**: Be aware that
-            with this setting, you'll be reducing variable number of runs, however many
-            recorded a value for a given step as long as there are at least
-            --min-runs-per-step. In other words, the statistics of a reduction will
-            change mid-run. Say you're plotting the mean of an error curve, the sample
-            size of that mean will drop from 10 down to 4 mid-plot if 4 of your models
-            trained for longer than the rest. Be sure to remember when using this.
-        verbose (bool, optional): If true, print progress to stdout. Defaults to False.
+    Instead of outer-joining runs into a dense (n_steps, n_runs) array padded with
+    NaNs, values of all runs are stored back to back. values[run_offsets[i] :
+    run_offsets[i + 1]] are the values of run i and step_ids holds the position of
+    each value's step in steps. reduce_events() reduces this layout directly.
+    """
 
-    Returns:
-        dict: A dictionary mapping scalar tags (i.e. keys like 'train/loss', 'val/mae')
-            to Pandas DataFrames.
+    steps: np.ndarray  # sorted unique steps kept across all runs
+    values: np.ndarray  # values of all runs concatenated
+    step_ids: np.ndarray  # index into steps for each entry in values
+    run_offsets: np.ndarray  # start of each run's values + total length at the end
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape (n_steps, n_runs) of the equivalent dense array."""
+        return len(self.steps), len(self.run_offsets) - 1
+
+    def __len__(self) -> int:
+        """Number of steps, same as len() of the equivalent DataFrame."""
+        return len(self.steps)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the dense NaN-padded (n_steps, n_runs) DataFrame."""
+        n_steps, n_runs = self.shape
+        dense = np.full((n_steps, n_runs), np.nan, dtype=self.values.dtype)
+        run_ids = np.repeat(np.arange(n_runs), np.diff(self.run_offsets))
+        dense[self.step_ids, run_ids] = self.values
+        index = pd.Index(self.steps, name="step")
+        return pd.DataFrame(dense, index=index, columns=["value"] * n_runs)
+
+
+def _to_ragged(
+    run_dfs: list[pd.DataFrame], min_runs_per_step: int | None
+) -> RaggedScalars:
+    """Build RaggedScalars from per-run single-column DataFrames indexed by step.
+
+    Keeps steps with non-NaN values in at least min_runs_per_step runs or, if that's
+    None, steps recorded by every run (same as an inner join).
+    """
+    run_lens = [len(df) for df in run_dfs]
+    all_steps = np.concatenate([df.index.to_numpy() for df in run_dfs])
+    values = np.concatenate([df.iloc[:, 0].to_numpy() for df in run_dfs])
+    steps, step_ids = np.unique(all_steps, return_inverse=True)
+
+    if min_runs_per_step is None:
+        runs_per_step = np.bincount(step_ids, minlength=len(steps))
+        keep_step = runs_per_step == len(run_dfs)
+    else:
+        valid = ~np.isnan(values)
+        runs_per_step = np.bincount(step_ids[valid], minlength=len(steps))
+        keep_step = runs_per_step >= min_runs_per_step
+
+    keep_value = keep_step[step_ids]
+    new_step_ids = np.cumsum(keep_step) - 1  # old step position -> new position
+    run_ids = np.repeat(np.arange(len(run_dfs)), run_lens)
+    run_offsets = np.zeros(len(run_dfs) + 1, dtype=np.int64)
+    run_offsets[1:] = np.cumsum(
+        np.bincount(run_ids[keep_value], minlength=len(run_dfs))
+    )
+
+    return RaggedScalars(
+        steps=steps[keep_step],
+        values=values[keep_value],
+        step_ids=new_step_ids[step_ids[keep_value]],
+        run_offsets=run_offsets,
+    )
+
+
+def _check_input_dirs(input_dirs: Sequence[str]) -> None:
+    """Raise if input_dirs is empty or lists a run more than once. Runs are keyed by
+    directory, so a repeated one would otherwise silently count only once.
     """
     if not input_dirs:
         msg = f"Expected non-empty list of input directories, got '{input_dirs}'"
         raise ValueError(msg)
+    seen: set[str] = set()
+    duplicates = []
+    for in_dir in input_dirs:
+        key = in_dir if "://" in in_dir else os.path.normpath(in_dir)
+        if key in seen:
+            duplicates.append(in_dir)
+        seen.add(key)
+    if duplicates:
+        raise ValueError(f"Got input directories more than once: {duplicates}")
+
+
+def _check_run_args(handle_dup_steps: HandleDupSteps, dtype: str) -> None:
     valid_handle_dup = get_args(HandleDupSteps)
     if handle_dup_steps not in valid_handle_dup:
         raise ValueError(
             f"unexpected {handle_dup_steps=}, must be one of {valid_handle_dup}"
         )
+    if np.dtype(dtype).kind != "f":
+        raise ValueError(f"Expected a floating point dtype, got {dtype=}")
+
+
+def _run_signature(in_dir: str) -> tuple[tuple[str, int, Any], ...]:
+    """Name, size and modification time of every event file in a run directory.
+    Event files are append-only so any new data changes the signature.
+    """
+    if "://" in in_dir:
+        if fsspec is None:
+            raise ImportError(
+                f"Loading {in_dir!r} requires fsspec, install it with "
+                "pip install 'tensorboard-reducer[remote]'"
+            )
+        fs, root = fsspec.core.url_to_fs(in_dir)
+        entries = fs.ls(root, detail=True) if fs.isdir(root) else [fs.info(root)]
+        files = [
+            (entry["name"], entry["size"], entry.get("mtime", entry.get("created")))
+            for entry in entries
+            if io_wrapper.IsSummaryEventsFile(os.path.basename(entry["name"]))
+        ]
+    elif os.path.isdir(in_dir):
+        files = [
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in os.scandir(in_dir)
+            if io_wrapper.IsSummaryEventsFile(entry.name)
+        ]
+    else:
+        stat = os.stat(in_dir)
+        files = [(in_dir, stat.st_size, stat.st_mtime_ns)]
+    return tuple(sorted(files, key=lambda file: file[0]))
+
+
+def load_run(
+    in_dir: str,
+    *,
+    handle_dup_steps: HandleDupSteps = None,
+    verify_crc: bool = True,
+    dtype: str = "float64",
+    tags: Collection[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    index: bool = False,
+    step_indexes: dict[str, pd.Index] | None = None,
+    wall_time: bool = False,
+    observer: Observer | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Read the scalars of a single run directory. See load_tb_events() for the
+    meaning of all keyword arguments except step_indexes and wall_time.
+
+    Args:
+        in_dir (str): Run directory or fsspec URL.
+        handle_dup_steps (str|None, optional): How to handle duplicate steps.
+            Defaults to None which will raise an error on duplicate steps.
+        verify_crc (bool, optional): Whether to validate record checksums.
+            Defaults to True.
+        dtype (str, optional): Floating point dtype of the loaded values.
+            Defaults to 'float64'.
+        tags (Collection[str] | None, optional): Tag patterns to load. Defaults to
+            None meaning all tags.
+        steps (tuple[int | None, int | None] | None, optional): Inclusive step range
+            to load. Defaults to None meaning all steps.
+        index (bool, optional): Whether to use a sidecar index. Defaults to False.
+        step_indexes (dict[str, pd.Index] | None, optional): Step index of each tag
+            from previously loaded runs. A run that logged a tag at the same steps
+            reuses that index instead of allocating its own, new ones are added.
+            Defaults to None.
+        wall_time (bool, optional): Whether to add an 'elapsed' float32 column with
+            the seconds since the run's first event, independent of the tags and
+            steps filters. Defaults to False.
+        observer (Observer | None, optional): Instrumentation hooks notified of each
+            event file and of the run's load time, size or failure. Defaults to None.
+
+    Returns:
+        dict[str, pd.DataFrame]: Map of tags to single-column ('value') DataFrames
+            (plus 'elapsed' if wall_time=True) indexed by step.
+    """
+    _check_run_args(handle_dup_steps, dtype)
+    if step_indexes is None:
+        step_indexes = {}
+    kwargs = {
+        "handle_dup_steps": handle_dup_steps,
+        "verify_crc": verify_crc,
+        "dtype": dtype,
+        "tags": tags,
+        "steps": steps,
+        "index": index,
+        "step_indexes": step_indexes,
+        "wall_time": wall_time,
+    }
+    if observer is None:
+        return _parse_run(in_dir, on_file_start=None, **kwargs)
 
+    n_bytes = 0
+
+    def on_file_start(path: str, size: int | None) -> None:
+        nonlocal n_bytes
+        n_bytes += size or 0
+        observer.on_file_start(path, size=size)
+
+    start = time.perf_counter()
+    try:
+        run_dict = _parse_run(in_dir, on_file_start=on_file_start, **kwargs)
+    except Exception as exc:
+        observer.on_run_failed(in_dir, error=exc, seconds=time.perf_counter() - start)
+        raise
+    observer.on_run_loaded(
+        in_dir,
+        n_tags=len(run_dict),
+        n_scalars=sum(len(df) for df in run_dict.values()),
+        n_bytes=n_bytes,
+        seconds=time.perf_counter() - start,
+    )
+    return run_dict
+
+
+def _parse_run(
+    in_dir: str,
+    *,
+    handle_dup_steps: HandleDupSteps,
+    verify_crc: bool,
+    dtype: str,
+    tags: Collection[str] | None,
+    steps: tuple[int | None, int | None] | None,
+    index: bool,
+    step_indexes: dict[str, pd.Index],
+    wall_time: bool,
+    on_file_start: FileStartHook | None,
+) -> dict[str, pd.DataFrame]:
+    """Parse a run directory, see load_run()."""
     # Here's where TensorBoard scalars are loaded into memory. Uses a custom
     # EventAccumulator that only loads scalars and ignores histograms, images and other
     # time-consuming data.
-    accumulators = [
-        EventAccumulator(dirname).reload()
-        for dirname in tqdm(input_dirs, disable=not verbose, desc="Loading runs")
-    ]
+    filters = {
+        "verify_crc": verify_crc,
+        "tags": tags,
+        "steps": steps,
+        "on_file_start": on_file_start,
+    }
+    if index and "://" not in in_dir:
+        run_index = update_index(in_dir, verify_crc=verify_crc)
+        accumulator = IndexedEventAccumulator(in_dir, run_index, **filters)
+    else:
+        accumulator = EventAccumulator(in_dir, **filters)
+    accumulator.reload()
+
+    run_dict: dict[str, pd.DataFrame] = {}
+    for tag in accumulator.scalar_tags:
+        # accumulator.scalars() returns ScalarEvents with fields 'wall_time',
+        # 'step', 'value'
+        scalars = accumulator.scalars(tag)
+        n_scalars = len(scalars)
+        tag_steps = np.fromiter((s.step for s in scalars), np.int64, n_scalars)
+        values = np.fromiter((s.value for s in scalars), dtype, n_scalars)
 
+        step_index = step_indexes.get(tag)
+        if step_index is None or not np.array_equal(step_index, tag_steps):
+            step_index = pd.Index(tag_steps, name="step")
+            step_indexes.setdefault(tag, step_index)
+        df_scalar = pd.DataFrame({"value": values}, index=step_index)
+        if wall_time:
+            wall_times = (s.wall_time for s in scalars)
+            df_scalar["wall_time"] = np.fromiter(wall_times, np.float64, n_scalars)
+
+        if handle_dup_steps is None and not df_scalar.index.is_unique:
+            raise ValueError(
+                f"Tag '{tag}' from run directory '{in_dir}' contains duplicate "
+                "steps. Please make sure your data wasn't corrupted. If this is "
+                "expected/you want to proceed anyway, specify how to handle "
+                "duplicate values recorded for the same tag and step in a single "
+                "run by passing --handle-dup-steps to the CLI or "
+                "handle_dup_steps='keep-first'|'keep-last'|'mean' to the Python "
+                "API. This will keep the first/last occurrence of duplicate steps "
+                "or take their mean."
+            )
+        if handle_dup_steps == "mean":
+            df_scalar = df_scalar.groupby(df_scalar.index).mean()
+        elif handle_dup_steps in ("keep-first", "keep-last"):
+            keep = handle_dup_steps.removeprefix("keep-")
+            df_scalar = df_scalar[~df_scalar.index.duplicated(keep=keep)]
+
+        run_dict[tag] = df_scalar
+
+    if wall_time and run_dict:
+        # measure from the run's first event rather than its first kept scalar so
+        # elapsed times don't depend on the tags and steps filters
+        run_start = accumulator.first_event_timestamp
+        if run_start is None:
+            run_start = min(df["wall_time"].min() for df in run_dict.values())
+        # float32 seconds stay precise to ~0.1 s for runs lasting weeks
+        for df_scalar in run_dict.values():
+            elapsed = df_scalar.pop("wall_time") - run_start
+            df_scalar["elapsed"] = elapsed.to_numpy(np.float32)
+    return run_dict
+
+
+def _group_by_tag(
+    runs: Mapping[str, dict[str, pd.DataFrame]],
+    *,
+    strict_tags: bool,
+    strict_steps: bool,
+    min_runs_per_step: int | None,
+    verbose: bool = False,
+) -> dict[str, list[pd.DataFrame]]:
+    """Validate load_run() outputs of several runs and regroup them into the list of
+    per-run DataFrames of each tag. See combine_runs() for the arguments.
+    """
     # Safety check: make sure all loaded runs have identical tags unless user set
     # strict_tags=False.
     if strict_tags:
         # generate list of scalar tags for all event files each in alphabetical order
-        tags_in_each_dir = [
-            set(accumulator.scalar_tags) for accumulator in accumulators
-        ]
+        tags_in_each_dir = [set(run_dict) for run_dict in runs.values()]
 
         all_tags = {tag for tags in tags_in_each_dir for tag in tags}
 
@@ -85,7 +342,7 @@ def load_tb_events(
         # will be empty string if no tags are missing
         missing_tags_report = "".join(
             f"- {in_dir} missing tags: {', '.join(all_tags - run_tags)}\n"
-            for in_dir, run_tags in zip(input_dirs, tags_in_each_dir, strict=True)
+            for in_dir, run_tags in zip(runs, tags_in_each_dir, strict=True)
             if len(all_tags - run_tags) > 0
         )
 
@@ -100,32 +357,8 @@ def load_tb_events(
             )
 
     load_dict = defaultdict(list)
-
-    for accumulator in tqdm(accumulators, disable=not verbose, desc="Reading tags"):
-        in_dir = accumulator.path
-
-        for tag in accumulator.scalar_tags:
-            # accumulator.Scalars() returns columns 'step', 'wall_time', 'value'
-            df_scalar = pd.DataFrame(accumulator.scalars(tag)).set_index("step")
-            df_scalar = df_scalar.drop(columns="wall_time")
-
-            if handle_dup_steps is None and not df_scalar.index.is_unique:
-                raise ValueError(
-                    f"Tag '{tag}' from run directory '{in_dir}' contains duplicate "
-                    "steps. Please make sure your data wasn't corrupted. If this is "
-                    "expected/you want to proceed anyway, specify how to handle "
-                    "duplicate values recorded for the same tag and step in a single "
-                    "run by passing --handle-dup-steps to the CLI or "
-                    "handle_dup_steps='keep-first'|'keep-last'|'mean' to the Python "
-                    "API. This will keep the first/last occurrence of duplicate steps "
-                    "or take their mean."
-                )
-            if handle_dup_steps == "mean":
-                df_scalar = df_scalar.groupby(df_scalar.index).mean()
-            elif handle_dup_steps in ("keep-first", "keep-last"):
-                keep = handle_dup_steps.removeprefix("keep-")
-                df_scalar = df_scalar[~df_scalar.index.duplicated(keep=keep)]
-
+    for run_dict in tqdm(runs.values(), disable=not verbose, desc="Reading tags"):
+        for tag, df_scalar in run_dict.items():
             load_dict[tag].append(df_scalar)
 
     # Safety check: make sure all loaded runs have equal numbers of steps for each tag
@@ -149,36 +382,386 @@ def load_tb_events(
 
     if len(load_dict) == 0:
         raise FileNotFoundError(
-            f"Got {len(input_dirs)} input directories but no TensorBoard event files "
+            f"Got {len(runs)} input directories but no TensorBoard event files "
             "found inside them."
         )
 
-    out_dict: dict[str, pd.DataFrame] = {}
+    if min_runs_per_step is not None and (
+        not isinstance(min_runs_per_step, int) or min_runs_per_step < 1
+    ):
+        raise ValueError(f"Expected positive integer or None, got {min_runs_per_step=}")
+
+    return load_dict
+
+
+def _combine_tag(
+    run_dfs: list[pd.DataFrame],
+    *,
+    min_runs_per_step: int | None,
+    ragged: bool,
+    align: Align = "steps",
+    step_grid: int | Sequence[int] | np.ndarray | None = None,
+    time_bin: int | None = None,
+) -> pd.DataFrame | RaggedScalars:
+    """Align one tag's per-run DataFrames into an array of shape (n_steps, n_runs)."""
+    if align == "elapsed":
+        return _bin_elapsed_tag(
+            run_dfs, time_bin=time_bin, min_runs_per_step=min_runs_per_step
+        )
+    if align == "interpolate":
+        return _interpolate_tag(
+            run_dfs, step_grid=step_grid, min_runs_per_step=min_runs_per_step
+        )
+    if ragged:
+        return _to_ragged(run_dfs, min_runs_per_step)
 
     if min_runs_per_step is not None:
-        if not isinstance(min_runs_per_step, int) or min_runs_per_step < 1:
-            raise ValueError(
-                f"Expected positive integer or None, got {min_runs_per_step=}"
-            )
+        # join='outer' means keep the union of indices from all joined dataframes.
+        # That is, we retain all steps as long as any run recorded a value for it.
+        # Only makes a difference if strict_steps=False and different runs have
+        # non-overlapping steps.
+        df_scalar = pd.concat(run_dfs, join="outer", axis=1)
+        # count(axis=1) returns the number of non-NaN values in each row
+        return df_scalar[df_scalar.count(axis=1) >= min_runs_per_step]
 
-        for key, lst in load_dict.items():
-            # join='outer' means keep the union of indices from all joined dataframes.
-            # That is, we retain all steps as long as any run recorded a value for it.
-            # Only makes a difference if strict_steps=False and different runs have
-            # non-overlapping steps.
-            df_scalar = pd.concat(lst, join="outer", axis=1)
-            # count(axis=1) returns the number of non-NaN values in each row
-            df_scalar = df_scalar[df_scalar.count(axis=1) >= min_runs_per_step]
-            out_dict[key] = df_scalar
+    # join='inner' means keep only the intersection of indices from all joined
+    # dataframes. That is, we only retain steps for which all loaded runs recorded
+    # a value. Only makes a difference if strict_steps=False and different runs have
+    # non-overlapping steps.
+    return pd.concat(run_dfs, join="inner", axis=1)
 
+
+def _infer_step_grid(
+    run_steps: list[np.ndarray], n_points: int | None = None
+) -> np.ndarray:
+    """Steps to interpolate runs onto: the steps of the run that logged the most
+    steps in the range all runs cover, or n_points evenly spaced steps in it.
+    """
+    first = max(int(steps[0]) for steps in run_steps)
+    last = min(int(steps[-1]) for steps in run_steps)
+    if first > last:
+        raise ValueError(
+            f"Runs don't share any step range to interpolate onto: latest first step "
+            f"{first} > earliest last step {last}. Pass an explicit step_grid."
+        )
+    if n_points is not None:
+        return np.unique(np.linspace(first, last, n_points).round().astype(np.int64))
+    in_range = [steps[(steps >= first) & (steps <= last)] for steps in run_steps]
+    return max(in_range, key=len)
+
+
+def _interpolate_tag(
+    run_dfs: list[pd.DataFrame],
+    *,
+    step_grid: int | np.ndarray | None,
+    min_runs_per_step: int | None,
+) -> pd.DataFrame:
+    """Linearly interpolate each run of a tag onto a common step grid.
+
+    All runs are interpolated at once: their steps are concatenated with each run
+    shifted into its own disjoint range, so a single searchsorted() finds the
+    neighboring steps of every (run, grid step) pair. Grid steps outside a run's
+    first and last step are NaN, not extrapolated. Runs whose steps are out of order
+    are sorted first.
+    """
+    # searchsorted() and the first/last step of each run need steps in order
+    run_dfs = [
+        df if df.index.is_monotonic_increasing else df.iloc[np.argsort(df.index)]
+        for df in run_dfs
+    ]
+    run_steps = [df.index.to_numpy(dtype=np.int64) for df in run_dfs]
+    if step_grid is None or isinstance(step_grid, int):
+        grid = _infer_step_grid(run_steps, step_grid)
     else:
-        # join='inner' means keep only the intersection of indices from all joined
-        # dataframes. That is, we only retain steps for which all loaded runs recorded
-        # a value. Only makes a difference if strict_steps=False and different runs have
-        # non-overlapping steps.
-        out_dict = {
-            key: pd.concat(lst, join="inner", axis=1) for key, lst in load_dict.items()
-        }
+        grid = np.unique(np.asarray(step_grid, dtype=np.int64))
+    n_runs, lens = len(run_dfs), [len(steps) for steps in run_steps]
+    ends = np.cumsum(lens)
+    starts = ends - lens
+
+    steps = np.concatenate(run_steps)
+    values = np.concatenate([df["value"].to_numpy(np.float64) for df in run_dfs])
+    base = min(steps.min(), grid.min())
+    span = max(steps.max(), grid.max()) - base + 1
+    shifts = np.arange(n_runs, dtype=np.int64) * span
+    keys = steps - base + np.repeat(shifts, lens)
+    queries = (grid - base)[None, :] + shifts[:, None]  # (n_runs, n_grid)
+
+    upper = np.searchsorted(keys, queries)  # first step >= grid step
+    lower = upper - 1
+    upper_ok = upper < ends[:, None]
+    upper_clip = np.minimum(upper, len(keys) - 1)
+    lower_clip = np.maximum(lower, 0)
+    exact = upper_ok & (keys[upper_clip] == queries)
+    inside = upper_ok & (lower >= starts[:, None])
+
+    x_lo, x_hi = keys[lower_clip], keys[upper_clip]
+    y_lo, y_hi = values[lower_clip], values[upper_clip]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = (queries - x_lo) / (x_hi - x_lo)
+        interpolated = y_lo + weight * (y_hi - y_lo)
+    out = np.where(exact, y_hi, np.where(inside, interpolated, np.nan))
+
+    # like the inner join of aligned steps, keep grid steps all runs cover unless
+    # min_runs_per_step asks for fewer
+    n_covered = (exact | inside).sum(axis=0)
+    keep = n_covered >= (n_runs if min_runs_per_step is None else min_runs_per_step)
+    dtype = run_dfs[0]["value"].dtype
+    return pd.DataFrame(
+        out[:, keep].T.astype(dtype, copy=False),
+        index=pd.Index(grid[keep], name="step"),
+        columns=["value"] * n_runs,
+    )
+
+
+def _infer_time_bin(run_dfs: list[pd.DataFrame]) -> int:
+    """Whole seconds per bin so the longest run gets about one bin per value."""
+    longest = max(float(df["elapsed"].max()) for df in run_dfs)
+    n_values = max(len(df) for df in run_dfs)
+    return max(1, round(longest / n_values))
+
+
+def _bin_elapsed_tag(
+    run_dfs: list[pd.DataFrame], *, time_bin: int | None, min_runs_per_step: int | None
+) -> pd.DataFrame:
+    """Average each run's values in bins of time_bin seconds of elapsed time.
+
+    All runs are binned at once: a (run, bin) key is computed for every value and
+    np.bincount() sums values and counts per key in a single pass. Returns an
+    (n_bins, n_runs) DataFrame indexed by each bin's start in seconds.
+    """
+    if any("elapsed" not in df for df in run_dfs):
+        raise ValueError(
+            "align='elapsed' needs runs loaded with wall time, use "
+            "load_tb_events(align='elapsed') or load_run(wall_time=True)"
+        )
+    if time_bin is None:
+        time_bin = _infer_time_bin(run_dfs)
+    if time_bin < 1:
+        raise ValueError(f"Expected a positive number of seconds, got {time_bin=}")
+
+    n_runs, lens = len(run_dfs), [len(df) for df in run_dfs]
+    values = np.concatenate([df["value"].to_numpy(np.float64) for df in run_dfs])
+    elapsed = np.concatenate([df["elapsed"].to_numpy() for df in run_dfs])
+    bin_ids = (elapsed // time_bin).astype(np.int64)
+    n_bins = int(bin_ids.max()) + 1
+    keys = np.repeat(np.arange(n_runs) * n_bins, lens) + bin_ids
+
+    valid = ~np.isnan(values)
+    keys, values = keys[valid], values[valid]
+    sums = np.bincount(keys, weights=values, minlength=n_runs * n_bins)
+    counts = np.bincount(keys, minlength=n_runs * n_bins)
+    with np.errstate(invalid="ignore"):
+        means = (sums / counts).reshape(n_runs, n_bins).T
+
+    # same as aligning on steps: keep bins all runs logged a value in unless
+    # min_runs_per_step asks for fewer
+    n_present = (counts.reshape(n_runs, n_bins) > 0).sum(axis=0)
+    keep = n_present >= (n_runs if min_runs_per_step is None else min_runs_per_step)
+    dtype = run_dfs[0]["value"].dtype
+    return pd.DataFrame(
+        means[keep].astype(dtype, copy=False),
+        index=pd.Index(np.flatnonzero(keep) * time_bin, name="elapsed"),
+        columns=["value"] * n_runs,
+    )
+
+
+def combine_runs(
+    runs: Mapping[str, dict[str, pd.DataFrame]],
+    *,
+    strict_tags: bool = True,
+    strict_steps: bool = True,
+    min_runs_per_step: int | None = None,
+    ragged: bool = False,
+    align: Align = "steps",
+    step_grid: int | Sequence[int] | np.ndarray | None = None,
+    time_bin: int | None = None,
+    verbose: bool = False,
+) -> dict[str, pd.DataFrame] | dict[str, RaggedScalars]:
+    """Align the output of load_run() for several runs into one array per tag. See
+    load_tb_events() for the meaning of all keyword arguments.
+
+    Args:
+        runs (Mapping[str, dict[str, pd.DataFrame]]): Map of run directories to
+            their load_run() output.
+        strict_tags (bool, optional): Whether to error on runs with different
+            tags. Defaults to True.
+        strict_steps (bool, optional): Whether to error on runs with unequal
+            numbers of steps for the same tag. Defaults to True.
+        min_runs_per_step (int|None, optional): Minimum number of runs that must
+            have recorded a step for it to be kept. Defaults to None.
+        ragged (bool, optional): Whether to return RaggedScalars instead of
+            DataFrames. Defaults to False.
+        align ('steps' | 'interpolate' | 'elapsed', optional): How to align runs.
+            Defaults to 'steps'.
+        step_grid (int | Sequence[int] | np.ndarray | None, optional): Steps to
+            interpolate onto if align='interpolate'. Defaults to None.
+        time_bin (int | None, optional): Seconds per bin if align='elapsed'.
+            Defaults to None.
+        verbose (bool, optional): If true, print progress to stdout. Defaults to False.
+
+    Returns:
+        dict[str, pd.DataFrame] | dict[str, RaggedScalars]: Map of tags to arrays of
+            shape (n_steps, n_runs).
+    """
+    if align not in get_args(Align):
+        raise ValueError(f"unexpected {align=}, must be one of {get_args(Align)}")
+    if align == "elapsed":
+        # np.bincount() in _bin_elapsed_tag() can't take negative bins, and scalars
+        # logged before their run started mean the wall times can't be trusted
+        for run, run_dict in runs.items():
+            for tag, df_scalar in run_dict.items():
+                if "elapsed" in df_scalar and (df_scalar["elapsed"] < 0).any():
+                    raise ValueError(
+                        f"Tag {tag!r} of run {run!r} has scalars logged before the "
+                        "run's first event (negative elapsed time). Its wall times "
+                        "may have been rewritten, align it on steps instead."
+                    )
+    load_dict = _group_by_tag(
+        runs,
+        strict_tags=strict_tags,
+        # runs logging different steps is what interpolation and binning are for
+        strict_steps=strict_steps and align == "steps",
+        min_runs_per_step=min_runs_per_step,
+        verbose=verbose,
+    )
+    return {
+        tag: _combine_tag(
+            lst,
+            min_runs_per_step=min_runs_per_step,
+            ragged=ragged,
+            align=align,
+            step_grid=step_grid,
+            time_bin=time_bin,
+        )
+        for tag, lst in load_dict.items()
+    }
+
+
+def load_tb_events(
+    input_dirs: list[str],
+    *,
+    strict_tags: bool = True,
+    strict_steps: bool = True,
+    handle_dup_steps: HandleDupSteps = None,
+    min_runs_per_step: int | None = None,
+    verify_crc: bool = True,
+    dtype: str = "float64",
+    ragged: bool = False,
+    align: Align = "steps",
+    step_grid: int | Sequence[int] | np.ndarray | None = None,
+    time_bin: int | None = None,
+    tags: Collection[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    index: bool = False,
+    observer: Observer | None = None,
+    verbose: bool = False,
+) -> dict[str, pd.DataFrame] | dict[str, RaggedScalars]:
+    """Read all TensorBoard event files found in input_dirs and return their scalar data
+    as a dict with tags as keys (e.g. 'training/loss', 'validation/mae') and 2d arrays
+    of shape (n_steps, n_runs) as values.
+
+    Args:
+        input_dirs (list[str]): Directory names containing TensorBoard runs to read
+            from disk. Can also be fsspec URLs like 's3://bucket/runs/run_1' for
+            runs on object stores or remote filesystems (requires fsspec).
+        strict_tags (bool, optional): If true, throw error if different runs have
+            different sets of tags. Defaults to True.
+        strict_steps (bool, optional): If true, throw error if equal tags across
+            different runs have unequal numbers of steps. Defaults to True.
+        handle_dup_steps (str|None, optional): How to handle duplicate values recorded
+            for the same tag and step in a single run directory (can come from multiple
+            event files in the same run directory or even from duplicate values in a
+            single event file). One of 'keep-first', 'keep-last' or 'mean' which will
+            keep the first/last occurrence of duplicate steps and compute their mean,
+            respectively. Defaults to None which will raise an error on duplicate steps.
+        min_runs_per_step (int|None, optional): Minimum number of runs across which a
+            given step must be recorded to be kept. Steps present across less runs are
+            dropped. Only plays a role if strict_steps=False. **Warning**: Be aware that
+            with this setting, you'll be reducing variable number of runs, however many
+            recorded a value for a given step as long as there are at least
+            --min-runs-per-step. In other words, the statistics of a reduction will
+            change mid-run. Say you're plotting the mean of an error curve, the sample
+            size of that mean will drop from 10 down to 4 mid-plot if 4 of your models
+            trained for longer than the rest. Be sure to remember when using this.
+        verify_crc (bool, optional): If false, skip CRC32C checksum validation of
+            event file records. Speeds up loading large event files you trust, e.g.
+            ones written by your own jobs on local disk. Defaults to True.
+        dtype (str, optional): Floating point dtype of the loaded values. Pass
+            'float32' to roughly halve memory on large sweeps. reduce_events()
+            upcasts each tag to float64 only while reducing it. Defaults to 'float64'.
+        ragged (bool, optional): If true, return RaggedScalars instead of DataFrames.
+            Keeps the same steps as the DataFrames would but never builds the dense
+            NaN-padded union of all runs' steps, which can be huge with
+            strict_steps=False when runs log at different frequencies.
+            reduce_events() accepts either. Defaults to False.
+        align ('steps' | 'interpolate' | 'elapsed', optional): 'steps' aligns runs
+            on the steps they logged (see strict_steps and min_runs_per_step).
+            'interpolate' linearly interpolates every run onto a common step_grid
+            instead, which gives a small dense array when runs log at different
+            intervals. Grid steps outside a run's logged range count as missing for
+            min_runs_per_step, by default only steps all runs cover are kept.
+            'elapsed' reduces on elapsed wall time instead of steps: each run's
+            values are averaged in bins of time_bin seconds since the run's first
+            event and the arrays are indexed by bin start in seconds, so runs with
+            different throughput line up by time. strict_steps and ragged
+            don't apply to 'interpolate' and 'elapsed'. Defaults to 'steps'.
+        step_grid (int | Sequence[int] | np.ndarray | None, optional): Steps to
+            interpolate onto if align='interpolate'. An int N picks N evenly spaced
+            steps in the range all runs of a tag cover. None uses the steps of the
+            run that logged the most steps in that range. Defaults to None.
+        time_bin (int | None, optional): Whole seconds per bin if align='elapsed'.
+            None picks a width giving the longest run about one bin per value.
+            Defaults to None.
+        tags (Collection[str] | None, optional): fnmatch-style patterns (e.g.
+            'train/*') of tags to load. Defaults to None meaning all tags.
+        steps (tuple[int | None, int | None] | None, optional): Inclusive range
+            (first, last) of steps to load. None for either bound leaves that side
+            open. Defaults to None meaning all steps.
+        index (bool, optional): If true, keep a sidecar index of scalar record
+            offsets in each local run directory (created on first use, refreshed
+            incrementally after that, see index.update_index()) and use it to parse
+            only records that pass the tags and steps filters. Defaults to False.
+        observer (Observer | None, optional): Instrumentation hooks called as each
+            event file is opened and each run is loaded or fails, see hooks.Observer.
+            Defaults to None.
+        verbose (bool, optional): If true, print progress to stdout. Defaults to False.
+
+    Returns:
+        dict: A dictionary mapping scalar tags (i.e. keys like 'train/loss', 'val/mae')
+            to Pandas DataFrames (or RaggedScalars if ragged=True).
+    """
+    _check_input_dirs(input_dirs)
+    _check_run_args(handle_dup_steps, dtype)
+
+    # runs usually log a tag at the same steps, in which case they all share the step
+    # index of the first run. That saves memory and lets pd.concat() skip aligning them.
+    step_indexes: dict[str, pd.Index] = {}
+    runs = {
+        in_dir: load_run(
+            in_dir,
+            handle_dup_steps=handle_dup_steps,
+            verify_crc=verify_crc,
+            dtype=dtype,
+            tags=tags,
+            steps=steps,
+            index=index,
+            step_indexes=step_indexes,
+            wall_time=align == "elapsed",
+            observer=observer,
+        )
+        for in_dir in tqdm(input_dirs, disable=not verbose, desc="Loading runs")
+    }
+    out_dict = combine_runs(
+        runs,
+        strict_tags=strict_tags,
+        strict_steps=strict_steps,
+        min_runs_per_step=min_runs_per_step,
+        ragged=ragged,
+        align=align,
+        step_grid=step_grid,
+        time_bin=time_bin,
+        verbose=verbose,
+    )
 
     if verbose:
         n_tags = len(out_dict)
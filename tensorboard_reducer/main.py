@@ -2,12 +2,299 @@
 
 from __future__ import annotations
 
-from argparse import ArgumentParser
+import contextlib
+import os
+import socket
+import stat
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
 from importlib.metadata import version
 
+import numpy as np
+from tqdm import tqdm
+
+from tensorboard_reducer.check import check_tb_events, format_check_report
+from tensorboard_reducer.compact import compact_runs
+from tensorboard_reducer.hooks import JsonLinesObserver
+from tensorboard_reducer.index import update_index
+from tensorboard_reducer.jobs import read_jobs, run_jobs
 from tensorboard_reducer.load import load_tb_events
-from tensorboard_reducer.reduce import reduce_events
-from tensorboard_reducer.write import write_data_file, write_tb_events
+from tensorboard_reducer.pyramid import add_pyramid_levels
+from tensorboard_reducer.reduce import iter_reduced_tags, reduce_events
+from tensorboard_reducer.resume import reduce_with_checkpoints
+from tensorboard_reducer.write import write_data_file, write_npy_dir, write_tb_events
+
+
+def _parse_step_range(arg: str) -> tuple[int | None, int | None]:
+    """Parse 'FIRST:LAST' into an inclusive step range. Either side may be empty."""
+    first, sep, last = arg.partition(":")
+    if not sep:
+        raise ArgumentTypeError(f"expected FIRST:LAST, got {arg!r}")
+    try:
+        return (int(first) if first else None, int(last) if last else None)
+    except ValueError:
+        raise ArgumentTypeError(f"expected integer steps, got {arg!r}") from None
+
+
+def _parse_step_grid(arg: str) -> int | np.ndarray | None:
+    """Parse the --interpolate grid: 'auto', a number of points N or an inclusive
+    'FIRST:LAST:STRIDE' range.
+    """
+    try:
+        if arg == "auto":
+            return None
+        if ":" not in arg:
+            n_points = int(arg)
+            if n_points < 2:  # noqa: PLR2004
+                raise ArgumentTypeError(f"expected at least 2 points, got {arg!r}")
+            return n_points
+        first, last, stride = map(int, arg.split(":"))
+    except ValueError:
+        raise ArgumentTypeError(
+            f"expected 'auto', a number of points or FIRST:LAST:STRIDE, got {arg!r}"
+        ) from None
+    if stride < 1 or last < first:
+        raise ArgumentTypeError(f"expected FIRST <= LAST and STRIDE >= 1, got {arg!r}")
+    return np.arange(first, last + 1, stride)
+
+
+def _parse_time_bin(arg: str) -> int | None:
+    """Parse the --elapsed bin width: 'auto' or a positive number of seconds."""
+    if arg == "auto":
+        return None
+    try:
+        seconds = int(arg)
+    except ValueError:
+        seconds = 0
+    if seconds < 1:
+        raise ArgumentTypeError(f"expected 'auto' or positive seconds, got {arg!r}")
+    return seconds
+
+
+def _parse_pyramid_factor(arg: str) -> int:
+    """Parse the --pyramid factor: an integer of at least 2."""
+    try:
+        factor = int(arg)
+    except ValueError:
+        factor = 0
+    if factor < 2:  # noqa: PLR2004
+        raise ArgumentTypeError(f"expected an integer of at least 2, got {arg!r}")
+    return factor
+
+
+_BYTE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def _parse_byte_size(arg: str) -> int:
+    """Parse a size like '512M', '8G' or '1.5G' (binary units) into bytes."""
+    number, unit = arg.rstrip("Bb"), ""
+    if number and number[-1].upper() in _BYTE_UNITS:
+        number, unit = number[:-1], number[-1].upper()
+    try:
+        size = float(number) * _BYTE_UNITS[unit]
+    except ValueError:
+        raise ArgumentTypeError(
+            f"expected a size like 512M or 8G, got {arg!r}"
+        ) from None
+    if size <= 0:
+        raise ArgumentTypeError(f"expected a positive size, got {arg!r}")
+    return int(size)
+
+
+def index_main(argv: list[str]) -> int:
+    """Implement tb-reducer index subcommand.
+
+    Args:
+        argv (list[str]): Command line arguments after 'index'.
+
+    Returns:
+        int: 0 if successful else error code
+    """
+    parser = ArgumentParser(
+        "tb-reducer index",
+        description="Build or refresh the sidecar index of scalar record offsets in "
+        "each run directory. Loading with --index and --tags/--steps filters then only "
+        "parses the records it needs.",
+    )
+    parser.add_argument("input_dirs", nargs="+", help="Run directories to index.")
+    parser.add_argument(
+        "--no-verify-crc",
+        action="store_true",
+        help="Skip CRC32C checksum validation of event file records.",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Whether to print progress."
+    )
+    args = parser.parse_args(argv)
+
+    for in_dir in tqdm(args.input_dirs, disable=not args.verbose, desc="Indexing"):
+        index = update_index(in_dir, verify_crc=not args.no_verify_crc)
+        if args.verbose:
+            tags = {tag for entry in index["files"].values() for tag in entry["tags"]}
+            print(f"- {in_dir}: {len(index['files'])} event files, {len(tags)} tags")
+    return 0
+
+
+def compact_main(argv: list[str]) -> int:
+    """Implement tb-reducer compact subcommand.
+
+    Args:
+        argv (list[str]): Command line arguments after 'compact'.
+
+    Returns:
+        int: 0 if successful else error code
+    """
+    parser = ArgumentParser(
+        "tb-reducer compact",
+        description="Rewrite run directories into scalar-only event files, dropping "
+        "images, histograms and other non-scalar data. Tags, steps, wall times and "
+        "value dtypes are preserved, so loading the compacted runs gives the same "
+        "scalars while reading only a fraction of the bytes.",
+    )
+    parser.add_argument("input_dirs", nargs="+", help="Run directories to compact.")
+    parser.add_argument(
+        "-o",
+        "--outpath",
+        required=True,
+        help="Directory in which to create one compacted run directory per input "
+        "run, named like the input run.",
+    )
+    parser.add_argument(
+        "-f",
+        "--overwrite",
+        action="store_true",
+        help="Whether to overwrite existing compacted run directories.",
+    )
+    parser.add_argument(
+        "--tags",
+        type=lambda s: s.split(","),
+        default=None,
+        help="Comma-separated tags to keep, can be glob patterns. Default is all.",
+    )
+    parser.add_argument(
+        "--steps",
+        type=_parse_step_range,
+        default=None,
+        help="Inclusive range FIRST:LAST of steps to keep. Default is all steps.",
+    )
+    parser.add_argument(
+        "--no-verify-crc",
+        action="store_true",
+        help="Skip CRC32C checksum validation of event file records.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of processes to compact runs with. Default 0 means one per "
+        "CPU core.",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Whether to print progress."
+    )
+    args = parser.parse_args(argv)
+
+    results = compact_runs(
+        args.input_dirs,
+        args.outpath,
+        workers=args.workers or None,
+        verify_crc=not args.no_verify_crc,
+        tags=args.tags,
+        steps=args.steps,
+        overwrite=args.overwrite,
+    )
+    if args.verbose:
+        for out_dir, result in results.items():
+            print(f"- {out_dir}: {result['n_scalars']:,} scalars")
+    return 0
+
+
+def _is_stale_socket(path: str) -> bool:
+    """Whether path is a Unix socket no server is listening on anymore, e.g. left
+    behind by a killed 'tb-reducer serve'.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return False
+    except FileNotFoundError:
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            return True
+    return False
+
+
+def serve_main(argv: list[str]) -> int:
+    """Implement tb-reducer serve subcommand.
+
+    Args:
+        argv (list[str]): Command line arguments after 'serve'.
+
+    Returns:
+        int: 0 if successful else error code
+    """
+    parser = ArgumentParser(
+        "tb-reducer serve",
+        description="Run a local HTTP server that reduces runs on demand. Parsed runs "
+        "are kept in an in-memory LRU cache and only reparsed when their event files "
+        'change. POST a JSON body like {"input_dirs": [...], "reduce_ops": '
+        '["mean"]} to /reduce.',
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="TCP port.")
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Listen on this Unix socket path instead of --host and --port.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=_parse_byte_size,
+        default="2G",
+        help="Memory budget for cached runs, e.g. 512M or 8G. Default is 2G.",
+    )
+    parser.add_argument(
+        "--no-verify-crc",
+        action="store_true",
+        help="Skip CRC32C checksum validation of event file records.",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Use sidecar indexes of local runs, see 'tb-reducer index'.",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Whether to log requests."
+    )
+    args = parser.parse_args(argv)
+
+    # imported here so other subcommands don't pay for the server's imports
+    from tensorboard_reducer.serve import RunCache, make_server  # noqa: PLC0415
+
+    if args.socket is not None and _is_stale_socket(args.socket):
+        os.remove(args.socket)
+    cache = RunCache(
+        args.cache_size, verify_crc=not args.no_verify_crc, index=args.index
+    )
+    server = make_server(
+        cache,
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        verbose=args.verbose,
+    )
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Serving reductions on {address}, press Ctrl+C to stop")
+    try:
+        with server, contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+    finally:
+        if args.socket is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(args.socket)
+    return 0
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -19,6 +306,13 @@ def main(argv: list[str] | None = None) -> int:
     Returns:
         int: 0 if successful else error code
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    # subcommands come first, anything else is a list of run directories to reduce.
+    # A run directory that happens to be named like a subcommand takes precedence.
+    if argv and argv[0] in SUBCOMMANDS and not os.path.exists(argv[0]):
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
     parser = ArgumentParser(
         "TensorBoard Reducer",
         description="Compute reduced statistics (mean, std, min, max, median, etc.) of "
@@ -27,12 +321,22 @@ def main(argv: list[str] | None = None) -> int:
 
     parser.add_argument(
         "input_dirs",
-        nargs="+",
+        nargs="*",
         help=(
             "List of run directories to reduce. Use shell expansion (e.g. "
             "runs/of_some_model/*) to glob as many directories as required."
         ),
     )
+    parser.add_argument(
+        "--jobs",
+        default=None,
+        metavar="JOBS_TOML",
+        help="Run all reductions described in a TOML job file (see readme) instead "
+        "of reducing input_dirs. Each run directory is parsed only once no matter "
+        "how many jobs use it and jobs run in parallel (see --workers). "
+        "--no-verify-crc, --float32, --index and --workers apply to all jobs, "
+        "other options are set per job in the job file.",
+    )
     parser.add_argument(
         "-o",
         "--outpath",
@@ -51,6 +355,10 @@ def main(argv: list[str] | None = None) -> int:
         type=lambda s: s.split(","),
         default=["mean"],
         help="Comma-separated names of numpy reduction ops (mean, std, min, max, ...). "
+        "Custom ops can be given as 'module:function' where function maps the "
+        "(n_steps, n_runs) array of a tag to an array of shape (n_steps,). "
+        "Append '@ema0.6', '@rolling_mean10' or '@rolling_median10' to an op to "
+        "also write its smoothed result, e.g. 'mean,mean@ema0.6'. "
         "Default is mean. Each reduction is written to a separate output directory "
         "suffixed by op name. E.g. if outpath='reduced-run', the mean reduction will "
         "be written to 'reduced-run-mean'.",
@@ -72,6 +380,30 @@ def main(argv: list[str] | None = None) -> int:
         help="Don't error if equal tags across different runs have unequal numbers of "
         "steps.",
     )
+    parser.add_argument(
+        "--interpolate",
+        type=_parse_step_grid,
+        nargs="?",
+        const="auto",
+        default=False,
+        metavar="GRID",
+        help="Linearly interpolate every run onto a common step grid instead of "
+        "aligning runs on the steps they logged. GRID is 'auto' (default, the steps "
+        "of the densest run in the range all runs cover), a number of evenly spaced "
+        "steps in that range or FIRST:LAST:STRIDE. Implies --lax-steps.",
+    )
+    parser.add_argument(
+        "--elapsed",
+        type=_parse_time_bin,
+        nargs="?",
+        const="auto",
+        default=False,
+        metavar="SECONDS",
+        help="Reduce on elapsed wall time instead of steps: each run's values are "
+        "averaged in bins of SECONDS since the run's first event and written with "
+        "the bin start in seconds as step. 'auto' (default) picks a width giving "
+        "the longest run about one bin per value. Implies --lax-steps.",
+    )
     parser.add_argument(
         "--handle-dup-steps",
         choices=("keep-first", "keep-last", "mean"),
@@ -95,6 +427,104 @@ def main(argv: list[str] | None = None) -> int:
         "mid-plot if 4 of your models trained for longer than the rest. Be sure to "
         "remember when using this.",
     )
+    parser.add_argument(
+        "--no-verify-crc",
+        action="store_true",
+        help="Skip CRC32C checksum validation of event file records. Speeds up "
+        "loading large event files you trust.",
+    )
+    parser.add_argument(
+        "--float32",
+        action="store_true",
+        help="Load values as float32 instead of float64 to roughly halve memory use. "
+        "Reductions are still computed in float64.",
+    )
+    parser.add_argument(
+        "--tags",
+        type=lambda s: s.split(","),
+        default=None,
+        help="Comma-separated tags to load, can be glob patterns like 'train/*'. "
+        "Default is all tags.",
+    )
+    parser.add_argument(
+        "--steps",
+        type=_parse_step_range,
+        default=None,
+        help="Inclusive range FIRST:LAST of steps to load. Either side can be left "
+        "empty, e.g. '1000:' for all steps from 1000 on. Default is all steps.",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Create/refresh a sidecar index of scalar record offsets in each run "
+        "directory and use it to only parse records matching --tags/--steps. Makes "
+        "repeated filtered loads of large event files much faster. Also see "
+        "'tb-reducer index'.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads to compute reductions with. Tags are partitioned "
+        "into similarly sized chunks across threads. 0 means one per CPU core. "
+        "Default is 1.",
+    )
+    parser.add_argument(
+        "--smooth-runs",
+        default=None,
+        help="Smooth each run along steps before reducing, e.g. 'ema0.6' for "
+        "TensorBoard-style debiased EMA with weight 0.6, 'rolling_mean10' or "
+        "'rolling_median10' for centered 10-step windows.",
+    )
+    parser.add_argument(
+        "--pyramid",
+        type=_parse_pyramid_factor,
+        default=None,
+        metavar="FACTOR",
+        help="Also write downsampled levels of each reduction for fast dashboard "
+        "rendering, each summarizing FACTOR times more steps per point by their "
+        "min, mean and max (e.g. 'outpath-mean-x10-max'), until a level has at most "
+        "1000 points. Default is no downsampled levels.",
+    )
+    parser.add_argument(
+        "--resume",
+        default=None,
+        metavar="STATE_DIR",
+        help="Save every parsed run and reduced tag to STATE_DIR as soon as it's "
+        "done. Rerunning the same command after an interruption skips the runs and "
+        "tags already there. Runs whose event files changed are parsed again.",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=_parse_byte_size,
+        default=None,
+        help="Memory budget for loaded scalars like 512M or 8G. Runs are first "
+        "scanned for the step counts of each tag, then tags are loaded and reduced "
+        "in batches estimated to fit the budget (re-reading event files per batch, "
+        "combine with --index to make that cheap). Tags too large on their own are "
+        "reduced in step ranges. Default is to load everything at once.",
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        default=None,
+        metavar="PATH",
+        help="Append one JSON line per parsed event file, loaded (or failed) run, "
+        "reduced tag and written output with timings and sizes to PATH ('-' for "
+        "stderr) for feeding into metrics systems.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only scan input runs for the problems --lax-tags, --lax-steps and "
+        "--handle-dup-steps guard against (missing tags, unequal step counts, "
+        "duplicate steps) and report them without loading or writing anything. "
+        "Exits with code 1 if problems were found.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the --check report as JSON.",
+    )
     parser.add_argument(
         "--verbose", action="store_true", help="Whether to print progress."
     )
@@ -108,24 +538,133 @@ def main(argv: list[str] | None = None) -> int:
 
     out_path, overwrite, reduce_ops = args.outpath, args.overwrite, args.reduce_ops
 
-    events_dict = load_tb_events(
-        args.input_dirs,
-        strict_tags=not args.lax_tags,
-        strict_steps=not args.lax_steps,
-        handle_dup_steps=args.handle_dup_steps,
-        min_runs_per_step=args.min_runs_per_step,
-        verbose=args.verbose,
-    )
+    if args.jobs is not None:
+        # everything else is set per job in the job file and would be ignored
+        job_wide = {"jobs", "no_verify_crc", "float32", "index", "workers", "verbose"}
+        ignored = [
+            "--" + dest.replace("_", "-")
+            for dest, value in vars(args).items()
+            if dest not in {*job_wide, "input_dirs"}
+            and value != parser.get_default(dest)
+        ]
+        if args.input_dirs:
+            ignored.insert(0, "run directories")
+        if ignored:
+            parser.error(
+                f"--jobs can't be combined with {', '.join(ignored)}, set per-job "
+                "options in the job file"
+            )
+        run_jobs(
+            read_jobs(args.jobs),
+            verify_crc=not args.no_verify_crc,
+            dtype="float32" if args.float32 else "float64",
+            index=args.index,
+            workers=args.workers or None,
+            verbose=args.verbose,
+        )
+        return 0
+    if not args.input_dirs:
+        parser.error("expected run directories to reduce or --jobs")
 
-    reduced_events = reduce_events(events_dict, reduce_ops, verbose=args.verbose)
+    if args.check:
+        report = check_tb_events(
+            args.input_dirs,
+            strict_tags=not args.lax_tags,
+            strict_steps=not args.lax_steps,
+            handle_dup_steps=args.handle_dup_steps,
+            verify_crc=not args.no_verify_crc,
+            tags=args.tags,
+            steps=args.steps,
+        )
+        print(format_check_report(report, as_json=args.json))
+        return 0 if report["ok"] else 1
 
-    common_kwds = {"overwrite": overwrite, "verbose": args.verbose}
-    if out_path.endswith(".csv"):
-        write_data_file(reduced_events, out_path, **common_kwds)
-    else:
-        write_tb_events(reduced_events, out_path, **common_kwds)
+    load_kwargs = {
+        "strict_tags": not args.lax_tags,
+        "strict_steps": not args.lax_steps,
+        "handle_dup_steps": args.handle_dup_steps,
+        "min_runs_per_step": args.min_runs_per_step,
+        "verify_crc": not args.no_verify_crc,
+        "dtype": "float32" if args.float32 else "float64",
+        # ragged storage yields the same reductions without NaN-padding runs that
+        # logged different steps into one dense array
+        "ragged": args.lax_steps,
+        "tags": args.tags,
+        "steps": args.steps,
+        "index": args.index,
+    }
+    if args.interpolate is not False and args.elapsed is not False:
+        parser.error("--interpolate and --elapsed can't be combined")
+    if args.interpolate is not False:
+        load_kwargs |= {"align": "interpolate", "step_grid": args.interpolate}
+    if args.elapsed is not False:
+        load_kwargs |= {"align": "elapsed", "time_bin": args.elapsed}
+    if args.max_memory is not None and args.resume is not None:
+        parser.error("--max-memory and --resume can't be combined")
+    if args.max_memory is not None and "align" in load_kwargs:
+        parser.error("--max-memory can't be combined with --interpolate or --elapsed")
+    if args.max_memory is not None and args.workers != parser.get_default("workers"):
+        # batches are loaded and reduced one tag at a time in a single thread
+        parser.error("--max-memory can't be combined with --workers")
+
+    observer_context = (
+        contextlib.nullcontext()
+        if args.metrics_jsonl is None
+        else JsonLinesObserver(args.metrics_jsonl)
+    )
+    # closes the metrics file also if loading, reducing or writing fails
+    with observer_context as observer:
+        reduce_kwargs = {
+            "workers": args.workers or None,
+            "smooth_runs": args.smooth_runs,
+            "observer": observer,
+            "verbose": args.verbose,
+        }
+        if args.max_memory is not None:
+            del load_kwargs["ragged"]  # implied by strict_steps
+            reduced_events = {op: {} for op in reduce_ops}
+            for tag, reduced in iter_reduced_tags(
+                args.input_dirs,
+                reduce_ops,
+                **load_kwargs,
+                smooth_runs=args.smooth_runs,
+                max_memory=args.max_memory,
+                observer=observer,
+            ):
+                for op, result in reduced.items():
+                    reduced_events[op][tag] = result
+        elif args.resume is not None:
+            reduced_events = reduce_with_checkpoints(
+                args.resume,
+                args.input_dirs,
+                reduce_ops,
+                **load_kwargs,
+                **reduce_kwargs,
+            )
+        else:
+            events_dict = load_tb_events(
+                args.input_dirs, **load_kwargs, observer=observer, verbose=args.verbose
+            )
+            reduced_events = reduce_events(events_dict, reduce_ops, **reduce_kwargs)
+        if args.pyramid is not None:
+            reduced_events = add_pyramid_levels(reduced_events, factor=args.pyramid)
+
+        common_kwds = {
+            "overwrite": overwrite,
+            "observer": observer,
+            "verbose": args.verbose,
+        }
+        if out_path.endswith(".csv"):
+            write_data_file(reduced_events, out_path, **common_kwds)
+        elif out_path.rstrip("/\\").endswith(".npy"):
+            write_npy_dir(reduced_events, out_path, **common_kwds)
+        else:
+            write_tb_events(reduced_events, out_path, **common_kwds)
     return 0
 
 
+SUBCOMMANDS = {"compact": compact_main, "index": index_main, "serve": serve_main}
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""Downsampled copies of reductions (a resolution pyramid) so dashboards can show a
+coarse overview of very long curves instantly and only load full resolution when
+zooming in.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from tensorboard_reducer.write import _split_outputs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# stop adding coarser levels once a level has at most this many points
+_MIN_LEVEL_LEN = 1000
+
+
+def _bucket_levels(
+    series: pd.Series, factor: int, n_levels: int | None
+) -> Iterator[tuple[int, pd.DataFrame]]:
+    """Yield (stride, buckets) for each level, where each row of buckets summarizes
+    stride consecutive points of series by their min, mean and max and is indexed
+    by its first step.
+
+    Each level is computed from the previous one's per-bucket min, max, sum and
+    count with ufunc.reduceat(), so building all levels costs about as much as one
+    pass over series.
+    """
+    steps = series.index.to_numpy()
+    values = series.to_numpy(dtype=np.float64)
+    finite = np.isfinite(values)
+    mins, maxs = values, values
+    sums, counts = np.where(finite, values, 0), finite.astype(np.int64)
+
+    level = 0
+    while n_levels is None or level < n_levels:
+        if n_levels is None and len(steps) <= _MIN_LEVEL_LEN:
+            return
+        starts = np.arange(0, len(steps), factor)
+        steps = steps[starts]
+        mins = np.fmin.reduceat(mins, starts)
+        maxs = np.fmax.reduceat(maxs, starts)
+        sums = np.add.reduceat(sums, starts)
+        counts = np.add.reduceat(counts, starts)
+        level += 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        buckets = pd.DataFrame(
+            {"min": mins, "mean": means, "max": maxs}, index=pd.Index(steps)
+        )
+        yield factor**level, buckets
+        if len(steps) == 1:
+            return
+
+
+def add_pyramid_levels(
+    reductions: dict[str, dict[str, pd.Series]],
+    *,
+    factor: int = 10,
+    n_levels: int | None = None,
+) -> dict[str, dict[str, pd.Series | pd.DataFrame]]:
+    """Add downsampled levels of each reduction next to it.
+
+    Level k summarizes every factor**k consecutive steps into one bucket with the
+    min, mean and max of its values, so spikes stay visible at coarse levels. Each
+    level is stored as a reduction '{op}-x{factor**k}' with those three outputs,
+    which write_tb_events() writes to run directories like 'out-mean-x10-max' and
+    write_data_file() to columns of the same name.
+
+    Args:
+        reductions (dict[str, dict[str, pd.Series]]): Output of reduce_events().
+        factor (int, optional): Number of buckets of a level summarized into one
+            bucket of the next coarser level. Defaults to 10.
+        n_levels (int | None, optional): Number of downsampled levels. Defaults to
+            None meaning as many as needed for the coarsest level of each tag to
+            have at most 1000 points.
+
+    Returns:
+        dict[str, dict[str, pd.Series | pd.DataFrame]]: reductions with the
+            downsampled levels added after each op.
+    """
+    if factor < 2:  # noqa: PLR2004
+        raise ValueError(f"Pyramid factor must be at least 2, got {factor}")
+    if n_levels is not None and n_levels < 1:
+        raise ValueError(f"n_levels must be at least 1, got {n_levels}")
+
+    out: dict[str, dict[str, pd.Series | pd.DataFrame]] = {}
+    for op, events_dict in _split_outputs(reductions).items():
+        out[op] = events_dict
+        for tag, series in events_dict.items():
+            for stride, buckets in _bucket_levels(series, factor, n_levels):
+                out.setdefault(f"{op}-x{stride}", {})[tag] = buckets
+    return out
@@ -2,18 +2,554 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import glob
+import importlib
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from tensorboard_reducer import bootstrap, budget, robust, smooth
+from tensorboard_reducer.check import check_tb_events
+from tensorboard_reducer.load import (
+    HandleDupSteps,
+    RaggedScalars,
+    _check_input_dirs,
+    _check_run_args,
+    _combine_tag,
+    _group_by_tag,
+    load_run,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+
+    from tensorboard_reducer.hooks import Observer
+
+    # takes a float64 array of shape (n_steps, n_runs) with NaNs for missing values
+    # and returns the reduced array of shape (n_steps,)
+    ReduceOp = Callable[[np.ndarray], np.ndarray]
+
+
+def _ragged_sum_count(
+    values: np.ndarray, step_ids: np.ndarray, n_steps: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """NaN-skipping per-step sum and count of non-NaN values."""
+    valid = ~np.isnan(values)
+    values, step_ids = values[valid], step_ids[valid]
+    sums = np.bincount(step_ids, weights=values, minlength=n_steps)
+    counts = np.bincount(step_ids, minlength=n_steps)
+    return sums, counts
+
+
+def _ragged_mean(values: np.ndarray, step_ids: np.ndarray, n_steps: int) -> np.ndarray:
+    sums, counts = _ragged_sum_count(values, step_ids, n_steps)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def _ragged_var(values: np.ndarray, step_ids: np.ndarray, n_steps: int) -> np.ndarray:
+    # two-pass (mean first, then squared deviations) for numerical stability, ddof=1
+    # like pandas
+    mean = _ragged_mean(values, step_ids, n_steps)
+    sq_dev, counts = _ragged_sum_count(
+        (values - mean[step_ids]) ** 2, step_ids, n_steps
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 1, sq_dev / (counts - 1), np.nan)
+
+
+def _ragged_extremum(ufunc: np.ufunc) -> Callable[..., np.ndarray]:
+    """Per-step min/max via a single sort by step and ufunc.reduceat."""
+
+    def kernel(values: np.ndarray, step_ids: np.ndarray, n_steps: int) -> np.ndarray:
+        valid = ~np.isnan(values)
+        values, step_ids = values[valid], step_ids[valid]
+        out = np.full(n_steps, np.nan)
+        if len(values) == 0:
+            return out
+        order = np.argsort(step_ids, kind="stable")
+        sorted_ids = step_ids[order]
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        out[sorted_ids[starts]] = ufunc.reduceat(values[order], starts)
+        return out
+
+    return kernel
+
+
+def _ragged_median(
+    values: np.ndarray, step_ids: np.ndarray, n_steps: int
+) -> np.ndarray:
+    valid = ~np.isnan(values)
+    values, step_ids = values[valid], step_ids[valid]
+    out = np.full(n_steps, np.nan)
+    if len(values) == 0:
+        return out
+    # sort by step, then by value within each step
+    order = np.lexsort((values, step_ids))
+    sorted_vals, sorted_ids = values[order], step_ids[order]
+    counts = np.bincount(sorted_ids, minlength=n_steps)
+    present = np.flatnonzero(counts)
+    starts = np.concatenate(([0], np.cumsum(counts)))[present]
+    lower = sorted_vals[starts + (counts[present] - 1) // 2]
+    upper = sorted_vals[starts + counts[present] // 2]
+    out[present] = (lower + upper) / 2
+    return out
+
+
+# NaN-skipping reductions over RaggedScalars, matching pandas' DataFrame ops
+_RAGGED_KERNELS: dict[str, Callable[[np.ndarray, np.ndarray, int], np.ndarray]] = {
+    "sum": lambda vals, ids, n: _ragged_sum_count(vals, ids, n)[0],
+    "count": lambda vals, ids, n: _ragged_sum_count(vals, ids, n)[1],
+    "mean": _ragged_mean,
+    "var": _ragged_var,
+    "std": lambda vals, ids, n: np.sqrt(_ragged_var(vals, ids, n)),
+    "min": _ragged_extremum(np.minimum),
+    "max": _ragged_extremum(np.maximum),
+    "median": _ragged_median,
+}
+
+
+def _reduce_ragged(ragged: RaggedScalars, op: str) -> pd.Series:
+    """Reduce one tag stored as RaggedScalars with op's kernel in _RAGGED_KERNELS
+    without densifying it.
+    """
+    values = ragged.values.astype(np.float64, copy=False)  # noqa: PD011
+    reduced = _RAGGED_KERNELS[op](values, ragged.step_ids, len(ragged.steps))
+    return pd.Series(reduced, index=pd.Index(ragged.steps, name="step"))
+
+
+class _CustomOp(NamedTuple):
+    func: ReduceOp
+    per_step: bool  # whether each step's result only depends on that step's values
+    # order statistic positions func needs for n values, see register_reduce_op()
+    order_stats: Callable[[int], Sequence[int]] | None = None
+    # names of the columns of a func returning shape (n_steps, len(outputs))
+    outputs: tuple[str, ...] | None = None
+
+
+_CUSTOM_OPS: dict[str, _CustomOp] = {}
+
+
+class _SmoothedOp(NamedTuple):
+    """Op named '{base}@{smoother}' that smooths the result of op base along steps."""
+
+    base: str
+    base_op: _CustomOp | _SmoothedOp | None
+    smoother: Callable[[np.ndarray], np.ndarray]
+    per_step: bool = False
+
+
+def register_reduce_op(
+    name: str,
+    func: ReduceOp | None = None,
+    *,
+    per_step: bool = True,
+    order_stats: Callable[[int], Sequence[int]] | None = None,
+    outputs: Sequence[str] | None = None,
+) -> Callable[[ReduceOp], ReduceOp] | ReduceOp:
+    """Register a custom reduce op to use by name in reduce_events() and the CLI's
+    --reduce-ops. Can also be used as decorator: @register_reduce_op("iqm").
+
+    Custom ops receive the whole aligned block of a tag at once, a float64 array of
+    shape (n_steps, n_runs) with NaN for steps a run didn't record, and must return
+    a vectorized per-step result of shape (n_steps,). They're evaluated in the same
+    pass over each tag as built-in ops.
+
+    Args:
+        name (str): Name of the op. Takes precedence over pandas ops of the same
+            name.
+        func (ReduceOp | None, optional): The op. Defaults to None which returns a
+            decorator.
+        per_step (bool, optional): Whether a step's result only depends on the
+            values of that step, like for mean or percentiles but not for smoothing
+            across steps. Only ops with per_step=True let reduce_events(workers=N)
+            split large tags into step ranges. Defaults to True.
+        order_stats (Callable[[int], Sequence[int]] | None, optional): For ops based
+            on order statistics (percentiles, trimmed means, ...), a function
+            returning the sorted positions func needs for n values per step. func
+            then receives the block partitioned with np.partition() instead, shared
+            by all such ops reducing a tag so partition work isn't repeated. Rows
+            with NaNs are fully sorted, NaNs last. See the robust module for
+            examples. Defaults to None.
+        outputs (Sequence[str] | None, optional): For ops with several results per
+            step like confidence intervals, names of the columns of the
+            (n_steps, len(outputs)) array func returns. The op then reduces each tag
+            to a DataFrame with these columns, written to disk as separate
+            '{op}-{output}' reductions. Defaults to None.
+
+    Returns:
+        ReduceOp | Callable[[ReduceOp], ReduceOp]: func or a decorator registering
+            the function it wraps.
+    """
+
+    def register(func: ReduceOp) -> ReduceOp:
+        _CUSTOM_OPS[name] = _CustomOp(
+            func, per_step, order_stats, None if outputs is None else tuple(outputs)
+        )
+        return func
+
+    return register if func is None else register(func)
+
+
+register_reduce_op("mad", robust.mad, order_stats=robust.median_kth)
+register_reduce_op(
+    "iqm",
+    partial(robust.trimmed_mean, cut=25),
+    order_stats=partial(robust.trimmed_mean_kth, cut=25),
+)
+
+
+def _percentile_op(q: str) -> _CustomOp:
+    if float(q) > 100:  # noqa: PLR2004
+        raise ValueError(f"Percentile must be between 0 and 100, got p{q}")
+    return _CustomOp(
+        partial(robust.percentile, q=float(q)),
+        per_step=True,
+        order_stats=partial(robust.percentile_kth, q=float(q)),
+    )
+
+
+def _trimmed_mean_op(cut: str | None) -> _CustomOp:
+    cut_pct = 10.0 if cut is None else float(cut)
+    if cut_pct >= 50:  # noqa: PLR2004
+        raise ValueError(f"Trimmed mean must cut less than 50% per side, got {cut}")
+    return _CustomOp(
+        partial(robust.trimmed_mean, cut=cut_pct),
+        per_step=True,
+        order_stats=partial(robust.trimmed_mean_kth, cut=cut_pct),
+    )
+
+
+def _bootstrap_ci_op(
+    level: str, n_resamples: str | None, seed: str | None
+) -> _CustomOp:
+    if not 0 < float(level) < 100:  # noqa: PLR2004
+        raise ValueError(f"Confidence level must be between 0 and 100, got ci{level}")
+    return _CustomOp(
+        partial(
+            bootstrap.mean_ci,
+            level=float(level),
+            n_resamples=1000 if n_resamples is None else int(n_resamples),
+            seed=0 if seed is None else int(seed),
+        ),
+        per_step=True,
+        outputs=("lower", "upper"),
+    )
+
+
+# parametrized op names, e.g. 'p95' for the 95th percentile, 'trimmed_mean_20' for
+# the mean without the lowest and highest 20% of values (10% if no number is given)
+# or 'ci95' for the bootstrapped 95% confidence interval of the mean ('ci99_n5000_seed1'
+# to use 5000 instead of 1000 resamples and seed 1 instead of 0)
+_OP_FAMILIES: dict[re.Pattern[str], Callable[..., _CustomOp]] = {
+    re.compile(r"p(\d+(?:\.\d+)?)"): _percentile_op,
+    re.compile(r"trimmed_mean(?:_(\d+(?:\.\d+)?))?"): _trimmed_mean_op,
+    re.compile(r"ci(\d+(?:\.\d+)?)(?:_n(\d+))?(?:_seed(\d+))?"): _bootstrap_ci_op,
+}
+
+
+# pandas DataFrame methods reducing along an axis, the only ones accepted when
+# _resolve_ops() is called with allow_import=False
+_PANDAS_REDUCE_OPS = frozenset(
+    {*_RAGGED_KERNELS, "sem", "skew", "kurt", "kurtosis", "prod", "product"}
+    | {"nunique", "any", "all", "idxmin", "idxmax"}
+)
+
+
+def _resolve_ops(
+    reduce_ops: Sequence[str], *, allow_import: bool = True
+) -> dict[str, _CustomOp | _SmoothedOp | None]:
+    """Map each op name to its custom op or None for pandas DataFrame methods.
+
+    Names of the form 'module:function' import function from module. If function
+    was registered with register_reduce_op() (e.g. on import of module), its
+    per_step setting is used, else it's assumed to be per step. Names of the form
+    'op@smoother' (e.g. 'mean@ema0.6') smooth the result of op, see
+    smooth.parse_smoother().
+
+    If not allow_import, 'module:function' names are rejected and pandas methods
+    are limited to the reductions in _PANDAS_REDUCE_OPS so untrusted callers can
+    neither import modules nor call arbitrary DataFrame methods.
+    """
+    resolved: dict[str, _CustomOp | _SmoothedOp | None] = {}
+    for op in reduce_ops:
+        if "@" in op:
+            base, _, smoother = op.rpartition("@")
+            base_op = _resolve_ops([base], allow_import=allow_import)[base]
+            resolved[op] = _SmoothedOp(base, base_op, smooth.parse_smoother(smoother))
+            continue
+        family_match = next(
+            (
+                (factory, match)
+                for pattern, factory in _OP_FAMILIES.items()
+                if (match := pattern.fullmatch(op))
+            ),
+            None,
+        )
+        if op in _CUSTOM_OPS:
+            resolved[op] = _CUSTOM_OPS[op]
+        elif family_match is not None:
+            factory, match = family_match
+            resolved[op] = factory(*match.groups())
+        elif ":" in op and not allow_import:
+            raise ValueError(f"Importing reduce op {op!r} is not allowed here")
+        elif ":" in op:
+            module_name, _, func_name = op.partition(":")
+            try:
+                func = getattr(importlib.import_module(module_name), func_name)
+            except (ImportError, AttributeError) as exc:
+                raise ValueError(f"Failed to import reduce op {op!r}: {exc}") from exc
+            registered = [cop for cop in _CUSTOM_OPS.values() if cop.func is func]
+            resolved[op] = (
+                registered[0] if registered else _CustomOp(func, per_step=True)
+            )
+        elif op in _PANDAS_REDUCE_OPS or (
+            allow_import and callable(getattr(pd.DataFrame, op, None))
+        ):
+            resolved[op] = None
+        elif not allow_import:
+            raise ValueError(
+                f"Unknown reduce op {op!r}, expected one of "
+                f"{sorted(_PANDAS_REDUCE_OPS)} or a registered custom op"
+            )
+        else:
+            raise ValueError(
+                f"Unknown reduce op {op!r}, expected a pandas DataFrame method like "
+                "'mean', a registered custom op or 'module:function'"
+            )
+    return resolved
+
+
+def _reduce_tag(
+    df: pd.DataFrame | RaggedScalars,
+    ops: Mapping[str, _CustomOp | _SmoothedOp | None],
+    smooth_runs: Callable[[np.ndarray], np.ndarray] | None = None,
+) -> dict[str, pd.Series]:
+    """Apply each reduce op (see _resolve_ops()) to one tag's (n_steps, n_runs)
+    array, after smoothing each run with smooth_runs if given.
+    """
+    smoothed = {op: sop for op, sop in ops.items() if isinstance(sop, _SmoothedOp)}
+    if smoothed:
+        # reduce first (including bases not requested themselves), then smooth
+        base_ops = {op: cop for op, cop in ops.items() if op not in smoothed}
+        for sop in smoothed.values():
+            base_ops.setdefault(sop.base, sop.base_op)
+        reduced = _reduce_tag(df, base_ops, smooth_runs)
+        for op, sop in smoothed.items():
+            base = reduced[sop.base]
+            values = sop.smoother(base.to_numpy().reshape(len(base), -1))
+            if isinstance(base, pd.DataFrame):
+                reduced[op] = pd.DataFrame(
+                    values, index=base.index, columns=base.columns
+                )
+            else:
+                reduced[op] = pd.Series(values[:, 0], index=base.index)
+        return {op: reduced[op] for op in ops}
+
+    if smooth_runs is not None:
+        dense = df.to_frame() if isinstance(df, RaggedScalars) else df
+        df = pd.DataFrame(
+            smooth_runs(dense.to_numpy(dtype=np.float64)),
+            index=dense.index,
+            columns=dense.columns,
+        )
+
+    reduced: dict[str, pd.Series] = {}
+    if isinstance(df, RaggedScalars):
+        reduced = {
+            op: _reduce_ragged(df, op)
+            for op, custom in ops.items()
+            if custom is None and op in _RAGGED_KERNELS
+        }
+        if len(reduced) == len(ops):
+            return reduced
+        # other ops need the dense array of just this tag
+        df = df.to_frame()
+
+    # only the tag being reduced is held in float64 at any time
+    df_tag = df if (df.dtypes == np.float64).all() else df.astype(np.float64)
+    block = partitioned = None
+    for op, custom in ops.items():
+        if op in reduced:
+            continue
+        if custom is None:
+            reduced[op] = getattr(df_tag, op)(axis=1)
+            continue
+        if block is None:
+            block = df_tag.to_numpy()
+        if custom.order_stats is not None and partitioned is None:
+            # one partition with the positions needed by all order statistic ops
+            n_runs = block.shape[1]
+            kth = [
+                k
+                for cop in ops.values()
+                if cop is not None and cop.order_stats is not None
+                for k in cop.order_stats(n_runs)
+            ]
+            partitioned = robust.partition_rows(block, kth)
+        op_input = block if custom.order_stats is None else partitioned
+        result = np.asarray(custom.func(op_input), dtype=np.float64)
+        expected_shape = (len(df_tag),)
+        if custom.outputs is not None:
+            expected_shape += (len(custom.outputs),)
+        if result.shape != expected_shape:
+            raise ValueError(
+                f"Custom reduce op {op!r} returned shape {result.shape}, expected "
+                f"{expected_shape} for input of shape {block.shape}"
+            )
+        if custom.outputs is None:
+            reduced[op] = pd.Series(result, index=df_tag.index)
+        else:
+            columns = list(custom.outputs)
+            reduced[op] = pd.DataFrame(result, index=df_tag.index, columns=columns)
+    return {op: reduced[op] for op in ops}
+
+
+# minimum number of values (n_steps * n_runs) a task of the reduce_events() thread
+# pool should process to be worth its scheduling overhead
+_MIN_TASK_SIZE = 2**18
+# tasks per worker to aim for so uneven tasks still balance out
+_TASKS_PER_WORKER = 4
+
+
+def _tag_size(df: pd.DataFrame | RaggedScalars) -> int:
+    """Cost estimate of reducing a tag: the number of values it holds."""
+    if isinstance(df, RaggedScalars):
+        return len(df.values)
+    return df.size
+
+
+def _plan_tasks(
+    events_dict: dict[str, pd.DataFrame] | dict[str, RaggedScalars],
+    workers: int,
+    *,
+    split_steps: bool = True,
+) -> list[list[tuple[str, slice | None]]]:
+    """Partition tags into tasks of roughly equal size for a pool of workers.
+
+    Each task is a list of (tag, rows) pairs where rows is None to reduce the whole
+    tag or a slice of its steps. Small tags are batched into one task. If
+    split_steps (i.e. all reduce ops work on each step independently), dense tags
+    bigger than the target task size are split into step ranges.
+    """
+    sizes = {tag: _tag_size(df) for tag, df in events_dict.items()}
+    target = max(_MIN_TASK_SIZE, sum(sizes.values()) // (workers * _TASKS_PER_WORKER))
+
+    tasks: list[list[tuple[str, slice | None]]] = []
+    batch: list[tuple[str, slice | None]] = []
+    batch_size = 0
+    for tag, size in sizes.items():
+        df = events_dict[tag]
+        if split_steps and size > target and not isinstance(df, RaggedScalars):
+            n_chunks = -(-size // target)  # ceil division
+            chunk_len = -(-len(df) // n_chunks)
+            tasks += [
+                [(tag, slice(start, start + chunk_len))]
+                for start in range(0, len(df), chunk_len)
+            ]
+            continue
+        batch.append((tag, None))
+        batch_size += size
+        if batch_size >= target:
+            tasks.append(batch)
+            batch, batch_size = [], 0
+    if batch:
+        tasks.append(batch)
+    return tasks
+
 
-    import pandas as pd
+def _report_tag(
+    observer: Observer,
+    tag: str,
+    df: pd.DataFrame | RaggedScalars,
+    ops: Mapping[str, object],
+    seconds: float,
+) -> None:
+    n_steps, n_runs = df.shape
+    observer.on_tag_reduced(
+        tag, n_steps=n_steps, n_runs=n_runs, ops=list(ops), seconds=seconds
+    )
+
+
+def _reduce_tasks_parallel(
+    events_dict: dict[str, pd.DataFrame] | dict[str, RaggedScalars],
+    ops: Mapping[str, _CustomOp | _SmoothedOp | None],
+    workers: int,
+    smooth_runs: Callable[[np.ndarray], np.ndarray] | None = None,
+    observer: Observer | None = None,
+) -> dict[str, dict[str, pd.Series]]:
+    """Reduce all tags on a thread pool. Returns {tag: {op: series}} in the order
+    of events_dict. NumPy releases the GIL inside its reduction loops so large
+    arrays reduce on several cores at once. Tags are reported to observer once all
+    their step ranges are reduced.
+    """
+
+    def run_task(
+        task: list[tuple[str, slice | None]],
+    ) -> list[tuple[str, dict[str, pd.Series], float]]:
+        out = []
+        for tag, rows in task:
+            df = events_dict[tag]
+            df_rows = df if rows is None else df.iloc[rows]
+            start = time.perf_counter()
+            reduced = _reduce_tag(df_rows, ops, smooth_runs)
+            out.append((tag, reduced, time.perf_counter() - start))
+        return out
+
+    split_steps = smooth_runs is None and all(
+        custom is None or custom.per_step for custom in ops.values()
+    )
+    tasks = _plan_tasks(events_dict, workers, split_steps=split_steps)
+    parts: dict[str, list[dict[str, pd.Series]]] = {tag: [] for tag in events_dict}
+    seconds = dict.fromkeys(events_dict, 0.0)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map() returns results in task order, so step ranges of a tag stay sorted
+        for results in pool.map(run_task, tasks):
+            for tag, reduced, tag_seconds in results:
+                parts[tag].append(reduced)
+                seconds[tag] += tag_seconds
+    if observer is not None:
+        for tag, df in events_dict.items():
+            _report_tag(observer, tag, df, ops, seconds[tag])
+
+    return {
+        tag: tag_parts[0]
+        if len(tag_parts) == 1
+        else {op: pd.concat([part[op] for part in tag_parts]) for op in ops}
+        for tag, tag_parts in parts.items()
+    }
+
+
+def _reduce_tags_serial(
+    events_dict: dict[str, pd.DataFrame] | dict[str, RaggedScalars],
+    ops: Mapping[str, _CustomOp | _SmoothedOp | None],
+    smooth_runs: Callable[[np.ndarray], np.ndarray] | None,
+    observer: Observer | None,
+) -> Iterator[tuple[str, dict[str, pd.Series]]]:
+    """Reduce tags one at a time in the calling thread."""
+    for tag, df in events_dict.items():
+        start = time.perf_counter()
+        reduced = _reduce_tag(df, ops, smooth_runs)
+        if observer is not None:
+            _report_tag(observer, tag, df, ops, time.perf_counter() - start)
+        yield tag, reduced
 
 
 def reduce_events(
-    events_dict: dict[str, pd.DataFrame],
+    events_dict: dict[str, pd.DataFrame] | dict[str, RaggedScalars],
     reduce_ops: str | Sequence[str],
     *,
+    workers: int | None = 1,
+    smooth_runs: str | None = None,
+    observer: Observer | None = None,
+    allow_import: bool = True,
     verbose: bool = False,
 ) -> dict[str, dict[str, pd.DataFrame]]:
     """Perform numpy reduce operations along the last dimension of each array in a
@@ -23,9 +559,31 @@ def reduce_events(
     arrays with shape (n_steps,).
 
     Args:
-        events_dict (dict[str, pd.DataFrame]): Dict of arrays to reduce.
+        events_dict (dict[str, pd.DataFrame] | dict[str, RaggedScalars]): Dict of
+            arrays to reduce. RaggedScalars (see load_tb_events(ragged=True)) are
+            reduced with NaN-skipping kernels for sum, count, mean, var, std, min,
+            max and median that never build the dense (n_steps, n_runs) array.
         reduce_ops (str | list[str]): Names of numpy reduce ops. E.g. mean, std, min,
-            max, ... Can be a single string or a sequence of strings.
+            max, ... Can be a single string or a sequence of strings. Besides pandas
+            DataFrame methods, names of ops added with register_reduce_op() and
+            'module:function' references to custom ops are accepted. 'op@smoother'
+            smooths the result of op along steps, e.g. 'mean@ema0.6' for
+            TensorBoard-style EMA smoothing of the mean or 'max@rolling_median10'
+            (see smooth.parse_smoother()), and can be requested alongside the raw
+            op. Arrays stored with a lower float precision (see
+            load_tb_events(dtype=...)) are upcast to float64 one tag at a time
+            before reducing.
+        workers (int | None, optional): Number of threads to reduce tags with.
+            Small tags are batched together and large ones split into step ranges
+            so each thread gets a similar amount of work. None means one thread per
+            CPU core. Defaults to 1.
+        smooth_runs (str | None, optional): Name of a smoother like 'ema0.6' to
+            apply to each run along steps before reducing. Defaults to None.
+        observer (Observer | None, optional): Instrumentation hooks told how long
+            each tag took to reduce, see hooks.Observer. Defaults to None.
+        allow_import (bool, optional): Whether 'module:function' ops may import
+            modules and any pandas DataFrame method may be called. Set to False
+            for ops from untrusted sources. Defaults to True.
         verbose (bool, optional): Whether to print progress. Defaults to False.
 
     Returns:
@@ -37,13 +595,24 @@ def reduce_events(
     if isinstance(reduce_ops, str):
         reduce_ops = [reduce_ops]
 
-    reductions: dict[str, dict[str, pd.DataFrame]] = {}
+    reductions: dict[str, dict[str, pd.DataFrame]] = {op: {} for op in reduce_ops}
+    ops = _resolve_ops(reduce_ops, allow_import=allow_import)
+    run_smoother = None if smooth_runs is None else smooth.parse_smoother(smooth_runs)
 
-    for op in reduce_ops:
-        reductions[op] = {}
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Expected positive number of workers, got {workers=}")
 
-        for tag, df in events_dict.items():
-            reductions[op][tag] = getattr(df, op)(axis=1)
+    if workers == 1:
+        reduced_tags = _reduce_tags_serial(events_dict, ops, run_smoother, observer)
+    else:
+        reduced_tags = _reduce_tasks_parallel(
+            events_dict, ops, workers, run_smoother, observer
+        ).items()
+    for tag, tag_reductions in reduced_tags:
+        for op, reduced in tag_reductions.items():
+            reductions[op][tag] = reduced
 
     if verbose:
         print(
@@ -51,3 +620,282 @@ def reduce_events(
             f" ({', '.join(reduce_ops)})"
         )
     return reductions
+
+
+def iter_reduced_tags(
+    input_dirs: list[str],
+    reduce_ops: str | Sequence[str],
+    *,
+    strict_tags: bool = True,
+    strict_steps: bool = True,
+    handle_dup_steps: HandleDupSteps = None,
+    min_runs_per_step: int | None = None,
+    verify_crc: bool = True,
+    dtype: str = "float64",
+    tags: Collection[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    index: bool = False,
+    smooth_runs: str | None = None,
+    max_memory: int | None = None,
+    observer: Observer | None = None,
+) -> Iterator[tuple[str, dict[str, pd.Series]]]:
+    """Lazy version of reduce_events(load_tb_events(...)) that yields each tag's
+    reductions as soon as they're computed.
+
+    Runs are parsed up front (tags are interleaved in event files, so the first tag
+    is only complete once every file was read) and all strict_tags/strict_steps
+    errors are raised before the first tag is yielded. After that, tags are aligned
+    and reduced one at a time and their per-run data is dropped once yielded. So
+    only a single tag's aligned (n_steps, n_runs) array is in memory at any time and
+    peak memory shrinks as iteration proceeds.
+
+    Args:
+        input_dirs (list[str]): Run directories or fsspec URLs to read.
+        reduce_ops (str | Sequence[str]): Names of numpy reduce ops, see
+            reduce_events().
+        strict_tags (bool, optional): See load_tb_events(). Defaults to True.
+        strict_steps (bool, optional): See load_tb_events(). Defaults to True.
+        handle_dup_steps (str|None, optional): See load_tb_events(). Defaults to None.
+        min_runs_per_step (int|None, optional): See load_tb_events(). Defaults to None.
+        verify_crc (bool, optional): See load_tb_events(). Defaults to True.
+        dtype (str, optional): See load_tb_events(). Defaults to 'float64'.
+        tags (Collection[str] | None, optional): See load_tb_events(). Defaults to
+            None.
+        steps (tuple[int | None, int | None] | None, optional): See
+            load_tb_events(). Defaults to None.
+        index (bool, optional): See load_tb_events(). Defaults to False.
+        smooth_runs (str | None, optional): See reduce_events(). Defaults to None.
+        max_memory (int | None, optional): Memory budget in bytes for parsed and
+            aligned scalars. If given, runs are first scanned for the step counts of
+            each tag to estimate footprints. Then tags are loaded and reduced in
+            batches that fit the budget, re-reading event files for each batch (so
+            pass index=True to make that cheap). Tags too large on their own are
+            processed in step ranges if all reduce ops work per step. Defaults to
+            None meaning load all tags at once.
+        observer (Observer | None, optional): Instrumentation hooks for loading and
+            reducing, see load_tb_events() and reduce_events(). Defaults to None.
+
+    Yields:
+        tuple[str, dict[str, pd.Series]]: A tag and its reductions keyed by op name,
+            e.g. ('loss', {'mean': ..., 'std': ...}).
+    """
+    _check_input_dirs(input_dirs)
+    _check_run_args(handle_dup_steps, dtype)
+    if isinstance(reduce_ops, str):
+        reduce_ops = [reduce_ops]
+    ops = _resolve_ops(reduce_ops)
+    run_smoother = None if smooth_runs is None else smooth.parse_smoother(smooth_runs)
+
+    if max_memory is not None:
+        load_kwargs = {
+            "strict_tags": strict_tags,
+            "strict_steps": strict_steps,
+            "handle_dup_steps": handle_dup_steps,
+            "min_runs_per_step": min_runs_per_step,
+            "verify_crc": verify_crc,
+            "dtype": dtype,
+            "index": index,
+            "observer": observer,
+        }
+        yield from _iter_reduced_batches(
+            input_dirs,
+            reduce_ops,
+            load_kwargs,
+            tags=tags,
+            steps=steps,
+            smooth_runs=smooth_runs,
+            max_memory=max_memory,
+        )
+        return
+
+    step_indexes: dict[str, pd.Index] = {}
+    runs = {
+        in_dir: load_run(
+            in_dir,
+            handle_dup_steps=handle_dup_steps,
+            verify_crc=verify_crc,
+            dtype=dtype,
+            tags=tags,
+            steps=steps,
+            index=index,
+            step_indexes=step_indexes,
+            observer=observer,
+        )
+        for in_dir in input_dirs
+    }
+    load_dict = _group_by_tag(
+        runs,
+        strict_tags=strict_tags,
+        strict_steps=strict_steps,
+        min_runs_per_step=min_runs_per_step,
+    )
+    # load_dict now holds the only references to per-run data, so popping a tag
+    # frees its memory
+    del runs, step_indexes
+
+    for tag in list(load_dict):
+        # ragged storage yields the same reductions without NaN-padding runs that
+        # logged different steps
+        combined = _combine_tag(
+            load_dict.pop(tag),
+            min_runs_per_step=min_runs_per_step,
+            ragged=not strict_steps,
+        )
+        start = time.perf_counter()
+        reduced = _reduce_tag(combined, ops, run_smoother)
+        if observer is not None:
+            _report_tag(observer, tag, combined, ops, time.perf_counter() - start)
+        yield tag, reduced
+
+
+def _reduce_step_chunk(
+    input_dirs: list[str],
+    tag: str,
+    steps: tuple[int, int],
+    *,
+    ops: Mapping[str, _CustomOp | _SmoothedOp | None],
+    load_kwargs: dict[str, Any],
+    n_runs_with_tag: int,
+) -> tuple[dict[str, pd.Series], int, float] | None:
+    """Load and reduce one step range of a single tag. Returns the reductions, the
+    number of steps reduced and the seconds it took, or None if no steps are left
+    after aligning runs.
+    """
+    run_dfs = []
+    for in_dir in input_dirs:
+        run = load_run(
+            in_dir,
+            handle_dup_steps=load_kwargs["handle_dup_steps"],
+            verify_crc=load_kwargs["verify_crc"],
+            dtype=load_kwargs["dtype"],
+            tags=[glob.escape(tag)],
+            steps=steps,
+            index=load_kwargs["index"],
+            observer=load_kwargs["observer"],
+        )
+        if tag in run:
+            run_dfs.append(run[tag])
+    min_runs_per_step = load_kwargs["min_runs_per_step"]
+    # without min_runs_per_step only steps all runs logged are kept, so a run
+    # missing from this range leaves nothing
+    if not run_dfs or (min_runs_per_step is None and len(run_dfs) < n_runs_with_tag):
+        return None
+    combined = _combine_tag(
+        run_dfs,
+        min_runs_per_step=min_runs_per_step,
+        ragged=not load_kwargs["strict_steps"],
+    )
+    start = time.perf_counter()
+    reduced = _reduce_tag(combined, ops)
+    return reduced, len(combined), time.perf_counter() - start
+
+
+def _check_split_tag(
+    tag: str, run_stats: dict[str, dict[str, dict[str, int]]], load_kwargs: dict
+) -> None:
+    """Raise the errors load_tb_events() would for a tag that's loaded in step
+    ranges and so never seen in full, based on check_tb_events() stats.
+    """
+    tag_stats = {run: stats[tag] for run, stats in run_stats.items() if tag in stats}
+    if load_kwargs["strict_tags"] and len(tag_stats) < len(run_stats):
+        missing = sorted(set(run_stats) - set(tag_stats))
+        raise ValueError(
+            f"Some tags are in some logs but not others: {tag!r} missing in "
+            f"{missing}. If intentional, pass CLI flag --lax-tags or "
+            "strict_tags=False to the Python API."
+        )
+    n_steps = [st["n_steps"] for st in tag_stats.values()]
+    if load_kwargs["strict_steps"] and len(set(n_steps)) > 1:
+        raise ValueError(
+            f"Unequal number of steps {n_steps} for different runs for the same tag "
+            f"'{tag}'. If intentional, pass CLI flag --lax-steps or "
+            "strict_steps=False to the Python API."
+        )
+    if load_kwargs["handle_dup_steps"] is None and any(
+        st["n_duplicates"] for st in tag_stats.values()
+    ):
+        raise ValueError(
+            f"Tag '{tag}' contains duplicate steps. Pass --handle-dup-steps to the "
+            "CLI or handle_dup_steps='keep-first'|'keep-last'|'mean' to the Python "
+            "API to proceed anyway."
+        )
+
+
+def _iter_reduced_batches(
+    input_dirs: list[str],
+    reduce_ops: Sequence[str],
+    load_kwargs: dict[str, Any],
+    *,
+    tags: Collection[str] | None,
+    steps: tuple[int | None, int | None] | None,
+    smooth_runs: str | None,
+    max_memory: int,
+) -> Iterator[tuple[str, dict[str, pd.Series]]]:
+    """iter_reduced_tags() in batches of tags planned by budget.plan_batches()."""
+    run_stats = check_tb_events(
+        input_dirs,
+        strict_tags=False,
+        strict_steps=False,
+        verify_crc=load_kwargs["verify_crc"],
+    )["runs"]
+    itemsize = np.dtype(load_kwargs["dtype"]).itemsize
+    batches = budget.plan_batches(
+        run_stats, max_memory, itemsize=itemsize, tags=tags, steps=steps
+    )
+    iter_kwargs = {**load_kwargs, "smooth_runs": smooth_runs}
+    if len(batches) == 1 and batches[0].step_ranges is None:
+        # everything fits, no need to narrow down tags
+        yield from iter_reduced_tags(
+            input_dirs, reduce_ops, tags=tags, steps=steps, **iter_kwargs
+        )
+        return
+
+    ops = _resolve_ops(reduce_ops)
+    per_step = smooth_runs is None and all(
+        custom is None or custom.per_step for custom in ops.values()
+    )
+    for batch in batches:
+        if batch.step_ranges is not None and not per_step:
+            warnings.warn(
+                f"Tag {batch.tags[0]!r} needs more than max_memory={max_memory:,} "
+                f"bytes but reduce ops {list(reduce_ops)} can't be computed one step "
+                "range at a time, loading it in one go",
+                stacklevel=3,
+            )
+        if batch.step_ranges is None or not per_step:
+            batch_tags = [glob.escape(tag) for tag in batch.tags]
+            yield from iter_reduced_tags(
+                input_dirs, reduce_ops, tags=batch_tags, steps=steps, **iter_kwargs
+            )
+            continue
+
+        (tag,) = batch.tags
+        _check_split_tag(tag, run_stats, load_kwargs)
+        n_runs_with_tag = sum(tag in stats for stats in run_stats.values())
+        chunks = [
+            chunk
+            for step_range in batch.step_ranges
+            if (
+                chunk := _reduce_step_chunk(
+                    input_dirs,
+                    tag,
+                    step_range,
+                    ops=ops,
+                    load_kwargs=load_kwargs,
+                    n_runs_with_tag=n_runs_with_tag,
+                )
+            )
+            is not None
+        ]
+        if not chunks:
+            continue
+        observer = load_kwargs["observer"]
+        if observer is not None:
+            observer.on_tag_reduced(
+                tag,
+                n_steps=sum(n_steps for _, n_steps, _ in chunks),
+                n_runs=n_runs_with_tag,
+                ops=list(ops),
+                seconds=sum(seconds for _, _, seconds in chunks),
+            )
+        yield tag, {op: pd.concat([chunk[0][op] for chunk in chunks]) for op in ops}
@@ -0,0 +1,271 @@
+"""Checkpoint parsed runs and reduced tags to disk as a reduction proceeds, so an
+interrupted reduction (OOM, preemption, ...) can be resumed without redoing the
+work that already finished.
+
+A state directory holds one .npz file per parsed run in runs/ and one per reduced
+tag in tags/<reduction key>/. File names are hashes of everything their content
+depends on (run directory, event file sizes and modification times, load options,
+reduce ops, ...), so stale checkpoints are never reused, just left behind.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from typing import TYPE_CHECKING, TypeVar
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from tensorboard_reducer.load import (
+    _check_input_dirs,
+    _check_run_args,
+    _run_signature,
+    combine_runs,
+    load_run,
+)
+from tensorboard_reducer.reduce import reduce_events
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Sequence
+
+    from tensorboard_reducer.hooks import Observer
+    from tensorboard_reducer.load import Align, HandleDupSteps
+
+# bump to invalidate checkpoints written by older versions
+_STATE_VERSION = 1
+# errors from reading a checkpoint cut short by a crash while writing it
+_READ_ERRORS = (OSError, ValueError, KeyError, zipfile.BadZipFile)
+
+T = TypeVar("T")
+
+
+def _digest(*parts: object) -> str:
+    """Short stable hash of JSON-serializable parts."""
+    payload = json.dumps([_STATE_VERSION, *parts], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _save_npz(path: str, arrays: dict[str, np.ndarray]) -> None:
+    """Write arrays to path atomically so a crash never leaves a partial file."""
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(tmp_path, path)
+
+
+def _save_run(path: str, run: dict[str, pd.DataFrame]) -> None:
+    arrays = {"tags": np.array(list(run), dtype=str)}
+    for idx, df in enumerate(run.values()):
+        arrays[f"steps_{idx}"] = df.index.to_numpy()
+        arrays[f"values_{idx}"] = df["value"].to_numpy()
+        if "elapsed" in df:
+            arrays[f"elapsed_{idx}"] = df["elapsed"].to_numpy()
+    _save_npz(path, arrays)
+
+
+def _read_run(path: str) -> dict[str, pd.DataFrame]:
+    run: dict[str, pd.DataFrame] = {}
+    with np.load(path) as arrays:
+        for idx, tag in enumerate(arrays["tags"]):
+            columns = {"value": arrays[f"values_{idx}"]}
+            if f"elapsed_{idx}" in arrays:
+                columns["elapsed"] = arrays[f"elapsed_{idx}"]
+            index = pd.Index(arrays[f"steps_{idx}"], name="step")
+            run[str(tag)] = pd.DataFrame(columns, index=index)
+    return run
+
+
+def _save_reductions(path: str, reduced: dict[str, pd.Series | pd.DataFrame]) -> None:
+    arrays = {"ops": np.array(list(reduced), dtype=str)}
+    for idx, result in enumerate(reduced.values()):
+        arrays[f"steps_{idx}"] = result.index.to_numpy()
+        arrays[f"values_{idx}"] = result.to_numpy()
+        columns = result.columns if isinstance(result, pd.DataFrame) else []
+        arrays[f"columns_{idx}"] = np.array(list(columns), dtype=str)
+    _save_npz(path, arrays)
+
+
+def _read_reductions(path: str) -> dict[str, pd.Series | pd.DataFrame]:
+    reduced: dict[str, pd.Series | pd.DataFrame] = {}
+    with np.load(path) as arrays:
+        for idx, op in enumerate(arrays["ops"]):
+            index = pd.Index(arrays[f"steps_{idx}"], name="step")
+            values, columns = arrays[f"values_{idx}"], arrays[f"columns_{idx}"]
+            if len(columns):
+                reduced[str(op)] = pd.DataFrame(
+                    values, index=index, columns=columns.tolist()
+                )
+            else:
+                reduced[str(op)] = pd.Series(values, index=index)
+    return reduced
+
+
+def _checkpointed(
+    path: str,
+    read: Callable[[str], T],
+    compute: Callable[[], T],
+    save: Callable[[str, T], None],
+) -> T:
+    """Read path if it holds a complete checkpoint, else compute and save it."""
+    if os.path.isfile(path):
+        try:
+            return read(path)
+        except _READ_ERRORS:
+            pass  # unreadable, e.g. from an older numpy, recompute it
+    result = compute()
+    save(path, result)
+    return result
+
+
+def reduce_with_checkpoints(
+    state_dir: str,
+    input_dirs: list[str],
+    reduce_ops: str | Sequence[str],
+    *,
+    strict_tags: bool = True,
+    strict_steps: bool = True,
+    handle_dup_steps: HandleDupSteps = None,
+    min_runs_per_step: int | None = None,
+    verify_crc: bool = True,
+    dtype: str = "float64",
+    ragged: bool = False,
+    align: Align = "steps",
+    step_grid: int | Sequence[int] | np.ndarray | None = None,
+    time_bin: int | None = None,
+    tags: Collection[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    index: bool = False,
+    smooth_runs: str | None = None,
+    workers: int | None = 1,
+    observer: Observer | None = None,
+    verbose: bool = False,
+) -> dict[str, dict[str, pd.Series | pd.DataFrame]]:
+    """Same as reduce_events(load_tb_events(...)) but every parsed run and every
+    reduced tag is saved in state_dir as soon as it's done. Rerunning with the same
+    arguments after an interruption reuses those and only parses and reduces what's
+    missing. Runs whose event files changed since are parsed again.
+
+    Args:
+        state_dir (str): Directory to keep checkpoints in. Created if missing.
+        input_dirs (list[str]): Run directories or fsspec URLs to reduce.
+        reduce_ops (str | Sequence[str]): See reduce_events().
+        strict_tags (bool, optional): See load_tb_events(). Defaults to True.
+        strict_steps (bool, optional): See load_tb_events(). Defaults to True.
+        handle_dup_steps (str|None, optional): See load_tb_events(). Defaults to None.
+        min_runs_per_step (int|None, optional): See load_tb_events(). Defaults to None.
+        verify_crc (bool, optional): See load_tb_events(). Defaults to True.
+        dtype (str, optional): See load_tb_events(). Defaults to 'float64'.
+        ragged (bool, optional): See load_tb_events(). Defaults to False.
+        align ('steps' | 'interpolate' | 'elapsed', optional): See
+            load_tb_events(). Defaults to 'steps'.
+        step_grid (int | Sequence[int] | np.ndarray | None, optional): See
+            load_tb_events(). Defaults to None.
+        time_bin (int | None, optional): See load_tb_events(). Defaults to None.
+        tags (Collection[str] | None, optional): See load_tb_events(). Defaults to
+            None.
+        steps (tuple[int | None, int | None] | None, optional): See
+            load_tb_events(). Defaults to None.
+        index (bool, optional): See load_tb_events(). Defaults to False.
+        smooth_runs (str | None, optional): See reduce_events(). Defaults to None.
+        workers (int | None, optional): See reduce_events(). Defaults to 1.
+        observer (Observer | None, optional): Instrumentation hooks, see
+            hooks.Observer. Only runs parsed and tags reduced in this call are
+            reported, not ones read from checkpoints. Defaults to None.
+        verbose (bool, optional): Whether to print progress. Defaults to False.
+
+    Returns:
+        dict[str, dict[str, pd.Series | pd.DataFrame]]: Same as reduce_events().
+    """
+    _check_input_dirs(input_dirs)
+    _check_run_args(handle_dup_steps, dtype)
+    if isinstance(reduce_ops, str):
+        reduce_ops = [reduce_ops]
+    os.makedirs(f"{state_dir}/runs", exist_ok=True)
+
+    load_kwargs = {
+        "handle_dup_steps": handle_dup_steps,
+        "verify_crc": verify_crc,
+        "dtype": dtype,
+        "tags": None if tags is None else sorted(tags),
+        "steps": steps,
+        "index": index,
+        "wall_time": align == "elapsed",
+    }
+    runs: dict[str, dict[str, pd.DataFrame]] = {}
+    run_keys = []
+    for in_dir in tqdm(input_dirs, disable=not verbose, desc="Loading runs"):
+        location = in_dir if "://" in in_dir else os.path.abspath(in_dir)
+        # verify_crc and index don't change what's loaded
+        run_key = _digest(
+            location,
+            _run_signature(in_dir),
+            {
+                key: load_kwargs[key]
+                for key in ("handle_dup_steps", "dtype", "tags", "wall_time")
+            },
+            load_kwargs["steps"],
+        )
+        run_keys.append(run_key)
+        runs[in_dir] = _checkpointed(
+            f"{state_dir}/runs/{run_key}.npz",
+            _read_run,
+            lambda in_dir=in_dir: load_run(in_dir, **load_kwargs, observer=observer),
+            _save_run,
+        )
+
+    events_dict = combine_runs(
+        runs,
+        strict_tags=strict_tags,
+        strict_steps=strict_steps,
+        min_runs_per_step=min_runs_per_step,
+        ragged=ragged,
+        align=align,
+        step_grid=step_grid,
+        time_bin=time_bin,
+        verbose=verbose,
+    )
+    del runs
+
+    reduction_key = _digest(
+        run_keys,
+        [strict_tags, strict_steps, min_runs_per_step],
+        [align, np.asarray(step_grid).tolist(), time_bin],
+        list(reduce_ops),
+        smooth_runs,
+    )
+    tags_dir = f"{state_dir}/tags/{reduction_key}"
+    os.makedirs(tags_dir, exist_ok=True)
+
+    reductions: dict[str, dict[str, pd.Series | pd.DataFrame]] = {
+        op: {} for op in reduce_ops
+    }
+    n_tags, n_reused = len(events_dict), 0
+    for tag in tqdm(list(events_dict), disable=not verbose, desc="Reducing tags"):
+        path = f"{tags_dir}/{_digest(tag)}.npz"
+        n_reused += os.path.isfile(path)
+        reduced = _checkpointed(
+            path,
+            _read_reductions,
+            lambda tag=tag: {
+                op: tag_dict[tag]
+                for op, tag_dict in reduce_events(
+                    {tag: events_dict[tag]},
+                    reduce_ops,
+                    workers=workers,
+                    smooth_runs=smooth_runs,
+                    observer=observer,
+                ).items()
+            },
+            _save_reductions,
+        )
+        for op, result in reduced.items():
+            reductions[op][tag] = result
+        del events_dict[tag]  # free each tag's aligned runs once reduced
+    if verbose:
+        print(f"Reused {n_reused} of {n_tags} reduced tags from {state_dir}")
+    return reductions
@@ -0,0 +1,110 @@
+"""Robust statistics across runs (percentiles, trimmed means, MAD) computed from
+partially sorted rows of a tag's (n_steps, n_runs) array.
+
+Each statistic comes as a pair of functions: one returning the order statistic
+positions it needs for n values per step, and one computing the statistic from the
+output of partition_rows(). reduce_events() partitions each tag only once for all
+robust ops requested, see register_reduce_op(order_stats=...).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def partition_rows(block: np.ndarray, kth: Iterable[int]) -> np.ndarray:
+    """Partially sort each row of block so positions kth hold the values they would
+    in a full sort, without fully sorting.
+
+    Rows with NaNs (runs missing a step) have fewer values than the positions kth
+    were computed for, so in that case rows are fully sorted instead. Either way,
+    NaNs end up at the end of each row.
+
+    Args:
+        block (np.ndarray): Array of shape (n_steps, n_runs).
+        kth (Iterable[int]): Order statistic positions needed for n_runs values.
+
+    Returns:
+        np.ndarray: Partitioned copy of block.
+    """
+    n_runs = block.shape[1]
+    kth = sorted({k for k in kth if 0 <= k < n_runs})
+    if not kth or np.isnan(block).any():
+        return np.sort(block, axis=1)
+    return np.partition(block, kth, axis=1)
+
+
+def _n_valid(part: np.ndarray) -> np.ndarray:
+    return np.count_nonzero(~np.isnan(part), axis=1)
+
+
+def _order_stat(part: np.ndarray, n_valid: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    """Value at (possibly fractional, linearly interpolated) position pos of each
+    row. NaN for rows without values.
+    """
+    lower = np.clip(np.floor(pos).astype(np.intp), 0, part.shape[1] - 1)
+    upper = np.clip(np.ceil(pos).astype(np.intp), 0, part.shape[1] - 1)
+    lo_val = np.take_along_axis(part, lower[:, None], axis=1)[:, 0]
+    hi_val = np.take_along_axis(part, upper[:, None], axis=1)[:, 0]
+    out = lo_val + (pos - lower) * (hi_val - lo_val)
+    return np.where(n_valid > 0, out, np.nan)
+
+
+def percentile_kth(n: int, q: float) -> list[int]:
+    """Positions needed for the q-th percentile of n values."""
+    pos = q / 100 * (n - 1)
+    return [int(np.floor(pos)), int(np.ceil(pos))]
+
+
+def percentile(part: np.ndarray, q: float) -> np.ndarray:
+    """q-th percentile of each row with linear interpolation, same as
+    np.nanpercentile(block, q, axis=1).
+    """
+    n_valid = _n_valid(part)
+    return _order_stat(part, n_valid, q / 100 * (n_valid - 1))
+
+
+def median_kth(n: int) -> list[int]:
+    """Positions needed for the median of n values."""
+    return percentile_kth(n, 50)
+
+
+def trimmed_mean_kth(n: int, cut: float) -> list[int]:
+    """Positions needed for the mean of n values with cut percent of them removed
+    from each end.
+    """
+    n_cut = int(cut / 100 * n)
+    return [n_cut, n - n_cut - 1]
+
+
+def trimmed_mean(part: np.ndarray, cut: float) -> np.ndarray:
+    """Mean of each row after dropping the int(cut / 100 * n) smallest and largest
+    of its n values, same as scipy.stats.trim_mean(row, cut / 100) on non-NaN
+    values. cut=25 gives the interquartile mean (IQM).
+    """
+    n_valid = _n_valid(part)
+    n_cut = (cut / 100 * n_valid).astype(np.intp)
+    # partitioning put the kept values (in any order) between positions n_cut and
+    # n_valid - n_cut, so their sum is a difference of prefix sums
+    cumsum = np.zeros((part.shape[0], part.shape[1] + 1))
+    np.cumsum(np.nan_to_num(part), axis=1, out=cumsum[:, 1:])
+    upper = n_valid - n_cut
+    total = (
+        np.take_along_axis(cumsum, upper[:, None], axis=1)
+        - np.take_along_axis(cumsum, n_cut[:, None], axis=1)
+    )[:, 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return total / (upper - n_cut)
+
+
+def mad(part: np.ndarray) -> np.ndarray:
+    """Median absolute deviation from the median of each row (unscaled)."""
+    n_valid = _n_valid(part)
+    median = _order_stat(part, n_valid, (n_valid - 1) / 2)
+    deviations = np.abs(part - median[:, None])
+    return percentile(partition_rows(deviations, median_kth(part.shape[1])), 50)
@@ -0,0 +1,354 @@
+"""Local HTTP server computing reductions on demand from a cache of parsed runs."""
+
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import numpy as np
+import pandas as pd
+
+from tensorboard_reducer.load import (
+    _check_input_dirs,
+    _run_signature,
+    combine_runs,
+    load_run,
+)
+from tensorboard_reducer.reduce import _resolve_ops, reduce_events
+from tensorboard_reducer.write import _split_outputs
+
+try:  # only needed for Arrow output
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+# request keys forwarded to load_run() and combine_runs(), see load_tb_events()
+_LOAD_KEYS = frozenset({"handle_dup_steps", "tags", "steps"})
+_COMBINE_KEYS = frozenset({"strict_tags", "strict_steps", "min_runs_per_step"})
+_REQUEST_KEYS = _LOAD_KEYS | _COMBINE_KEYS | {"input_dirs", "reduce_ops"}
+
+
+def _run_nbytes(run_dict: dict[str, pd.DataFrame]) -> int:
+    return sum(int(df.memory_usage(index=True).sum()) for df in run_dict.values())
+
+
+class RunCache:
+    """Thread-safe LRU cache of parsed runs (load_run() output) bounded by their
+    total size in memory. An entry is reparsed as soon as any of its run's event
+    files changed size or modification time.
+    """
+
+    def __init__(
+        self, max_bytes: int, *, verify_crc: bool = True, index: bool = False
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_bytes (int): Upper bound on the memory held by cached runs. Least
+                recently used runs are evicted to stay below it.
+            verify_crc (bool, optional): Whether to validate record checksums when
+                parsing runs. Defaults to True.
+            index (bool, optional): Whether to use sidecar indexes of local runs,
+                see load_tb_events(). Defaults to False.
+        """
+        self.max_bytes = max_bytes
+        self._verify_crc = verify_crc
+        self._index = index
+        # key -> (signature, run_dict, nbytes)
+        self._entries: OrderedDict[Hashable, tuple[Any, dict[str, pd.DataFrame], int]]
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._hits = self._misses = 0
+        self._lock = threading.Lock()
+        # one lock per key so concurrent requests for the same run parse it once
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+
+    def get(
+        self,
+        in_dir: str,
+        *,
+        handle_dup_steps: str | None = None,
+        tags: list[str] | None = None,
+        steps: tuple[int | None, int | None] | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Return a run's scalars, parsing it only if not cached or out of date.
+
+        Args:
+            in_dir (str): Run directory or fsspec URL.
+            handle_dup_steps (str | None, optional): See load_tb_events().
+                Defaults to None.
+            tags (list[str] | None, optional): See load_tb_events(). Defaults to None.
+            steps (tuple[int | None, int | None] | None, optional): See
+                load_tb_events(). Defaults to None.
+
+        Returns:
+            dict[str, pd.DataFrame]: Map of tags to single-column DataFrames indexed
+                by step. Must not be modified by callers.
+        """
+        key = (in_dir, handle_dup_steps, tuple(tags or ()), steps)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                signature = _run_signature(in_dir)
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and entry[0] == signature:
+                        self._entries.move_to_end(key)
+                        self._hits += 1
+                        return entry[1]
+                    self._misses += 1
+
+                run_dict = load_run(
+                    in_dir,
+                    handle_dup_steps=handle_dup_steps,
+                    verify_crc=self._verify_crc,
+                    tags=tags,
+                    steps=steps,
+                    index=self._index,
+                )
+            except BaseException:
+                self._drop_key_lock(key, key_lock)
+                raise
+            nbytes = _run_nbytes(run_dict)
+
+            with self._lock:
+                if (old := self._entries.pop(key, None)) is not None:
+                    self._nbytes -= old[2]
+                if nbytes <= self.max_bytes:
+                    self._entries[key] = (signature, run_dict, nbytes)
+                    self._nbytes += nbytes
+                elif self._key_locks.get(key) is key_lock:
+                    # never cached, so don't keep a lock for it either
+                    del self._key_locks[key]
+                while self._nbytes > self.max_bytes:
+                    evicted_key, (*_, evicted_nbytes) = self._entries.popitem(
+                        last=False
+                    )
+                    self._key_locks.pop(evicted_key, None)
+                    self._nbytes -= evicted_nbytes
+        return run_dict
+
+    def _drop_key_lock(self, key: Hashable, key_lock: threading.Lock) -> None:
+        """Forget the lock of a key without cache entry unless it was replaced."""
+        with self._lock:
+            if key not in self._entries and self._key_locks.get(key) is key_lock:
+                del self._key_locks[key]
+
+    def stats(self) -> dict[str, int]:
+        """Number of cached runs, their size in bytes and cache hits/misses so far."""
+        with self._lock:
+            return {
+                "runs": len(self._entries),
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+def reduce_request(cache: RunCache, request: dict[str, Any]) -> dict[str, Any]:
+    """Compute the reductions asked for by a request body of the /reduce endpoint.
+
+    Args:
+        cache (RunCache): Cache to load runs from.
+        request (dict[str, Any]): Must contain 'input_dirs' (list of run
+            directories) and 'reduce_ops' (op name or list of them, see
+            reduce_events(allow_import=False)). Optional keys
+            'strict_tags', 'strict_steps', 'handle_dup_steps', 'min_runs_per_step',
+            'tags' and 'steps' work like the load_tb_events() arguments of the same
+            name. 'steps' is a [first, last] list.
+
+    Returns:
+        dict[str, dict[str, pd.Series]]: Output of reduce_events().
+    """
+    if unknown := set(request) - _REQUEST_KEYS:
+        raise ValueError(f"Unknown request keys {sorted(unknown)}")
+    input_dirs = request.get("input_dirs")
+    if not input_dirs or not isinstance(input_dirs, list):
+        raise ValueError(f"Expected non-empty list of input_dirs, got {input_dirs!r}")
+    _check_input_dirs(input_dirs)
+    if "reduce_ops" not in request:
+        raise ValueError("Missing reduce_ops")
+    reduce_ops = request["reduce_ops"]
+    if isinstance(reduce_ops, str):
+        reduce_ops = [reduce_ops]
+    if not isinstance(reduce_ops, list) or not all(
+        isinstance(op, str) for op in reduce_ops
+    ):
+        raise TypeError(f"Expected op name or list of them, got {reduce_ops!r}")
+    # clients must not import modules, check before loading any runs
+    _resolve_ops(reduce_ops, allow_import=False)
+
+    load_kwargs = {key: request[key] for key in _LOAD_KEYS & set(request)}
+    if load_kwargs.get("steps") is not None:
+        load_kwargs["steps"] = tuple(load_kwargs["steps"])
+    runs = {in_dir: cache.get(in_dir, **load_kwargs) for in_dir in input_dirs}
+
+    combine_kwargs = {key: request[key] for key in _COMBINE_KEYS & set(request)}
+    # ragged storage avoids NaN-padding runs that logged different steps, same as CLI
+    ragged = not combine_kwargs.get("strict_steps", True)
+    events_dict = combine_runs(runs, ragged=ragged, **combine_kwargs)
+    return reduce_events(events_dict, reduce_ops, allow_import=False)
+
+
+def _to_json(reductions: dict[str, dict[str, pd.Series]]) -> bytes:
+    """{op: {tag: {'steps': [...], 'values': [...]}}} with NaN values as null."""
+    out: dict[str, dict[str, dict[str, list[Any]]]] = {}
+    for op, tags in reductions.items():
+        out[op] = {}
+        for tag, series in tags.items():
+            values = series.to_numpy(dtype=np.float64)
+            out[op][tag] = {
+                "steps": series.index.tolist(),
+                "values": np.where(np.isnan(values), None, values).tolist(),
+            }
+    return json.dumps(out).encode()
+
+
+def _to_arrow(reductions: dict[str, dict[str, pd.Series]]) -> bytes:
+    """Arrow IPC stream of a long table with columns tag, op, step and value."""
+    if pa is None:
+        raise ValueError(
+            "Arrow output requires pyarrow, install it with "
+            "pip install 'tensorboard-reducer[arrow]'"
+        )
+    frames = [
+        pd.DataFrame(
+            {"tag": tag, "op": op, "step": series.index, "value": series.to_numpy()}
+        )
+        for op, tags in reductions.items()
+        for tag, series in tags.items()
+    ]
+    table = pa.Table.from_pandas(pd.concat(frames), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _parse_body(body: bytes) -> tuple[dict[str, Any], str]:
+    """Decode a /reduce request body and pop its output format."""
+    request = json.loads(body or b"{}")
+    if not isinstance(request, dict):
+        raise TypeError(f"Expected JSON object, got {type(request).__name__}")
+    out_format = request.pop("format", "json")
+    if out_format not in ("json", "arrow"):
+        raise ValueError(f"Unknown {out_format=}, must be 'json' or 'arrow'")
+    return request, out_format
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handles GET /health, GET /stats and POST /reduce."""
+
+    server: ThreadingHTTPServer | _ThreadingUnixHTTPServer
+    cache: ClassVar[RunCache]
+    verbose: ClassVar[bool] = False
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, obj: object) -> None:
+        self._send(status, json.dumps(obj).encode(), "application/json")
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(HTTPStatus.OK, self.cache.stats())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"no route {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/reduce":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"no route {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request, out_format = _parse_body(self.rfile.read(length))
+            # one series per output of multi-output ops like ci95, same as the CLI
+            reductions = _split_outputs(reduce_request(self.cache, request))
+            if out_format == "arrow":
+                body = _to_arrow(reductions)
+                content_type = "application/vnd.apache.arrow.stream"
+            else:
+                body, content_type = _to_json(reductions), "application/json"
+        except (ValueError, TypeError, AttributeError, OSError) as exc:
+            # bad request bodies, unknown reduce ops or run directories, strict mode
+            # violations, etc.
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+        except Exception as exc:  # noqa: BLE001
+            # anything else is a bug, report it instead of dropping the connection
+            self.log_error("Failed to handle %s: %r", self.path, exc)
+            error = f"{type(exc).__name__}: {exc}"
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": error})
+            return
+        self._send(HTTPStatus.OK, body, content_type)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+class _ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+
+def make_server(
+    cache: RunCache,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: str | None = None,
+    verbose: bool = False,
+) -> ThreadingHTTPServer | _ThreadingUnixHTTPServer:
+    """Create a server answering reduction requests from cached runs. Each request
+    is handled in its own thread. Call serve_forever() on the result to start it.
+
+    Endpoints:
+        GET /health: {"status": "ok"}
+        GET /stats: cache statistics, see RunCache.stats()
+        POST /reduce: JSON body as described in reduce_request() plus optional
+            'format' ('json' or 'arrow'). Responds with JSON
+            {op: {tag: {"steps": [...], "values": [...]}}} or an Arrow IPC stream
+            with columns tag, op, step and value. Ops with several outputs per
+            step like ci95 are split into '{op}-{output}' entries (e.g.
+            'ci95-lower'). Errors are returned as
+            {"error": "..."} with status 400 for bad requests and 500 otherwise.
+
+    Args:
+        cache (RunCache): Cache of parsed runs shared by all requests.
+        host (str, optional): Interface to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): TCP port. 0 picks a free one. Defaults to 8000.
+        socket_path (str | None, optional): If given, listen on this Unix socket
+            instead of host and port. Defaults to None.
+        verbose (bool, optional): Whether to log requests to stderr. Defaults to
+            False.
+
+    Returns:
+        ThreadingHTTPServer | socketserver.UnixStreamServer: The bound server.
+    """
+    handler = type("Handler", (_Handler,), {"cache": cache, "verbose": verbose})
+    if socket_path is not None:
+        return _ThreadingUnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,166 @@
+"""Smoothing of scalar curves along steps, vectorized over all runs (or reduced
+curves) of a tag at once.
+
+Smoothers take an array of shape (n_steps, n_columns) and return the smoothed
+array of the same shape. NaNs (runs missing a step) are skipped and stay NaN.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import partial
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# block length of the blocked linear recurrence in _linear_recurrence()
+_BLOCK_LEN = 128
+
+
+def _linear_recurrence(x: np.ndarray, coef: float) -> np.ndarray:
+    """Compute y[t] = coef * y[t - 1] + x[t] with y[-1] = 0 along axis 0.
+
+    Instead of looping over steps, steps are cut into blocks. Within each block the
+    recurrence is a matrix product with a lower-triangular Toeplitz matrix of
+    powers of coef (all <= 1, so unlike closed-form cumsum tricks this can't
+    overflow). The carries between blocks follow the same recurrence with coef
+    raised to the block length, solved recursively.
+    """
+    n_steps, n_cols = x.shape
+    if n_steps == 0:
+        return x.copy()
+    block_len = min(_BLOCK_LEN, n_steps)
+    lags = np.arange(block_len)
+    with np.errstate(under="ignore"):
+        powers = coef ** lags.astype(np.float64)
+    toeplitz = np.tril(powers[np.subtract.outer(lags, lags).clip(0)])
+
+    n_blocks = -(-n_steps // block_len)
+    padded = np.zeros((n_blocks * block_len, n_cols))
+    padded[:n_steps] = x
+    local = toeplitz @ padded.reshape(n_blocks, block_len, n_cols)
+    if n_blocks > 1:
+        with np.errstate(under="ignore"):
+            block_coef = coef**block_len
+        block_ends = _linear_recurrence(local[:-1, -1], block_coef)
+        # y in block b = local solution + decayed end value of block b - 1
+        carry_decay = coef * powers  # coef ** (k + 1) for position k in a block
+        local[1:] += carry_decay[None, :, None] * block_ends[:, None, :]
+    return local.reshape(-1, n_cols)[:n_steps]
+
+
+def _ema_dense(values: np.ndarray, weight: float) -> np.ndarray:
+    smoothed = _linear_recurrence((1 - weight) * values, weight)
+    # debias the zero initialization, like TensorBoard does
+    n_seen = np.arange(1, len(values) + 1, dtype=np.float64)[:, None]
+    with np.errstate(under="ignore"):
+        return smoothed / (1 - weight**n_seen)
+
+
+def ema(values: np.ndarray, weight: float) -> np.ndarray:
+    """Debiased exponential moving average, same as TensorBoard's smoothing slider.
+
+    Args:
+        values (np.ndarray): Array of shape (n_steps, n_columns).
+        weight (float): Smoothing weight in [0, 1). 0 means no smoothing.
+
+    Returns:
+        np.ndarray: Smoothed values. Non-finite values are skipped, i.e. neither
+            update the average nor get smoothed, like in TensorBoard.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    if finite.all():
+        return _ema_dense(values, weight)
+    out = values.copy()
+    for col in range(values.shape[1]):
+        rows = finite[:, col]
+        out[rows, col] = _ema_dense(values[rows, col][:, None], weight)[:, 0]
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Centered moving average over window steps. Windows shrink at the edges and
+    skip NaNs, steps with only NaNs in their window stay NaN.
+
+    Args:
+        values (np.ndarray): Array of shape (n_steps, n_columns).
+        window (int): Number of steps per window.
+
+    Returns:
+        np.ndarray: Smoothed values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_steps = len(values)
+    valid = ~np.isnan(values)
+    # box filter as a difference of prefix sums of values and of counts
+    sums = np.zeros((n_steps + 1, values.shape[1]))
+    counts = np.zeros((n_steps + 1, values.shape[1]))
+    np.cumsum(np.where(valid, values, 0), axis=0, out=sums[1:])
+    np.cumsum(valid, axis=0, out=counts[1:])
+    idx = np.arange(n_steps)
+    # same window placement as pandas' rolling(center=True)
+    end = idx + (window - 1) // 2 + 1
+    lo, hi = np.maximum(end - window, 0), np.minimum(end, n_steps)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums[hi] - sums[lo]) / (counts[hi] - counts[lo])
+
+
+def rolling_median(values: np.ndarray, window: int) -> np.ndarray:
+    """Centered moving median over window steps. Windows shrink at the edges and
+    skip NaNs, steps with only NaNs in their window stay NaN.
+
+    Args:
+        values (np.ndarray): Array of shape (n_steps, n_columns).
+        window (int): Number of steps per window.
+
+    Returns:
+        np.ndarray: Smoothed values.
+    """
+    rolling = pd.DataFrame(values).rolling(window, center=True, min_periods=1)
+    return rolling.median().to_numpy()
+
+
+def _ema_smoother(weight: str) -> Callable[[np.ndarray], np.ndarray]:
+    if not 0 <= float(weight) < 1:
+        raise ValueError(f"EMA weight must be in [0, 1), got ema{weight}")
+    return partial(ema, weight=float(weight))
+
+
+def _rolling_smoother(
+    func: Callable[..., np.ndarray], window: str
+) -> Callable[[np.ndarray], np.ndarray]:
+    if int(window) < 1:
+        raise ValueError(f"Rolling window must be at least 1 step, got {window}")
+    return partial(func, window=int(window))
+
+
+_SMOOTHERS: dict[re.Pattern[str], Callable[[str], Callable[..., np.ndarray]]] = {
+    re.compile(r"ema(\d*\.?\d+)"): _ema_smoother,
+    re.compile(r"rolling_mean(\d+)"): partial(_rolling_smoother, rolling_mean),
+    re.compile(r"rolling_median(\d+)"): partial(_rolling_smoother, rolling_median),
+}
+
+
+def parse_smoother(name: str) -> Callable[[np.ndarray], np.ndarray]:
+    """Get the smoother for a name like 'ema0.6' (TensorBoard-style EMA with weight
+    0.6), 'rolling_mean10' or 'rolling_median10' (centered 10-step windows).
+
+    Args:
+        name (str): Name of the smoother.
+
+    Returns:
+        Callable[[np.ndarray], np.ndarray]: Function smoothing arrays of shape
+            (n_steps, n_columns) along steps.
+    """
+    for pattern, factory in _SMOOTHERS.items():
+        if match := pattern.fullmatch(name):
+            return factory(*match.groups())
+    raise ValueError(
+        f"Unknown smoother {name!r}, expected e.g. 'ema0.6', 'rolling_mean10' or "
+        "'rolling_median10'"
+    )
@@ -2,14 +2,56 @@
 
 from __future__ import annotations
 
+import bz2
+import csv
+import gzip
+import json
+import lzma
 import os
 import shutil
 import sys
+import time
+from typing import IO, TYPE_CHECKING, Literal
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from tensorboard_reducer.hooks import Observer
+
 _known_extensions = (".csv", ".json", ".xlsx")
+# compressions the streaming writer handles itself, others go through pandas
+_stream_openers = {"": open, ".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+# number of steps formatted and written at a time by the streaming writer
+_CHUNK_SIZE = 10_000
+# index of ops, tags and their .npy files written by write_npy_dir()
+_NPY_MANIFEST = "manifest.json"
+_NPY_VERSION = 1
+
+
+def _is_npy_dir(path: str) -> bool:
+    """Whether path is a directory written by write_npy_dir(), i.e. it has a valid
+    manifest and no files besides it and the .npy files it lists.
+    """
+    try:
+        with open(os.path.join(path, _NPY_MANIFEST), encoding="utf-8") as file:
+            manifest = json.load(file)
+        listed = {
+            filename
+            for tags in manifest["reductions"].values()
+            for files in tags.values()
+            for filename in files.values()
+        }
+        has_version = "version" in manifest
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return False
+    others = set(os.listdir(path)) - {_NPY_MANIFEST}
+    return has_version and all(
+        name.endswith(".npy") and name in listed for name in others
+    )
 
 
 def _rm_rf_or_raise(path: str, *, overwrite: bool) -> None:
@@ -23,16 +65,17 @@ def _rm_rf_or_raise(path: str, *, overwrite: bool) -> None:
         FileExistsError: If path exists and overwrite=False.
     """
     if os.path.exists(path):  # True if dir is either file or directory
-        # for safety, check dir is either TensorBoard run or CSV file
+        # for safety, check dir is either TensorBoard run, .npy output or CSV file
         # to make it harder to delete files not created by this program
         is_tb_dir = os.path.isdir(path) and all(
             x.startswith("events.out") for x in os.listdir(path)
         )
+        is_npy_dir = os.path.isdir(path) and _is_npy_dir(path)
         # use `ext in path` instead of endswith() to handle compressed files
         # (.csv.gz, .json.bz2, etc.)
         is_data_file = any(ext in path.lower() for ext in _known_extensions)
 
-        if overwrite and (is_data_file or is_tb_dir):
+        if overwrite and (is_data_file or is_tb_dir or is_npy_dir):
             if os.path.isdir(path):
                 shutil.rmtree(path)
             else:
@@ -50,11 +93,45 @@ def _rm_rf_or_raise(path: str, *, overwrite: bool) -> None:
             )
 
 
+def _report_output(observer: Observer | None, path: str, start: float) -> None:
+    """Tell observer the size of a written file or run directory and how long it
+    took since start (a time.perf_counter() value).
+    """
+    if observer is None:
+        return
+    if os.path.isdir(path):
+        n_bytes = sum(entry.stat().st_size for entry in os.scandir(path))
+    else:
+        n_bytes = os.path.getsize(path)
+    observer.on_output_written(
+        path, n_bytes=n_bytes, seconds=time.perf_counter() - start
+    )
+
+
+def _split_outputs(
+    data_to_write: dict[str, dict[str, pd.DataFrame]],
+) -> dict[str, dict[str, pd.Series]]:
+    """Split reductions with several outputs per step (like the lower and upper
+    bounds of ci95, see register_reduce_op(outputs=...)) into one '{op}-{output}'
+    reduction per output.
+    """
+    out: dict[str, dict[str, pd.Series]] = {}
+    for op, events_dict in data_to_write.items():
+        for tag, reduced in events_dict.items():
+            if isinstance(reduced, pd.DataFrame):
+                for output, series in reduced.items():
+                    out.setdefault(f"{op}-{output}", {})[tag] = series
+            else:
+                out.setdefault(op, {})[tag] = reduced
+    return out
+
+
 def write_tb_events(
     data_to_write: dict[str, dict[str, pd.DataFrame]],
     out_dir: str,
     *,
     overwrite: bool = False,
+    observer: Observer | None = None,
     verbose: bool = False,
 ) -> list[str]:
     """Write a dictionary with tags as keys and reduced TensorBoard scalar data
@@ -68,9 +145,13 @@ def write_tb_events(
             Assumes 1st-level keys are reduce ops (mean, std, ...) and 2nd-level are
             TensorBoard tags.
         out_dir (str): Name of the directory to save the new reduced run data. Will
-            have the reduce op name (e.g. '-mean'/'-std') appended.
+            have the reduce op name (e.g. '-mean'/'-std') appended. Ops with
+            several outputs get one directory per output, e.g. '-ci95-lower' and
+            '-ci95-upper'.
         overwrite (bool): Whether to overwrite existing reduction directories.
             Defaults to False.
+        observer (Observer | None): Instrumentation hooks told the size and write
+            time of each run directory, see hooks.Observer. Defaults to None.
         verbose (bool): Whether to print the paths to new TensorBoard event file.
             Defaults to False.
 
@@ -88,7 +169,8 @@ def write_tb_events(
                 "Install either to create new TensorBoard event files."
             ) from None
     out_dirs: list[str] = []
-    data_to_write = data_to_write.copy()  # make copy since we modify std data in place
+    # new dict since we modify std data in place
+    data_to_write = _split_outputs(data_to_write)
 
     out_dir_op_connector = "" if out_dir.endswith(("/", "\\")) else "-"
 
@@ -106,6 +188,7 @@ def write_tb_events(
             _rm_rf_or_raise(std_out_dir, overwrite=overwrite)
             out_dirs.append(std_out_dir)
 
+            start = time.perf_counter()
             writer = SummaryWriter(std_out_dir)
 
             for (tag, means), stds in zip(
@@ -119,6 +202,7 @@ def write_tb_events(
                     writer.add_scalar(tag, mean + sign * std, step)
 
             writer.close()
+            _report_output(observer, std_out_dir, start)
 
     # loop over each reduce operation (e.g. mean, min, max, median)
     for op, events_dict in (pbar := tqdm(data_to_write.items(), disable=not verbose)):
@@ -128,6 +212,7 @@ def write_tb_events(
 
         _rm_rf_or_raise(op_out_dir, overwrite=overwrite)
 
+        start = time.perf_counter()
         writer = SummaryWriter(op_out_dir)
 
         for tag, series in events_dict.items():
@@ -138,6 +223,7 @@ def write_tb_events(
         # try_rmtree will raise OSError: [Errno 16] Device or resource busy
         # trying to delete the existing out_dir.
         writer.close()
+        _report_output(observer, op_out_dir, start)
 
     if verbose:
         out_str = "\n- ".join(out_dirs)
@@ -146,11 +232,100 @@ def write_tb_events(
     return out_dirs
 
 
+def _aligned_chunks(
+    columns: list[pd.Series], chunk_size: int
+) -> Iterator[tuple[np.ndarray, list[np.ndarray]]]:
+    """Yield (steps, column values) for consecutive blocks of at most chunk_size rows
+    of the outer join of all columns on their step index, without ever building the
+    full joined table.
+
+    Columns sharing identical steps (the norm, since all ops reduce the same data)
+    are sliced as is. Otherwise rows are the sorted union of steps and each column is
+    NaN-padded one chunk at a time.
+    """
+    if not columns:
+        return
+    indexes = [col.index.to_numpy() for col in columns]
+    if all(np.array_equal(idx, indexes[0]) for idx in indexes[1:]):
+        steps = indexes[0]
+        values = [col.to_numpy() for col in columns]
+        for lo in range(0, len(steps), chunk_size):
+            yield (
+                steps[lo : lo + chunk_size],
+                [val[lo : lo + chunk_size] for val in values],
+            )
+        return
+
+    orders = [np.argsort(idx, kind="stable") for idx in indexes]
+    indexes = [idx[order] for idx, order in zip(indexes, orders, strict=True)]
+    values = [col.to_numpy()[order] for col, order in zip(columns, orders, strict=True)]
+    steps = np.unique(np.concatenate(indexes))
+    for lo in range(0, len(steps), chunk_size):
+        chunk_steps = steps[lo : lo + chunk_size]
+        chunk_values = []
+        for idx, val in zip(indexes, values, strict=True):
+            start = np.searchsorted(idx, chunk_steps[0], side="left")
+            end = np.searchsorted(idx, chunk_steps[-1], side="right")
+            padded = np.full(len(chunk_steps), np.nan)
+            padded[np.searchsorted(chunk_steps, idx[start:end])] = val[start:end]
+            chunk_values.append(padded)
+        yield chunk_steps, chunk_values
+
+
+def _format_values(values: np.ndarray, missing: str) -> list[str]:
+    """Format numbers with their shortest round-trip repr like pandas does, NaN/inf
+    as missing.
+    """
+    strings = values.astype(str)
+    if values.dtype.kind == "f":
+        strings[~np.isfinite(values)] = missing
+    return strings.tolist()
+
+
+def _write_csv_stream(
+    file: IO[str], columns: dict[tuple[str, str], pd.Series], chunk_size: int
+) -> None:
+    """Write columns as CSV with a two-level (tag, op) header like
+    DataFrame.to_csv() does for a MultiIndex.
+    """
+    writer = csv.writer(file, lineterminator=os.linesep)
+    writer.writerow(["", *(tag for tag, _ in columns)])
+    writer.writerow(["", *(op for _, op in columns)])
+    writer.writerow(["step"] + [""] * len(columns))
+    for steps, values in _aligned_chunks(list(columns.values()), chunk_size):
+        cells = [_format_values(val, missing="") for val in values]
+        writer.writerows(zip(steps.tolist(), *cells, strict=True))
+
+
+def _write_json_stream(
+    file: IO[str], columns: dict[tuple[str, str], pd.Series], chunk_size: int
+) -> None:
+    """Write columns as JSON in DataFrame.to_json()'s default 'columns' orient, i.e.
+    {"(tag, op)": {"step": value, ...}, ...}.
+    """
+    file.write("{")
+    for col_idx, (key, series) in enumerate(columns.items()):
+        file.write(f"{',' if col_idx else ''}{json.dumps(str(key))}:{{")
+        for chunk_idx, (steps, (values,)) in enumerate(
+            _aligned_chunks([series], chunk_size)
+        ):
+            entries = (
+                f'"{step}":{value}'
+                for step, value in zip(
+                    steps.tolist(), _format_values(values, missing="null"), strict=True
+                )
+            )
+            file.write(("," if chunk_idx else "") + ",".join(entries))
+        file.write("}")
+    file.write("}")
+
+
 def write_data_file(
     data_to_write: dict[str, dict[str, pd.DataFrame]],
     out_path: str,
     *,
     overwrite: bool = False,
+    observer: Observer | None = None,
     verbose: bool = False,
 ) -> str:
     """Writes reduced TensorBoard data passed as dict of dicts to a CSV file.
@@ -158,6 +333,11 @@ def write_data_file(
     Use `pandas.read_csv("path/to/file.csv", header=[0, 1], index_col=0)` to read CSV
     data back into a multi-index dataframe.
 
+    CSV and JSON files (uncompressed, .gz, .bz2 or .xz) are streamed to disk in
+    chunks of steps straight from the reduced arrays, so memory stays flat and
+    output starts immediately even for huge reductions. Excel files and other
+    compression formats go through a pandas DataFrame.
+
     Args:
         data_to_write (dict[str, dict[str, pd.DataFrame]]): Data to write to disk.
             Assumes 1st-level keys are reduce ops (mean, std, ...) and 2nd-level are
@@ -167,12 +347,34 @@ def write_data_file(
             change the file extension. For example .csv.gz, .csv.gzip, .json.bz2, etc.
         overwrite (bool): Whether to overwrite existing reduction directories.
             Defaults to False.
+        observer (Observer | None): Instrumentation hooks told the size and write
+            time of the file, see hooks.Observer. Defaults to None.
         verbose (bool): Whether to print the path to new data file. Defaults to False.
 
     Returns:
         str: Path to the new data file.
     """
     _rm_rf_or_raise(out_path, overwrite=overwrite)
+    start = time.perf_counter()
+    data_to_write = _split_outputs(data_to_write)
+
+    basename = os.path.basename(out_path)
+    for fmt, write_stream in (("csv", _write_csv_stream), ("json", _write_json_stream)):
+        stem, dot_fmt, compression = basename.lower().rpartition(f".{fmt}")
+        if stem and dot_fmt and compression in _stream_openers:
+            # same column order as the pandas path below: ops outer, tags inner
+            columns = {
+                (tag, op): series
+                for op, dic in data_to_write.items()
+                for tag, series in dic.items()
+            }
+            opener = _stream_openers[compression]
+            with opener(out_path, "wt", newline="", encoding="utf-8") as file:
+                write_stream(file, columns, _CHUNK_SIZE)
+            _report_output(observer, out_path, start)
+            if verbose:
+                print(f"Created new data file at {out_path!r}")
+            return out_path
 
     # create multi-index dataframe from event data with reduce op names as 1st-level col
     # names and tag names as 2nd level
@@ -182,8 +384,7 @@ def write_data_file(
         df_out.columns = df_out.columns.swaplevel(i=0, j=1)
     df_out.index.name = "step"
 
-    # let pandas handle compression inference from extensions (.csv.gz, .json.bz2, etc.)
-    basename = os.path.basename(out_path)
+    # let pandas handle compression inference from extensions (.csv.zip, etc.)
     if ".csv" in basename.lower():
         df_out.to_csv(out_path)
     elif ".json" in basename.lower():
@@ -195,6 +396,108 @@ def write_data_file(
             f"{out_path=} has unknown extension, should be one of {_known_extensions} "
             " or compressed versions thereof like '.csv.gz', '.json.bz2', etc."
         )
+    _report_output(observer, out_path, start)
     if verbose:
         print(f"Created new data file at {out_path!r}")
     return out_path
+
+
+def write_npy_dir(
+    data_to_write: dict[str, dict[str, pd.DataFrame]],
+    out_dir: str,
+    *,
+    overwrite: bool = False,
+    observer: Observer | None = None,
+    verbose: bool = False,
+) -> str:
+    """Write each reduced op/tag array as a .npy file plus a manifest.json mapping
+    ops and tags to their values and steps files, for downstream processes to
+    np.load(..., mmap_mode='r') without parsing or copying (see read_npy_dir()).
+    Tags logged at identical steps share one steps file. Write to a tmpfs like
+    /dev/shm to hand results over through shared memory.
+
+    Args:
+        data_to_write (dict[str, dict[str, pd.DataFrame]]): Data to write to disk.
+            Assumes 1st-level keys are reduce ops (mean, std, ...) and 2nd-level are
+            TensorBoard tags. Ops with several outputs are written as one
+            '{op}-{output}' entry per output.
+        out_dir (str): Directory to create.
+        overwrite (bool): Whether to overwrite an existing output directory.
+            Defaults to False.
+        observer (Observer | None): Instrumentation hooks told the size and write
+            time of the directory, see hooks.Observer. Defaults to None.
+        verbose (bool): Whether to print the path to the new directory. Defaults to
+            False.
+
+    Returns:
+        str: Path to the new directory.
+    """
+    _rm_rf_or_raise(out_dir, overwrite=overwrite)
+    start = time.perf_counter()
+    os.makedirs(out_dir)
+
+    manifest: dict[str, dict[str, dict[str, str]]] = {}
+    steps_files: dict[bytes, str] = {}
+    n_files = 0
+    for op, events_dict in _split_outputs(data_to_write).items():
+        for tag, series in events_dict.items():
+            steps = np.ascontiguousarray(series.index.to_numpy(dtype=np.int64))
+            steps_file = steps_files.get(steps.tobytes())
+            if steps_file is None:
+                steps_file = f"steps-{len(steps_files)}.npy"
+                np.save(os.path.join(out_dir, steps_file), steps)
+                steps_files[steps.tobytes()] = steps_file
+            values_file = f"{n_files}.npy"
+            np.save(os.path.join(out_dir, values_file), series.to_numpy())
+            n_files += 1
+            manifest.setdefault(op, {})[tag] = {
+                "values": values_file,
+                "steps": steps_file,
+            }
+
+    # written last so consumers can wait for it to appear
+    with open(os.path.join(out_dir, _NPY_MANIFEST), "w", encoding="utf-8") as file:
+        json.dump({"version": _NPY_VERSION, "reductions": manifest}, file, indent=1)
+    _report_output(observer, out_dir, start)
+    if verbose:
+        print(f"Created {n_files} .npy files and a manifest in {out_dir!r}")
+    return out_dir
+
+
+def read_npy_dir(
+    path: str, *, mmap_mode: Literal["r", "r+", "c"] | None = "r"
+) -> dict[str, dict[str, pd.Series]]:
+    """Read reductions written by write_npy_dir().
+
+    Args:
+        path (str): Directory written by write_npy_dir().
+        mmap_mode ('r' | 'r+' | 'c' | None, optional): Passed to np.load(). The
+            default maps values and steps read-only so only the pages a consumer
+            touches are read and processes reading the same files share them in the
+            OS page cache. None reads everything into memory. Defaults to 'r'.
+
+    Returns:
+        dict[str, dict[str, pd.Series]]: Same layout as reduce_events() output, e.g.
+            {"mean": {"loss": pd.Series, ...}, ...}.
+    """
+    with open(os.path.join(path, _NPY_MANIFEST), encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("version") != _NPY_VERSION:
+        raise ValueError(
+            f"Unsupported manifest version {manifest.get('version')!r} in {path!r}, "
+            f"expected {_NPY_VERSION}"
+        )
+    step_indexes: dict[str, pd.Index] = {}
+    reductions: dict[str, dict[str, pd.Series]] = {}
+    for op, tag_files in manifest["reductions"].items():
+        reductions[op] = {}
+        for tag, files in tag_files.items():
+            steps_file = files["steps"]
+            if steps_file not in step_indexes:
+                steps = np.load(os.path.join(path, steps_file), mmap_mode=mmap_mode)
+                step_indexes[steps_file] = pd.Index(steps, name="step", copy=False)
+            values = np.load(os.path.join(path, files["values"]), mmap_mode=mmap_mode)
+            reductions[op][tag] = pd.Series(
+                values, index=step_indexes[steps_file], copy=False
+            )
+    return reductions
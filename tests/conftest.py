@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from glob import glob
 from typing import TYPE_CHECKING
 
@@ -10,6 +11,8 @@ import pytest
 import tensorboard_reducer as tbr
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     import pandas as pd
 
 REDUCE_OPS = ("mean", "std", "median")
@@ -27,3 +30,21 @@ def reduced_events(
     events_dict: dict[str, pd.DataFrame],
 ) -> dict[str, dict[str, pd.DataFrame]]:
     return tbr.reduce_events(events_dict, REDUCE_OPS)
+
+
+@pytest.fixture
+def memory_runs() -> Iterator[list[str]]:
+    """Copy of the strict test runs on fsspec's in-memory filesystem."""
+    fsspec = pytest.importorskip("fsspec")
+    fs = fsspec.filesystem("memory")
+    urls = []
+    for run_dir in sorted(glob("tests/runs/strict/run_*")):
+        run_name = os.path.basename(run_dir)
+        for event_file in glob(f"{run_dir}/events.out.tfevents.*"):
+            with open(event_file, "rb") as file:
+                fs.pipe(
+                    f"/strict/{run_name}/{os.path.basename(event_file)}", file.read()
+                )
+        urls.append(f"memory://strict/{run_name}")
+    yield urls
+    fs.rm("/strict", recursive=True)
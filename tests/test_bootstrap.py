@@ -0,0 +1,73 @@
+"""Tests for bootstrap confidence intervals of the mean."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tensorboard_reducer import bootstrap, reduce_events
+
+rng = np.random.default_rng(0)
+NAN_FRACTION = 0.2
+
+
+def test_resample_counts() -> None:
+    n_runs, n_resamples = 7, 50
+    counts = bootstrap.resample_counts(n_runs, n_resamples, 0)
+
+    assert counts.shape == (n_runs, n_resamples)
+    # every resample draws n_runs runs with replacement
+    np.testing.assert_array_equal(counts.sum(axis=0), n_runs)
+    assert not counts.flags.writeable
+    # cached and reproducible, different for other seeds
+    assert bootstrap.resample_counts(n_runs, n_resamples, 0) is counts
+    assert not np.array_equal(bootstrap.resample_counts(n_runs, n_resamples, 1), counts)
+
+
+@pytest.mark.parametrize("with_nans", [False, True])
+def test_mean_ci(monkeypatch: pytest.MonkeyPatch, with_nans: bool) -> None:
+    block = rng.normal(size=(30, 8))
+    if with_nans:
+        block[rng.random(block.shape) < NAN_FRACTION] = np.nan
+        block[5] = np.nan
+    level, n_resamples = 90, 200
+
+    bounds = bootstrap.mean_ci(block, level=level, n_resamples=n_resamples, seed=3)
+
+    # reference: loop over resamples with the same draws
+    counts = bootstrap.resample_counts(block.shape[1], n_resamples, 3)
+    means = np.empty((len(block), n_resamples))
+    for idx in range(n_resamples):
+        weights = np.where(np.isnan(block), 0, counts[:, idx])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[:, idx] = np.nansum(block * weights, axis=1) / weights.sum(axis=1)
+    with pytest.warns(RuntimeWarning) if with_nans else np.errstate():
+        expected = np.nanpercentile(means, [5, 95], axis=1).T
+    np.testing.assert_allclose(bounds, expected)
+
+    valid_rows = ~np.isnan(block).all(axis=1)
+    with np.errstate(invalid="ignore"):
+        row_means = np.nanmean(block[valid_rows], axis=1)
+    assert (bounds[valid_rows, 0] <= row_means).all()
+    assert (row_means <= bounds[valid_rows, 1]).all()
+
+    # chunking over steps doesn't change results
+    monkeypatch.setattr(bootstrap, "_MAX_CHUNK_VALUES", 3 * n_resamples)
+    chunked = bootstrap.mean_ci(block, level=level, n_resamples=n_resamples, seed=3)
+    np.testing.assert_array_equal(chunked, bounds)
+
+
+def test_ci_reduce_op() -> None:
+    events_dict = {"tag": pd.DataFrame(rng.normal(size=(10, 5)))}
+    reduced = reduce_events(events_dict, ["mean", "ci95", "ci99_n500_seed2"])
+
+    ci95 = reduced["ci95"]["tag"]
+    assert list(ci95) == ["lower", "upper"]
+    block = events_dict["tag"].to_numpy()
+    np.testing.assert_array_equal(ci95.to_numpy(), bootstrap.mean_ci(block))
+    ci99 = bootstrap.mean_ci(block, level=99, n_resamples=500, seed=2)
+    np.testing.assert_array_equal(reduced["ci99_n500_seed2"]["tag"].to_numpy(), ci99)
+
+    with pytest.raises(ValueError, match="Confidence level must be between"):
+        reduce_events(events_dict, "ci100")
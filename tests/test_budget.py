@@ -0,0 +1,120 @@
+"""Tests for planning and running reductions within a memory budget."""
+
+from __future__ import annotations
+
+import itertools
+from glob import glob
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pytest
+
+from tensorboard_reducer import iter_reduced_tags, load_tb_events, main, reduce_events
+from tensorboard_reducer.budget import (
+    _DF_OVERHEAD,
+    TagBatch,
+    plan_batches,
+    tag_footprints,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+strict_runs = sorted(glob("tests/runs/strict/run_*"))
+lax_runs = sorted(glob("tests/runs/lax/run_*"))
+lax_kwargs = {"strict_tags": False, "strict_steps": False}
+
+
+def _stats(n_steps: int, first: int = 0, n_duplicates: int = 0) -> dict[str, int]:
+    return {
+        "n_steps": n_steps,
+        "n_duplicates": n_duplicates,
+        "first_step": first,
+        "last_step": first + n_steps - 1,
+    }
+
+
+def test_tag_footprints() -> None:
+    run_stats = {
+        "run_1": {"a": _stats(100), "b": _stats(10, n_duplicates=2)},
+        "run_2": {"a": _stats(50)},
+    }
+    footprints = tag_footprints(run_stats, itemsize=4)
+    assert list(footprints) == ["a", "b"]
+    loaded_a, working_a = footprints["a"]
+    loaded_b, _ = footprints["b"]
+    # int64 step + float32 value per record plus per-DataFrame overhead
+    assert loaded_a - loaded_b == (150 - 12) * 12 + _DF_OVERHEAD
+    # 3 float64 copies of the aligned (100, 2) array
+    assert working_a == 3 * 100 * 2 * 8
+    assert list(tag_footprints(run_stats, itemsize=4, tags=["b*"])) == ["b"]
+
+
+def test_plan_batches() -> None:
+    run_stats = {
+        f"run_{idx}": {"a": _stats(10), "b": _stats(10), "c": _stats(1000, first=5)}
+        for idx in range(2)
+    }
+    footprints = tag_footprints(run_stats, itemsize=8)
+
+    # everything fits
+    assert plan_batches(run_stats, 10**9) == [TagBatch(["a", "b", "c"])]
+
+    # a and b fit together, c gets split into step ranges
+    small = sum(footprints["a"]) + footprints["b"][0]
+    split_c, batch_ab = plan_batches(run_stats, small)
+    assert batch_ab == TagBatch(["a", "b"])
+    assert split_c.tags == ["c"]
+    ranges = split_c.step_ranges
+    assert len(ranges) == -(-sum(footprints["c"]) // small)
+    assert ranges[0][0] == 5  # noqa: PLR2004
+    assert ranges[-1][1] == 1004  # noqa: PLR2004
+    assert all(hi + 1 == lo for (_, hi), (lo, _) in itertools.pairwise(ranges))
+
+    # user step range narrows the split
+    batches = plan_batches(run_stats, small, tags=["c"], steps=(100, 199))
+    assert batches[0].step_ranges[0][0] == 100  # noqa: PLR2004
+    assert batches[0].step_ranges[-1][1] == 199  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("input_dirs", "kwargs"), [(strict_runs, {}), (lax_runs, lax_kwargs)]
+)
+@pytest.mark.parametrize("max_memory", [20_000, 5_000])
+def test_iter_reduced_tags_max_memory(
+    input_dirs: list[str], kwargs: dict[str, bool], max_memory: int
+) -> None:
+    ops = ["mean", "std", "p90"]
+    expected = reduce_events(load_tb_events(input_dirs, **kwargs), ops)
+    reduced = dict(iter_reduced_tags(input_dirs, ops, max_memory=max_memory, **kwargs))
+    assert sorted(reduced) == sorted(expected["mean"])
+    for op, tag_dict in expected.items():
+        for tag, series in tag_dict.items():
+            pd.testing.assert_series_equal(reduced[tag][op], series)
+
+
+def test_iter_reduced_tags_max_memory_unsplittable() -> None:
+    expected = reduce_events(load_tb_events(strict_runs), "mean@ema0.5")
+    with pytest.warns(UserWarning, match="can't be computed one step range"):
+        reduced = dict(iter_reduced_tags(strict_runs, "mean@ema0.5", max_memory=1000))
+    for tag, series in expected["mean@ema0.5"].items():
+        pd.testing.assert_series_equal(reduced[tag]["mean@ema0.5"], series)
+
+
+def test_main_max_memory(tmp_path: Path) -> None:
+    full_file, budget_file = f"{tmp_path}/full.csv", f"{tmp_path}/budget.csv"
+    args = [*lax_runs, "--lax-tags", "--lax-steps", "-r", "mean,max"]
+    main([*args, "-o", full_file])
+    main([*args, "-o", budget_file, "--max-memory", "10K"])
+    df_full = pd.read_csv(full_file, header=[0, 1], index_col=0)
+    df_budget = pd.read_csv(budget_file, header=[0, 1], index_col=0)
+    pd.testing.assert_frame_equal(df_budget[df_full.columns], df_full)
+
+
+def test_main_max_memory_rejects_workers(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    args = [*strict_runs, "-o", f"{tmp_path}/out.csv", "--max-memory", "10K"]
+    with pytest.raises(SystemExit):
+        main([*args, "--workers", "4"])
+    assert "--max-memory can't be combined with --workers" in capsys.readouterr().err
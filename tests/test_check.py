@@ -0,0 +1,89 @@
+"""Tests for the preflight check of TensorBoard runs."""
+
+from __future__ import annotations
+
+import json
+from glob import glob
+
+import pytest
+
+from tensorboard_reducer import check_tb_events
+from tensorboard_reducer.check import format_check_report
+
+strict_runs = sorted(glob("tests/runs/strict/run_*"))
+lax_runs = sorted(glob("tests/runs/lax/run_*"))
+dup_steps_runs = sorted(glob("tests/runs/duplicate_steps/run_*"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_check_tb_events_strict(workers: int) -> None:
+    report = check_tb_events(strict_runs, workers=workers)
+
+    assert report["ok"]
+    assert report["missing_tags"] == report["unequal_steps"] == {}
+    assert report["duplicate_steps"] == {}
+    for stats in report["runs"].values():
+        assert stats == {
+            "strict/foo": {
+                "n_steps": 100,
+                "n_duplicates": 0,
+                "first_step": 0,
+                "last_step": 495,
+            }
+        }
+    json.dumps(report)  # report must be JSON-serializable
+
+
+def test_check_tb_events_lax() -> None:
+    report = check_tb_events(lax_runs)
+
+    assert not report["ok"]
+    assert set(report["missing_tags"]) == set(lax_runs)
+    assert set(report["unequal_steps"]) == {"lax/foo", "lax/bar_2", "lax/bar_3"}
+    assert sorted(report["unequal_steps"]["lax/foo"].values()) == [110, 120, 130]
+
+    assert not check_tb_events(lax_runs, strict_tags=False)["ok"]
+    assert not check_tb_events(lax_runs, strict_steps=False)["ok"]
+    assert check_tb_events(lax_runs, strict_tags=False, strict_steps=False)["ok"]
+
+    text = format_check_report(report)
+    assert "missing tags: " in text
+    assert "unequal number of steps for tag 'lax/foo'" in text
+    assert text.endswith("Found problems, see above")
+
+
+def test_check_tb_events_duplicate_steps() -> None:
+    report = check_tb_events(dup_steps_runs)
+
+    assert not report["ok"]
+    assert set(report["duplicate_steps"]) == set(dup_steps_runs)
+    for dups in report["duplicate_steps"].values():
+        assert dups == {"dup_steps/bar": 10, "dup_steps/foo": 10}
+    assert check_tb_events(dup_steps_runs, handle_dup_steps="mean")["ok"]
+
+
+def test_check_tb_events_filters() -> None:
+    """Only tags and steps that load_tb_events() would load are checked."""
+    report = check_tb_events(lax_runs, tags=["lax/foo"], strict_steps=False)
+    assert report["ok"]
+    assert report["missing_tags"] == {}
+    assert all(list(stats) == ["lax/foo"] for stats in report["runs"].values())
+
+    report = check_tb_events(lax_runs, tags=["lax/foo"], steps=(0, 100))
+    assert report["ok"]  # all runs logged the same steps up to 100
+    for stats in report["runs"].values():
+        assert stats["lax/foo"]["last_step"] <= 100  # noqa: PLR2004
+
+    # a mistyped tag pattern matches nothing, which the real load would fail on
+    mistyped = check_tb_events(
+        lax_runs, tags=["lax/fooo"], strict_tags=False, strict_steps=False
+    )
+    assert not mistyped["ok"]
+    assert "no scalar data found" in format_check_report(mistyped)
+
+
+def test_check_tb_events_empty_input() -> None:
+    with pytest.raises(ValueError, match="Expected non-empty list"):
+        check_tb_events([])
+    with pytest.raises(ValueError, match="Got input directories more than once"):
+        check_tb_events([*strict_runs, strict_runs[0]])
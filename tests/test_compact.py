@@ -0,0 +1,116 @@
+"""Tests for rewriting runs into scalar-only event files."""
+
+from __future__ import annotations
+
+import os
+from glob import glob
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pytest
+from tensorboard.compat.proto import types_pb2
+from tensorboard.compat.proto.event_pb2 import Event
+from tensorboard.compat.proto.summary_pb2 import Summary, SummaryMetadata
+from tensorboard.compat.proto.tensor_pb2 import TensorProto
+from tensorboard.summary.writer.event_file_writer import EventFileWriter
+
+from tensorboard_reducer import load_tb_events, main
+from tensorboard_reducer.compact import compact_run, compact_runs
+from tensorboard_reducer.event_loader import EventAccumulator
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+strict_runs = sorted(glob("tests/runs/strict/run_*"))
+N_STEPS = 20
+
+
+def _write_mixed_run(run_dir: Path) -> None:
+    """Write a run with TF1 and TF2 scalars interleaved with a large image."""
+    writer = EventFileWriter(str(run_dir))
+    scalars_meta = SummaryMetadata(
+        plugin_data=SummaryMetadata.PluginData(plugin_name="scalars")
+    )
+    for step in range(N_STEPS):
+        values = [
+            Summary.Value(tag="tf1/loss", simple_value=1 / (step + 1)),
+            Summary.Value(
+                tag="tf2/lr",
+                tensor=TensorProto(dtype=types_pb2.DT_DOUBLE, double_val=[0.1**step]),
+                metadata=scalars_meta if step == 0 else None,
+            ),
+            Summary.Value(
+                tag="images/sample",
+                image=Summary.Image(encoded_image_string=b"\0" * 10_000),
+            ),
+        ]
+        writer.add_event(
+            Event(wall_time=1e9 + step, step=step, summary=Summary(value=values))
+        )
+    writer.close()
+
+
+def test_compact_run(tmp_path: Path) -> None:
+    in_dir, out_dir = tmp_path / "run", tmp_path / "compact"
+    _write_mixed_run(in_dir)
+    result = compact_run(str(in_dir), str(out_dir))
+
+    assert result["n_scalars"] == 2 * N_STEPS
+    in_bytes = sum(file.stat().st_size for file in in_dir.iterdir())
+    assert os.path.getsize(result["event_file"]) < in_bytes / 10
+
+    original = EventAccumulator(str(in_dir)).reload()
+    compacted = EventAccumulator(str(out_dir)).reload()
+    assert sorted(compacted.scalar_tags) == ["tf1/loss", "tf2/lr"]
+    for tag in compacted.scalar_tags:
+        # same steps, wall times and (double precision) values
+        assert compacted.scalars(tag) == original.scalars(tag)
+
+    with pytest.raises(FileExistsError, match="already exists"):
+        compact_run(str(in_dir), str(out_dir))
+
+
+def test_compact_run_filters(tmp_path: Path) -> None:
+    in_dir, out_dir = tmp_path / "run", tmp_path / "compact"
+    _write_mixed_run(in_dir)
+    compact_run(str(in_dir), str(out_dir), tags=["tf2/*"], steps=(5, 9))
+
+    compacted = EventAccumulator(str(out_dir)).reload()
+    # TF2 plugin metadata of the dropped first step is carried over
+    assert compacted.scalar_tags == ["tf2/lr"]
+    assert [s.step for s in compacted.scalars("tf2/lr")] == list(range(5, 10))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_compact_runs(tmp_path: Path, workers: int) -> None:
+    results = compact_runs(strict_runs, str(tmp_path), workers=workers)
+    assert list(results) == [
+        f"{tmp_path}/{os.path.basename(run)}" for run in strict_runs
+    ]
+
+    original = load_tb_events(strict_runs)
+    compacted = load_tb_events(list(results))
+    for tag, df in original.items():
+        assert (compacted[tag].to_numpy() == df.to_numpy()).all()
+
+    with pytest.raises(ValueError, match="must have unique names"):
+        compact_runs([strict_runs[0], f"{strict_runs[0]}/"], str(tmp_path / "dup"))
+
+
+@pytest.mark.parametrize("steps", [None, (100, None)])
+def test_compact_runs_keep_elapsed_times(
+    tmp_path: Path, steps: tuple[int | None, int | None] | None
+) -> None:
+    """Compacted runs start at their source run's first event, not compaction time."""
+    results = compact_runs(strict_runs, str(tmp_path), steps=steps)
+    original = load_tb_events(strict_runs, align="elapsed", steps=steps)
+    compacted = load_tb_events(list(results), align="elapsed")
+    for tag, df in original.items():
+        pd.testing.assert_frame_equal(compacted[tag], df, check_names=False)
+
+
+def test_main_compact(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["compact", *strict_runs, "-o", str(tmp_path), "--verbose"]) == 0
+    stdout, _ = capsys.readouterr()
+    assert stdout.count("scalars") == len(strict_runs)
+    assert len(glob(f"{tmp_path}/run_*/events.out.tfevents.*")) == len(strict_runs)
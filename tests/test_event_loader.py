@@ -0,0 +1,233 @@
+"""Tests for the scalar-only TensorBoard event file loader."""
+
+from __future__ import annotations
+
+import shutil
+import struct
+from glob import glob
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from tensorboard.backend.event_processing.event_file_loader import (
+    LegacyEventFileLoader,
+)
+from tensorboard.compat.proto import types_pb2
+from tensorboard.compat.proto.event_pb2 import Event
+from tensorboard.compat.proto.summary_pb2 import Summary, SummaryMetadata
+from tensorboard.compat.proto.tensor_pb2 import TensorProto
+from tensorboard.compat.tensorflow_stub.pywrap_tensorflow import masked_crc32c
+from tensorboard.summary.writer.event_file_writer import EventFileWriter
+
+from tensorboard_reducer.event_loader import (
+    EventAccumulator,
+    FsspecRunLoader,
+    MmapEventFileLoader,
+    _masked_crc32c,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+strict_files = sorted(glob("tests/runs/strict/run_*/events.out.tfevents.*"))
+
+
+@pytest.mark.parametrize("event_file", strict_files)
+def test_mmap_loader_matches_legacy_loader(event_file: str) -> None:
+    """The mmap loader must yield exactly the events TensorBoard's loader yields."""
+    mmap_events = list(MmapEventFileLoader(event_file).Load())
+    legacy_events = list(LegacyEventFileLoader(event_file).Load())
+
+    assert len(mmap_events) > 0
+    assert mmap_events == legacy_events
+
+
+def test_mmap_loader_resumes_after_truncated_record(tmp_path: Path) -> None:
+    """A partially written trailing record is skipped until it's complete."""
+    with open(strict_files[0], "rb") as file:
+        data = file.read()
+    n_events = len(list(MmapEventFileLoader(strict_files[0]).Load()))
+
+    event_file = tmp_path / "events.out.tfevents.truncated"
+    event_file.write_bytes(data[:-7])
+    loader = MmapEventFileLoader(str(event_file))
+    assert len(list(loader.Load())) == n_events - 1
+
+    event_file.write_bytes(data)
+    assert len(list(loader.Load())) == 1
+    assert list(loader.Load()) == []
+
+
+def test_mmap_loader_empty_file(tmp_path: Path) -> None:
+    event_file = tmp_path / "events.out.tfevents.empty"
+    event_file.touch()
+    assert list(MmapEventFileLoader(str(event_file)).Load()) == []
+
+
+def test_mmap_loader_corrupted_record(tmp_path: Path) -> None:
+    data = bytearray(open(strict_files[0], "rb").read())  # noqa: SIM115
+    data[20] ^= 0xFF  # flip bits inside the first payload
+    event_file = tmp_path / "events.out.tfevents.corrupt"
+    event_file.write_bytes(data)
+
+    with pytest.raises(ValueError, match="Corrupted record payload at byte 0"):
+        list(MmapEventFileLoader(str(event_file)).Load())
+
+
+def test_event_accumulator_scalars(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    shutil.copytree("tests/runs/strict/run_1", run_dir)
+
+    accumulator = EventAccumulator(str(run_dir)).reload()
+
+    assert accumulator.scalar_tags == ["strict/foo"]
+    scalars = accumulator.scalars("strict/foo")
+    n_expected = 100
+    assert len(scalars) == n_expected
+    assert [s.step for s in scalars] == list(range(0, 500, 5))
+
+
+def test_masked_crc32c_matches_tensorboard() -> None:
+    """Our CRC32C must agree with TensorBoard's reference implementation."""
+    rng = np.random.default_rng(0)
+    for n_bytes in (0, 1, 7, 8, 9, 100, 1001):
+        data = rng.integers(0, 256, n_bytes, dtype=np.uint8).tobytes()
+        assert _masked_crc32c(data) == masked_crc32c(data)
+        assert _masked_crc32c(memoryview(data)) == masked_crc32c(data)
+
+
+def test_mmap_loader_skip_crc(tmp_path: Path) -> None:
+    """With verify_crc=False, corrupted checksums are not detected but events still
+    parse. Truncated trailing records are still handled.
+    """
+    data = bytearray(open(strict_files[0], "rb").read())  # noqa: SIM115
+    data[-1] ^= 0xFF  # corrupt the payload CRC of the last record
+    event_file = tmp_path / "events.out.tfevents.bad_crc"
+    event_file.write_bytes(data)
+    n_events = len(list(MmapEventFileLoader(strict_files[0]).Load()))
+
+    with pytest.raises(ValueError, match="Corrupted record payload"):
+        list(MmapEventFileLoader(str(event_file)).Load())
+
+    events = list(MmapEventFileLoader(str(event_file), verify_crc=False).Load())
+    assert len(events) == n_events
+
+    event_file.write_bytes(data[:-3])
+    loader = MmapEventFileLoader(str(event_file), verify_crc=False)
+    assert len(list(loader.Load())) == n_events - 1
+
+
+def test_mmap_loader_skip_crc_corrupted_length(tmp_path: Path) -> None:
+    """A corrupted length field mid-file isn't mistaken for a truncated trailing
+    record, which would silently drop the rest of the file.
+    """
+    data = bytearray(open(strict_files[0], "rb").read())  # noqa: SIM115
+    (first_length,) = struct.unpack_from("<Q", data, 0)
+    second_start = 12 + first_length + 4  # header + payload + footer
+    data[second_start + 6] ^= 0xFF  # length now points far past the end of file
+    event_file = tmp_path / "events.out.tfevents.bad_length"
+    event_file.write_bytes(data)
+
+    loader = MmapEventFileLoader(str(event_file), verify_crc=False)
+    with pytest.raises(
+        ValueError, match=f"Corrupted record header at byte {second_start}"
+    ):
+        list(loader.Load())
+
+
+@pytest.mark.parametrize("block_size", [64, 1000, 2**20])
+def test_fsspec_loader_matches_mmap_loader(
+    memory_runs: list[str], block_size: int
+) -> None:
+    """Small blocks split records across range reads, which must not matter."""
+    remote = list(FsspecRunLoader(memory_runs[0], block_size=block_size).Load())
+    (local_file,) = glob("tests/runs/strict/run_1/events.out.tfevents.*")
+    local = list(MmapEventFileLoader(local_file).Load())
+
+    assert remote == local
+
+
+def test_fsspec_loader_resumes(memory_runs: list[str]) -> None:
+    fsspec = pytest.importorskip("fsspec")
+    fs, root = fsspec.core.url_to_fs(memory_runs[0])
+    (path,) = fs.ls(root, detail=False)
+    data = fs.cat_file(path)
+    fs.pipe(path, data[:-5])
+
+    loader = FsspecRunLoader(memory_runs[0], block_size=256)
+    n_first = len(list(loader.Load()))
+    fs.pipe(path, data)
+    assert n_first + len(list(loader.Load())) == len(
+        list(FsspecRunLoader(memory_runs[0]).Load())
+    )
+    assert list(loader.Load()) == []
+
+
+def test_fsspec_loader_propagates_read_errors(
+    memory_runs: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    loader = FsspecRunLoader(memory_runs[0], block_size=64)
+
+    def fail(*_args: object, **_kwargs: object) -> bytes:
+        raise OSError("connection reset")
+
+    monkeypatch.setattr(loader._fs, "cat_file", fail)  # noqa: SLF001
+    with pytest.raises(OSError, match="connection reset"):
+        list(loader.Load())
+
+
+def test_event_accumulator_fsspec_url(memory_runs: list[str]) -> None:
+    local = EventAccumulator("tests/runs/strict/run_2").reload()
+    remote = EventAccumulator(memory_runs[1]).reload()
+
+    assert remote.scalar_tags == local.scalar_tags == ["strict/foo"]
+    assert remote.scalars("strict/foo") == local.scalars("strict/foo")
+
+
+def test_event_accumulator_tf2_tensor_scalars(tmp_path: Path) -> None:
+    """Scalars written by TF2's tf.summary.scalar() are stored as rank-0 tensors with
+    plugin metadata only on the first value of each tag.
+    """
+    writer = EventFileWriter(str(tmp_path))
+    scalars_meta = SummaryMetadata(
+        plugin_data=SummaryMetadata.PluginData(plugin_name="scalars")
+    )
+    text_meta = SummaryMetadata(
+        plugin_data=SummaryMetadata.PluginData(plugin_name="text")
+    )
+    n_steps = 5
+    for step in range(n_steps):
+        packed = np.array(step / 2, dtype="<f4").tobytes()
+        values = [
+            Summary.Value(
+                tag="tf2/packed",
+                tensor=TensorProto(dtype=types_pb2.DT_FLOAT, tensor_content=packed),
+                metadata=scalars_meta if step == 0 else None,
+            ),
+            Summary.Value(
+                tag="tf2/double",
+                tensor=TensorProto(dtype=types_pb2.DT_DOUBLE, double_val=[step * 3]),
+                metadata=scalars_meta if step == 0 else None,
+            ),
+            Summary.Value(
+                tag="tf2/text",
+                tensor=TensorProto(dtype=types_pb2.DT_STRING, string_val=[b"hi"]),
+                metadata=text_meta if step == 0 else None,
+            ),
+            Summary.Value(tag="tf1/simple", simple_value=-step),
+        ]
+        writer.add_event(Event(step=step, summary=Summary(value=values)))
+    writer.close()
+
+    accumulator = EventAccumulator(str(tmp_path)).reload()
+
+    assert sorted(accumulator.scalar_tags) == ["tf1/simple", "tf2/double", "tf2/packed"]
+    expected = {
+        "tf2/packed": [step / 2 for step in range(n_steps)],
+        "tf2/double": [step * 3 for step in range(n_steps)],
+        "tf1/simple": [-step for step in range(n_steps)],
+    }
+    for tag, values in expected.items():
+        scalars = accumulator.scalars(tag)
+        assert [s.step for s in scalars] == list(range(n_steps))
+        assert [s.value for s in scalars] == values
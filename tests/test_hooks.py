@@ -0,0 +1,180 @@
+"""Tests for instrumentation hooks."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from collections import Counter
+from glob import glob
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tensorboard_reducer import (
+    JsonLinesObserver,
+    Observer,
+    iter_reduced_tags,
+    load_tb_events,
+    main,
+    reduce_events,
+    write_data_file,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+strict_runs = sorted(glob("tests/runs/strict/run_*"))
+
+
+class RecordingObserver(Observer):
+    """Observer that records each hook call as (event, args, kwargs)."""
+
+    def __init__(self) -> None:  # noqa: D107
+        self.calls: list[tuple[str, tuple, dict]] = []
+
+    def on_file_start(self, *args: object, **kwargs: object) -> None:  # noqa: D102
+        self.calls.append(("file_start", args, kwargs))
+
+    def on_run_loaded(self, *args: object, **kwargs: object) -> None:  # noqa: D102
+        self.calls.append(("run_loaded", args, kwargs))
+
+    def on_run_failed(self, *args: object, **kwargs: object) -> None:  # noqa: D102
+        self.calls.append(("run_failed", args, kwargs))
+
+    def on_tag_reduced(self, *args: object, **kwargs: object) -> None:  # noqa: D102
+        self.calls.append(("tag_reduced", args, kwargs))
+
+    def on_output_written(self, *args: object, **kwargs: object) -> None:  # noqa: D102
+        self.calls.append(("output_written", args, kwargs))
+
+    def named(self, event: str) -> list[tuple[tuple, dict]]:
+        """Calls of one hook as (args, kwargs)."""
+        return [(args, kwargs) for name, args, kwargs in self.calls if name == event]
+
+
+@pytest.mark.parametrize("index", [False, True])
+def test_load_hooks(tmp_path: Path, index: bool) -> None:
+    run_dirs = []
+    for run in strict_runs[:2]:
+        run_dir = tmp_path / os.path.basename(run)
+        run_dir.mkdir()
+        for event_file in glob(f"{run}/events.out.tfevents.*"):
+            with open(event_file, "rb") as file:
+                (run_dir / os.path.basename(event_file)).write_bytes(file.read())
+        run_dirs.append(str(run_dir))
+
+    observer = RecordingObserver()
+    events_dict = load_tb_events(run_dirs, index=index, observer=observer)
+
+    file_starts = observer.named("file_start")
+    assert len(file_starts) == len(glob(f"{tmp_path}/*/events.out.tfevents.*"))
+    for (path,), kwargs in file_starts:
+        assert kwargs["size"] == os.path.getsize(path)
+
+    run_loads = observer.named("run_loaded")
+    assert [args for args, _ in run_loads] == [(run_dir,) for run_dir in run_dirs]
+    for (run_dir,), kwargs in run_loads:
+        assert kwargs["n_tags"] == len(events_dict)
+        assert kwargs["n_scalars"] == sum(len(df) for df in events_dict.values())
+        assert kwargs["n_bytes"] == sum(
+            os.path.getsize(path) for path in glob(f"{run_dir}/events.out.tfevents.*")
+        )
+        assert kwargs["seconds"] >= 0
+
+
+def test_load_hooks_failed_run(tmp_path: Path) -> None:
+    event_file = glob(f"{strict_runs[0]}/events.out.tfevents.*")[0]
+    with open(event_file, "rb") as file:
+        data = bytearray(file.read())
+    data[20] ^= 0xFF  # flip bits inside the first payload
+    (tmp_path / os.path.basename(event_file)).write_bytes(data)
+
+    observer = RecordingObserver()
+    with pytest.raises(ValueError, match="Corrupted record payload"):
+        load_tb_events([str(tmp_path)], observer=observer)
+    ((args, kwargs),) = observer.named("run_failed")
+    assert args == (str(tmp_path),)
+    assert isinstance(kwargs["error"], ValueError)
+    assert observer.named("run_loaded") == []
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_reduce_hooks(events_dict: dict, workers: int) -> None:
+    observer = RecordingObserver()
+    reduce_events(events_dict, ["mean", "std"], workers=workers, observer=observer)
+    tag_reductions = observer.named("tag_reduced")
+    assert [args for args, _ in tag_reductions] == [(tag,) for tag in events_dict]
+    for (tag,), kwargs in tag_reductions:
+        n_steps, n_runs = events_dict[tag].shape
+        assert kwargs["n_steps"] == n_steps
+        assert kwargs["n_runs"] == n_runs
+        assert kwargs["ops"] == ["mean", "std"]
+
+
+@pytest.mark.parametrize("max_memory", [None, 5_000])
+def test_iter_reduced_tags_hooks(max_memory: int | None) -> None:
+    observer = RecordingObserver()
+    reduced = dict(
+        iter_reduced_tags(strict_runs, "mean", max_memory=max_memory, observer=observer)
+    )
+    tag_reductions = observer.named("tag_reduced")
+    assert sorted(args[0] for args, _ in tag_reductions) == sorted(reduced)
+    for (tag,), kwargs in tag_reductions:
+        assert kwargs["n_steps"] == len(reduced[tag]["mean"])
+        assert kwargs["n_runs"] == len(strict_runs)
+    assert len(observer.named("run_loaded")) >= len(strict_runs)
+
+
+def test_write_hooks(reduced_events: dict, tmp_path: Path) -> None:
+    observer = RecordingObserver()
+    out_path = write_data_file(reduced_events, f"{tmp_path}/out.csv", observer=observer)
+    ((args, kwargs),) = observer.named("output_written")
+    assert args == (out_path,)
+    assert kwargs["n_bytes"] == os.path.getsize(out_path)
+
+
+def test_json_lines_observer() -> None:
+    file = io.StringIO()
+    observer = JsonLinesObserver(file)
+    observer.on_run_loaded("run_1", n_tags=2, n_scalars=10, n_bytes=99, seconds=0.5)
+    observer.on_run_failed("run_2", error=OSError("gone"), seconds=0.1)
+    observer.close()  # doesn't close files it didn't open
+    loaded, failed = map(json.loads, file.getvalue().splitlines())
+    assert loaded["event"] == "run_loaded"
+    assert loaded["n_scalars"] == 10  # noqa: PLR2004
+    assert isinstance(loaded["time"], float)
+    assert failed["error"] == "OSError: gone"
+
+
+def test_main_metrics_jsonl(tmp_path: Path) -> None:
+    metrics_path = f"{tmp_path}/metrics.jsonl"
+    out_path = f"{tmp_path}/reduced.csv"
+    main([*strict_runs, "-o", out_path, "-r", "mean", "--metrics-jsonl", metrics_path])
+    with open(metrics_path) as file:
+        events = [json.loads(line) for line in file]
+    counts = Counter(event["event"] for event in events)
+    assert counts["run_loaded"] == len(strict_runs)
+    assert counts["tag_reduced"] >= 1
+    assert counts["output_written"] == 1
+    assert events[-1] == {**events[-1], "event": "output_written", "path": out_path}
+
+
+def test_main_metrics_jsonl_closed_on_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    closed: list[JsonLinesObserver] = []
+    close = JsonLinesObserver.close
+
+    def tracked_close(self: JsonLinesObserver) -> None:
+        closed.append(self)
+        close(self)
+
+    monkeypatch.setattr(JsonLinesObserver, "close", tracked_close)
+    out_path = tmp_path / "reduced.csv"
+    out_path.write_text("exists")
+    metrics_path = f"{tmp_path}/metrics.jsonl"
+    with pytest.raises(FileExistsError):
+        main([*strict_runs, "-o", str(out_path), "--metrics-jsonl", metrics_path])
+    (observer,) = closed
+    assert observer._file.closed  # noqa: SLF001
@@ -0,0 +1,144 @@
+"""Tests for the sidecar index of scalar record offsets."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from glob import glob
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pytest
+
+from tensorboard_reducer import load_tb_events, main
+from tensorboard_reducer.index import INDEX_FILE_NAME, read_index, update_index
+
+if TYPE_CHECKING:
+    import io
+    from pathlib import Path
+
+
+@pytest.fixture
+def lax_runs_copy(tmp_path: Path) -> list[str]:
+    """Writable copy of the lax test runs so indexes don't end up in the repo."""
+    run_dirs = []
+    for run_dir in sorted(glob("tests/runs/lax/run_*")):
+        out_dir = f"{tmp_path}/{os.path.basename(run_dir)}"
+        shutil.copytree(run_dir, out_dir)
+        run_dirs.append(out_dir)
+    return run_dirs
+
+
+def test_update_index(lax_runs_copy: list[str]) -> None:
+    run_dir = lax_runs_copy[0]
+    assert read_index(run_dir) is None
+
+    index = update_index(run_dir)
+
+    assert os.path.isfile(f"{run_dir}/{INDEX_FILE_NAME}")
+    assert read_index(run_dir) == index
+    ((file_name, entry),) = index["files"].items()
+    assert entry["size"] == os.path.getsize(f"{run_dir}/{file_name}")
+    assert sorted(entry["tags"]) == ["lax/bar_1", "lax/bar_2", "lax/foo"]
+    for tag_entry in entry["tags"].values():
+        assert tag_entry["steps"] == list(range(110))
+        assert tag_entry["offsets"] == sorted(tag_entry["offsets"])
+
+
+def test_update_index_incremental(lax_runs_copy: list[str]) -> None:
+    """Refreshing after an event file grew only appends the new records and
+    rebuilds from scratch if a file shrank.
+    """
+    run_dir = lax_runs_copy[0]
+    (event_file,) = glob(f"{run_dir}/events.out.tfevents.*")
+    with open(event_file, "rb") as file:
+        data = file.read()
+    full_index = update_index(run_dir)
+    os.remove(f"{run_dir}/{INDEX_FILE_NAME}")
+
+    # cut the file halfway through a record
+    with open(event_file, "wb") as file:
+        file.write(data[: len(data) // 2])
+    partial = update_index(run_dir)
+    (entry,) = partial["files"].values()
+    assert 0 < entry["size"] <= len(data) // 2
+
+    with open(event_file, "wb") as file:
+        file.write(data)
+    assert update_index(run_dir) == full_index
+
+    with open(event_file, "wb") as file:
+        file.write(data[: len(data) // 2])
+    assert update_index(run_dir) == partial
+
+
+def test_update_index_atomic_write(
+    lax_runs_copy: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A failed index write leaves the previous index intact and no temp files."""
+    run_dir = lax_runs_copy[0]
+    (event_file,) = glob(f"{run_dir}/events.out.tfevents.*")
+    with open(event_file, "rb") as file:
+        data = file.read()
+    with open(event_file, "wb") as file:
+        file.write(data[: len(data) // 2])
+    partial = update_index(run_dir)
+    with open(event_file, "wb") as file:
+        file.write(data)
+
+    def failing_dump(obj: object, file: io.TextIOBase) -> None:
+        file.write(json.dumps(obj)[:100])
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(json, "dump", failing_dump)
+    full_index = update_index(run_dir)
+    monkeypatch.undo()
+
+    assert full_index != partial
+    assert read_index(run_dir) == partial
+    expected_files = sorted([os.path.basename(event_file), INDEX_FILE_NAME])
+    assert sorted(os.listdir(run_dir)) == expected_files
+
+    assert update_index(run_dir) == full_index
+    assert read_index(run_dir) == full_index
+    assert sorted(os.listdir(run_dir)) == expected_files
+
+
+@pytest.mark.parametrize(
+    ("tags", "steps"),
+    [(None, None), (["lax/foo"], None), (["lax/bar_*"], (20, 50)), (None, (100, None))],
+)
+def test_load_tb_events_index(
+    lax_runs_copy: list[str],
+    tags: list[str] | None,
+    steps: tuple[int | None, int | None] | None,
+) -> None:
+    kwargs = {"strict_tags": False, "strict_steps": False, "tags": tags}
+    expected = load_tb_events(lax_runs_copy, steps=steps, **kwargs)
+    # first call builds the indexes, second one uses them
+    for _ in range(2):
+        actual = load_tb_events(lax_runs_copy, steps=steps, index=True, **kwargs)
+        assert list(actual) == list(expected)
+        for tag, df in expected.items():
+            pd.testing.assert_frame_equal(actual[tag], df)
+
+    if tags is not None:
+        assert all(tag.startswith(tags[0].rstrip("*")) for tag in actual)
+    if steps is not None:
+        first, last = steps
+        for df in actual.values():
+            assert df.index.min() >= first
+            assert last is None or df.index.max() <= last
+
+
+def test_main_index_subcommand(
+    lax_runs_copy: list[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert main(["index", *lax_runs_copy, "--verbose"]) == 0
+
+    for run_dir in lax_runs_copy:
+        with open(f"{run_dir}/{INDEX_FILE_NAME}") as file:
+            assert json.load(file)["files"]
+    stdout, _ = capsys.readouterr()
+    assert f"- {lax_runs_copy[0]}: 1 event files, 3 tags" in stdout
@@ -10,10 +10,17 @@ import tensorboard_reducer as tbr
 def test_init_imports() -> None:
     """Test that all expected imports are available from tensorboard_reducer."""
     assert callable(tbr.load_tb_events)
+    assert callable(tbr.check_tb_events)
     assert callable(tbr.reduce_events)
+    assert callable(tbr.iter_reduced_tags)
+    assert callable(tbr.register_reduce_op)
+    assert callable(tbr.add_pyramid_levels)
     assert callable(tbr.write_tb_events)
     assert callable(tbr.write_data_file)
+    assert callable(tbr.write_npy_dir)
+    assert callable(tbr.read_npy_dir)
     assert callable(tbr.main)
+    assert issubclass(tbr.JsonLinesObserver, tbr.Observer)
 
 
 def test_init_version() -> None:
@@ -0,0 +1,162 @@
+"""Tests for running many reductions from a TOML job file."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pytest
+
+from tensorboard_reducer import event_loader, load_tb_events, main, reduce_events
+from tensorboard_reducer.jobs import read_jobs, run_jobs
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+runs_dir = os.path.abspath("tests/runs")
+
+
+def _write_jobs(tmp_path: Path, content: str) -> str:
+    jobs_file = tmp_path / "jobs.toml"
+    jobs_file.write_text(content)
+    return str(jobs_file)
+
+
+JOBS_TOML = f"""
+[defaults]
+reduce_ops = ["mean", "max"]
+
+[[jobs]]
+input_dirs = ["{runs_dir}/strict/run_*"]
+outpath = "strict.csv"
+
+[[jobs]]
+input_dirs = ["{runs_dir}/strict/run_*"]
+outpath = "strict-steps.csv"
+reduce_ops = "min"
+steps = [10, 40]
+
+[[jobs]]
+input_dirs = ["{runs_dir}/lax/run_*", "{runs_dir}/strict/run_1"]
+outpath = "lax.csv"
+strict_tags = false
+strict_steps = false
+"""
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_jobs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    jobs = read_jobs(_write_jobs(tmp_path, JOBS_TOML))
+    assert [job["outpath"] for job in jobs] == [
+        f"{tmp_path}/strict.csv",
+        f"{tmp_path}/strict-steps.csv",
+        f"{tmp_path}/lax.csv",
+    ]
+    assert jobs[1]["reduce_ops"] == ["min"]
+
+    if workers == 1:  # parsing happens in-process, so it can be counted
+        n_loads = 0
+        accumulator_reload = event_loader.EventAccumulator.reload
+
+        def counting_reload(
+            self: event_loader.EventAccumulator,
+        ) -> event_loader.EventAccumulator:
+            nonlocal n_loads
+            n_loads += 1
+            return accumulator_reload(self)
+
+        monkeypatch.setattr(event_loader.EventAccumulator, "reload", counting_reload)
+    out_paths = run_jobs(jobs, workers=workers)
+    assert out_paths == [job["outpath"] for job in jobs]
+    if workers == 1:
+        # 3 strict + 3 lax runs, each parsed once
+        assert n_loads == 6  # noqa: PLR2004
+
+    for job in jobs:
+        expected = reduce_events(
+            load_tb_events(
+                job["input_dirs"],
+                strict_tags=job["strict_tags"],
+                strict_steps=job["strict_steps"],
+                steps=job["steps"],
+            ),
+            job["reduce_ops"],
+        )
+        df_out = pd.read_csv(job["outpath"], header=[0, 1], index_col=0)
+        for op, tag_series in expected.items():
+            for tag, series in tag_series.items():
+                actual = df_out[tag][op].dropna()
+                assert actual.index.tolist() == series.index.tolist()
+                assert actual.to_numpy() == pytest.approx(series.to_numpy())
+
+
+# overlapping patterns list run_1 twice
+OVERLAPPING_TOML = f"""
+[[jobs]]
+input_dirs = ["{runs_dir}/strict/run_*", "{runs_dir}/strict/run_1"]
+outpath = "out"
+"""
+
+
+@pytest.mark.parametrize(
+    ("content", "error"),
+    [
+        ("[foo]\n", "Unknown tables"),
+        ("[defaults]\n", "No \\[\\[jobs\\]\\]"),
+        ('[[jobs]]\noutpath = "out"\n', "Missing keys \\['input_dirs'\\]"),
+        ('[[jobs]]\ninput_dirs = []\noutpath = "out"\nfoo = 1\n', "Unknown keys"),
+        ('[[jobs]]\ninput_dirs = ["missing/*"]\noutpath = "out"\n', "match no run"),
+        (
+            f'[[jobs]]\ninput_dirs = ["{runs_dir}/strict/run_*"]\noutpath = "out"\n'
+            * 2,
+            "outpath .* of job 1 is not unique",
+        ),
+        (OVERLAPPING_TOML, "more than once: .* in job 0"),
+    ],
+)
+def test_read_jobs_errors(tmp_path: Path, content: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        read_jobs(_write_jobs(tmp_path, content))
+
+
+def test_main_jobs(tmp_path: Path) -> None:
+    jobs_file = _write_jobs(tmp_path, JOBS_TOML)
+    assert main(["--jobs", jobs_file, "--workers", "1"]) == 0
+    assert sorted(os.listdir(tmp_path)) == [
+        "jobs.toml",
+        "lax.csv",
+        "strict-steps.csv",
+        "strict.csv",
+    ]
+    with pytest.raises(SystemExit):
+        main([])
+
+
+@pytest.mark.parametrize(
+    "flags",
+    [
+        ["-o", "out.csv"],
+        ["-r", "max"],
+        ["--lax-steps"],
+        ["--tags", "strict/*"],
+        ["--steps", "0:10"],
+        ["--interpolate"],
+        ["--elapsed", "60"],
+        ["--pyramid", "10"],
+        ["--max-memory", "1G"],
+        ["--resume", "state"],
+        ["--metrics-jsonl", "-"],
+        [f"{runs_dir}/strict/run_1"],
+    ],
+)
+def test_main_jobs_rejects_ignored_flags(
+    tmp_path: Path, flags: list[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    jobs_file = _write_jobs(tmp_path, JOBS_TOML)
+    with pytest.raises(SystemExit):
+        main(["--jobs", jobs_file, *flags])
+    assert "--jobs can't be combined with" in capsys.readouterr().err
+    assert os.listdir(tmp_path) == ["jobs.toml"]
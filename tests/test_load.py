@@ -3,11 +3,21 @@
 from __future__ import annotations
 
 from glob import glob
+from typing import TYPE_CHECKING
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 import pytest
+from tensorboard.compat.proto.event_pb2 import Event
+from tensorboard.compat.proto.summary_pb2 import Summary
+from tensorboard.summary.writer.event_file_writer import EventFileWriter
 
-from tensorboard_reducer import load_tb_events
+from tensorboard_reducer import RaggedScalars, load_tb_events, reduce_events
+from tensorboard_reducer.load import combine_runs, load_run
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 lax_runs = glob("tests/runs/lax/run_*")
 dup_steps_runs = glob("tests/runs/duplicate_steps/run_*")
@@ -182,6 +192,12 @@ def test_load_tb_events_invalid_inputs() -> None:
     ):
         load_tb_events([])
 
+    # a repeated run would only count once, changing reductions without notice
+    strict_runs = sorted(glob("tests/runs/strict/run_*"))
+    for duplicate in (strict_runs[0], f"{strict_runs[0]}/"):
+        with pytest.raises(ValueError, match="Got input directories more than once"):
+            load_tb_events([*strict_runs, duplicate])
+
     # ValueError when given invalid handle_dup_steps value
     with pytest.raises(ValueError, match="unexpected handle_dup_steps="):
         load_tb_events(glob("tests/runs/strict/run_*"), handle_dup_steps="invalid")  # ty: ignore[invalid-argument-type]
@@ -192,3 +208,222 @@ def test_load_tb_events_invalid_inputs() -> None:
             load_tb_events(
                 lax_runs, strict_steps=False, strict_tags=False, min_runs_per_step=r_min
             )
+
+
+def test_load_tb_events_fsspec_urls(
+    memory_runs: list[str], events_dict: dict[str, pd.DataFrame]
+) -> None:
+    """Runs given as fsspec URLs load the same data as their local copies."""
+    remote_events = load_tb_events(memory_runs)
+
+    assert list(remote_events) == list(events_dict)
+    local_df = events_dict["strict/foo"]
+    remote_df = remote_events["strict/foo"]
+    # column order depends on glob order, so compare sorted column means
+    assert sorted(remote_df.mean()) == pytest.approx(sorted(local_df.mean()))
+    assert list(remote_df.index) == list(local_df.index)
+
+
+def test_load_tb_events_float32() -> None:
+    """dtype='float32' halves memory, reductions are still float64."""
+    strict_runs = glob("tests/runs/strict/run_*")
+    events_64 = load_tb_events(strict_runs)
+    events_32 = load_tb_events(strict_runs, dtype="float32")
+
+    df_64, df_32 = events_64["strict/foo"], events_32["strict/foo"]
+    assert set(df_32.dtypes) == {np.dtype("float32")}
+    assert df_32.to_numpy().nbytes == df_64.to_numpy().nbytes // 2
+    pd.testing.assert_index_equal(df_32.index, df_64.index)
+    np.testing.assert_allclose(df_32, df_64, rtol=1e-6)
+
+    mean_32 = reduce_events(events_32, "mean")["mean"]["strict/foo"]
+    assert mean_32.dtype == np.float64
+
+    with pytest.raises(ValueError, match="Expected a floating point dtype"):
+        load_tb_events(strict_runs, dtype="int64")
+
+
+@pytest.mark.parametrize("min_runs_per_step", [None, 1, 2, 3])
+def test_load_tb_events_ragged(min_runs_per_step: int | None) -> None:
+    """Ragged storage keeps the same steps and values as the dense DataFrames."""
+    kwargs = {"strict_steps": False, "strict_tags": False}
+    dense = load_tb_events(lax_runs, min_runs_per_step=min_runs_per_step, **kwargs)
+    ragged = load_tb_events(
+        lax_runs, min_runs_per_step=min_runs_per_step, ragged=True, **kwargs
+    )
+
+    assert list(ragged) == list(dense)
+    for tag, ragged_tag in ragged.items():
+        assert isinstance(ragged_tag, RaggedScalars)
+        assert ragged_tag.shape == dense[tag].shape
+        assert len(ragged_tag) == len(dense[tag])
+        pd.testing.assert_frame_equal(ragged_tag.to_frame(), dense[tag])
+
+
+def test_load_tb_events_interpolate() -> None:
+    """Interpolating onto the inferred grid matches np.interp() run by run."""
+    kwargs = {"strict_tags": False, "handle_dup_steps": "mean"}
+    runs = [load_tb_events([run], **kwargs) for run in sorted(lax_runs)]
+    events_dict = load_tb_events(sorted(lax_runs), align="interpolate", **kwargs)
+    for tag, df_tag in events_dict.items():
+        run_dfs = [run[tag] for run in runs if tag in run]
+        assert df_tag.shape[1] == len(run_dfs)
+        assert not df_tag.isna().to_numpy().any()
+        for col, df_run in enumerate(run_dfs):
+            expected = np.interp(df_tag.index, df_run.index, df_run.iloc[:, 0])
+            np.testing.assert_allclose(df_tag.iloc[:, col], expected)
+        # grid is the densest run's steps within the shared range
+        assert max(len(df) for df in run_dfs) >= len(df_tag)
+
+
+@pytest.mark.parametrize("min_runs_per_step", [None, 1])
+def test_load_tb_events_interpolate_step_grid(min_runs_per_step: int | None) -> None:
+    kwargs = {"strict_tags": False, "align": "interpolate"}
+    events_dict = load_tb_events(
+        lax_runs, step_grid=10, min_runs_per_step=min_runs_per_step, **kwargs
+    )
+    assert all(len(df) == 10 for df in events_dict.values())  # noqa: PLR2004
+
+    grid = np.arange(-100, 10_000, 50)
+    events_dict = load_tb_events(
+        lax_runs, step_grid=grid, min_runs_per_step=min_runs_per_step, **kwargs
+    )
+    for df_tag in events_dict.values():
+        assert set(df_tag.index) <= set(grid)
+        n_missing = df_tag.isna().sum(axis=1)
+        if min_runs_per_step is None:
+            assert (n_missing == 0).all()
+        else:
+            assert (n_missing < df_tag.shape[1]).all()
+            assert grid[0] not in df_tag.index  # before every run's first step
+
+
+@pytest.mark.parametrize("step_grid", [None, [10, 20, 30, 40]])
+def test_combine_runs_interpolate_unsorted_steps(step_grid: list[int] | None) -> None:
+    """Runs whose steps were logged out of order are sorted before interpolating."""
+    shuffled = pd.DataFrame({"value": [3.0, 4, 1, 2]}, index=[30, 40, 10, 20])
+    ordered = pd.DataFrame({"value": [1.0, 2, 3, 4]}, index=[10, 20, 30, 40])
+    (df_tag,) = combine_runs(
+        {"shuffled": {"loss": shuffled}, "ordered": {"loss": ordered}},
+        align="interpolate",
+        step_grid=step_grid,
+    ).values()
+    assert df_tag.index.tolist() == [10, 20, 30, 40]
+    np.testing.assert_allclose(df_tag.to_numpy(), [[1, 1], [2, 2], [3, 3], [4, 4]])
+
+
+def test_load_tb_events_interpolate_invalid() -> None:
+    with pytest.raises(ValueError, match="unexpected align='nearest'"):
+        load_tb_events(lax_runs, align="nearest")
+
+    with pytest.raises(ValueError, match="Runs don't share any step range"):
+        combine_runs(
+            {
+                "early": {"loss": pd.DataFrame({"value": [1.0, 2]}, index=[0, 1])},
+                "late": {"loss": pd.DataFrame({"value": [1.0, 2]}, index=[5, 6])},
+            },
+            align="interpolate",
+        )
+
+
+def test_combine_runs_elapsed() -> None:
+    """Binning on elapsed time matches a per-run pandas groupby."""
+    rng = np.random.default_rng(0)
+    runs = {}
+    for name, seconds_per_step in (("fast", 1.5), ("slow", 4.0)):
+        n_steps = 100
+        df_run = pd.DataFrame(
+            {
+                "value": rng.normal(size=n_steps),
+                "elapsed": np.arange(n_steps, dtype=np.float32) * seconds_per_step,
+            },
+            index=pd.Index(np.arange(n_steps) * 10, name="step"),
+        )
+        df_run.iloc[3, 0] = np.nan  # NaNs are skipped, not propagated
+        runs[name] = {"loss": df_run}
+
+    time_bin = 10
+    for min_runs_per_step in (None, 1):
+        (df_tag,) = combine_runs(
+            runs,
+            align="elapsed",
+            time_bin=time_bin,
+            min_runs_per_step=min_runs_per_step,
+        ).values()
+        assert df_tag.index.name == "elapsed"
+        for col, df_run in enumerate(run["loss"] for run in runs.values()):
+            bin_start = df_run["elapsed"] // time_bin * time_bin
+            expected = df_run["value"].groupby(bin_start.to_numpy()).mean()
+            actual = df_tag.iloc[:, col].dropna()
+            np.testing.assert_allclose(actual, expected[actual.index])
+        # fast run lasts 148.5 s, slow run 396 s
+        assert df_tag.index[-1] == (140 if min_runs_per_step is None else 390)
+
+    with pytest.raises(ValueError, match="needs runs loaded with wall time"):
+        combine_runs(
+            {"run": {"loss": runs["fast"]["loss"][["value"]]}}, align="elapsed"
+        )
+
+    early = runs["slow"]["loss"].assign(elapsed=lambda df: df["elapsed"] - 5)
+    with pytest.raises(ValueError, match="Tag 'loss' of run 'slow' has scalars logged"):
+        combine_runs({**runs, "slow": {"loss": early}}, align="elapsed")
+
+
+def _write_timed_run(
+    run_dir: str, start: float, seconds_per_step: float, tags: dict[str, range]
+) -> None:
+    """Write a run opened at wall time start that logs each tag at the given steps,
+    step n at start + n * seconds_per_step.
+    """
+    # the file_version event opening the file is stamped with time.time()
+    with mock.patch("time.time", return_value=start):
+        writer = EventFileWriter(run_dir)
+    for step in range(max(steps.stop for steps in tags.values())):
+        values = [
+            Summary.Value(tag=tag, simple_value=step)
+            for tag, steps in tags.items()
+            if step in steps
+        ]
+        wall_time = start + step * seconds_per_step
+        writer.add_event(
+            Event(wall_time=wall_time, step=step, summary=Summary(value=values))
+        )
+    writer.close()
+
+
+def test_load_tb_events_elapsed(tmp_path: Path) -> None:
+    for idx, seconds_per_step in enumerate((2.0, 5.0)):
+        start = 1_700_000_000.0 + idx * 1000
+        _write_timed_run(
+            f"{tmp_path}/run_{idx}", start, seconds_per_step, {"loss": range(50)}
+        )
+    run_dirs = sorted(glob(f"{tmp_path}/run_*"))
+
+    events_dict = load_tb_events(run_dirs, align="elapsed", time_bin=10)
+    df_loss = events_dict["loss"]
+    # runs cover 98 and 245 seconds, only bins both cover are kept
+    assert df_loss.index.tolist() == list(range(0, 100, 10))
+    # mean step logged in each 10 s bin: 5 steps of 2 s, 2 steps of 5 s
+    np.testing.assert_allclose(df_loss.iloc[:, 0], np.arange(10) * 5 + 2)
+    np.testing.assert_allclose(df_loss.iloc[:, 1], np.arange(10) * 2 + 0.5)
+
+    reduced = reduce_events(events_dict, "mean")["mean"]["loss"]
+    assert reduced.index.tolist() == df_loss.index.tolist()
+
+
+@pytest.mark.parametrize("index", [False, True])
+def test_elapsed_ignores_filters(tmp_path: Path, index: bool) -> None:
+    """Elapsed time is measured from the run's first event, not its first scalar
+    left after filtering by tags or steps.
+    """
+    run_dir = f"{tmp_path}/run"
+    _write_timed_run(run_dir, 1e9, 3.0, {"early": range(30), "late": range(10, 30)})
+
+    def elapsed(**filters: object) -> pd.Series:
+        run_dict = load_run(run_dir, wall_time=True, index=index, **filters)
+        return run_dict["late"]["elapsed"]
+
+    unfiltered = elapsed()
+    np.testing.assert_allclose(unfiltered, np.arange(10, 30) * 3.0)
+    pd.testing.assert_series_equal(elapsed(tags=["late"]), unfiltered)
+    pd.testing.assert_series_equal(elapsed(steps=(20, None)), unfiltered.loc[20:])
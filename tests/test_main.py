@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import json
 import os
+import socket
+import threading
+import time
+from argparse import ArgumentTypeError
 from glob import glob
 from typing import TYPE_CHECKING
 
+import pandas as pd
 import pytest
 
-from tensorboard_reducer import main
+from tensorboard_reducer import main, serve
+from tensorboard_reducer.main import (
+    _parse_byte_size,
+    _parse_pyramid_factor,
+    _parse_step_grid,
+    _parse_time_bin,
+)
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -94,3 +106,213 @@ def test_main_report_version(capsys: pytest.CaptureFixture[str], arg: str) -> No
 
     assert stdout.startswith("TensorBoard Reducer v")
     assert stderr == ""
+
+
+def test_main_no_verify_crc(tmp_path: Path) -> None:
+    out_file = f"{tmp_path}/strict.csv"
+    main([*strict_runs, "-o", out_file, "--no-verify-crc"])
+    assert os.path.isfile(out_file)
+
+
+def test_main_float32(tmp_path: Path) -> None:
+    out_file = f"{tmp_path}/strict.csv"
+    main([*strict_runs, "-o", out_file, "--float32", "-r", "mean,std"])
+    assert os.path.isfile(out_file)
+
+
+def test_main_custom_reduce_op(tmp_path: Path) -> None:
+    out_file = f"{tmp_path}/strict.csv"
+    main([*strict_runs, "-o", out_file, "-r", "mean,tests.test_reduce:sem"])
+    df_out = pd.read_csv(out_file, header=[0, 1], index_col=0)
+    assert list(df_out.columns.get_level_values(1)) == ["mean", "tests.test_reduce:sem"]
+
+
+def test_main_smoothing(tmp_path: Path) -> None:
+    out_file = f"{tmp_path}/strict.csv"
+    main(
+        [
+            *strict_runs,
+            "-o",
+            out_file,
+            "-r",
+            "mean,mean@ema0.6",
+            "--smooth-runs",
+            "rolling_mean3",
+        ]
+    )
+    df_out = pd.read_csv(out_file, header=[0, 1], index_col=0)
+    assert list(df_out.columns.get_level_values(1)) == ["mean", "mean@ema0.6"]
+    assert not df_out.isna().any().any()
+
+
+@pytest.mark.parametrize("workers", ["2", "0"])
+def test_main_workers(tmp_path: Path, workers: str) -> None:
+    serial_file, parallel_file = f"{tmp_path}/serial.csv", f"{tmp_path}/parallel.csv"
+    main([*strict_runs, "-o", serial_file, "-r", "mean,max"])
+    main([*strict_runs, "-o", parallel_file, "-r", "mean,max", "--workers", workers])
+    with open(serial_file) as serial, open(parallel_file) as parallel:
+        assert serial.read() == parallel.read()
+
+
+@pytest.mark.parametrize("as_json", [True, False])
+def test_main_check(capsys: pytest.CaptureFixture[str], *, as_json: bool) -> None:
+    json_flag = ["--json"] if as_json else []
+    assert main([*strict_runs, "--check", *json_flag]) == 0
+    stdout, _ = capsys.readouterr()
+    if as_json:
+        assert json.loads(stdout)["ok"] is True
+    else:
+        assert stdout.strip().endswith("OK")
+
+    assert main([*lax_runs, "--check", *json_flag]) == 1
+    stdout, _ = capsys.readouterr()
+    if as_json:
+        assert json.loads(stdout)["ok"] is False
+    else:
+        assert "missing tags" in stdout
+
+    lax_flags = ["--lax-tags", "--lax-steps", "--check", *json_flag]
+    assert main([*lax_runs, "--tags", "lax/foo", "--lax-steps", "--check"]) == 0
+    assert main([*lax_runs, "--tags", "lax/fooo", *lax_flags]) == 1
+
+
+def test_main_filters(tmp_path: Path) -> None:
+    out_file = f"{tmp_path}/lax.csv"
+    filters = ["--tags", "lax/foo,lax/bar_[12]", "--steps", "10:19"]
+    main([*lax_runs, "-o", out_file, "--lax-tags", "--lax-steps", *filters])
+    df_out = pd.read_csv(out_file, header=[0, 1], index_col=0)
+    assert sorted({tag for tag, _ in df_out}) == ["lax/bar_1", "lax/bar_2", "lax/foo"]
+    assert list(df_out.index) == list(range(10, 20))
+
+    with pytest.raises(SystemExit):
+        main([*lax_runs, "-o", out_file, "--steps", "10"])
+
+
+@pytest.mark.parametrize(
+    ("arg", "expected"),
+    [
+        ("1024", 1024),
+        ("512M", 512 * 1024**2),
+        ("1.5g", 3 * 1024**3 // 2),
+        ("8GB", 8 * 1024**3),
+    ],
+)
+def test_parse_byte_size(arg: str, expected: int) -> None:
+    assert _parse_byte_size(arg) == expected
+
+
+@pytest.mark.parametrize("arg", ["", "lots", "-1G", "0"])
+def test_parse_byte_size_invalid(arg: str) -> None:
+    with pytest.raises(ArgumentTypeError, match="expected a"):
+        _parse_byte_size(arg)
+
+
+@pytest.mark.parametrize("grid", [[], ["auto"], ["25"], ["0:500:20"]])
+def test_main_interpolate(tmp_path: Path, grid: list[str]) -> None:
+    out_file = f"{tmp_path}/interpolated.csv"
+    main([*lax_runs, "-o", out_file, "--lax-tags", "--interpolate", *grid])
+    df_out = pd.read_csv(out_file, header=[0, 1], index_col=0)
+    # tags are interpolated onto their own grids, NaN where another tag's grid is
+    n_steps = df_out.count()
+    if grid == ["25"]:
+        assert (n_steps == 25).all()  # noqa: PLR2004
+    elif grid == ["0:500:20"]:
+        assert (df_out.index % 20 == 0).all()
+    else:
+        assert (n_steps > 1).all()
+
+
+@pytest.mark.parametrize(
+    ("arg", "expected"),
+    [("auto", None), ("7", 7), ("0:10:5", [0, 5, 10]), ("1:9:4", [1, 5, 9])],
+)
+def test_parse_step_grid(arg: str, expected: int | list[int] | None) -> None:
+    grid = _parse_step_grid(arg)
+    if isinstance(expected, list):
+        assert grid.tolist() == expected
+    else:
+        assert grid == expected
+
+
+@pytest.mark.parametrize("arg", ["", "1", "dense", "0:10", "10:0:1", "0:10:0"])
+def test_parse_step_grid_invalid(arg: str) -> None:
+    with pytest.raises(ArgumentTypeError, match="expected"):
+        _parse_step_grid(arg)
+
+
+def test_main_elapsed(tmp_path: Path) -> None:
+    out_file = f"{tmp_path}/elapsed.csv"
+    main([*lax_runs, "-o", out_file, "--lax-tags", "--elapsed", "-r", "mean,max"])
+    df_out = pd.read_csv(out_file, header=[0, 1], index_col=0)
+    # test runs were logged within a second, so everything falls in the first bin
+    assert df_out.index.tolist() == [0]
+
+    with pytest.raises(SystemExit):
+        main([*lax_runs, "-o", out_file, "--elapsed", "--interpolate"])
+
+
+@pytest.mark.parametrize(("arg", "expected"), [("auto", None), ("30", 30)])
+def test_parse_time_bin(arg: str, expected: int | None) -> None:
+    assert _parse_time_bin(arg) == expected
+
+
+@pytest.mark.parametrize("arg", ["", "0", "-5", "1.5", "1m"])
+def test_parse_time_bin_invalid(arg: str) -> None:
+    with pytest.raises(ArgumentTypeError, match="expected 'auto' or positive seconds"):
+        _parse_time_bin(arg)
+
+
+@pytest.mark.parametrize("arg", ["1", "0", "-2", "2.5", "x"])
+def test_main_pyramid_invalid(
+    arg: str, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Invalid factors are rejected before any run is loaded."""
+    with pytest.raises(SystemExit):
+        main([*strict_runs, "-o", f"{tmp_path}/out.csv", "--pyramid", arg])
+    assert "expected an integer of at least 2" in capsys.readouterr().err
+    assert _parse_pyramid_factor("2") == 2  # noqa: PLR2004
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_serve_main_cleans_up_socket(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    socket_path = str(tmp_path / "tbr.sock")
+    # socket file left behind by a server that was killed
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(socket_path)
+    assert os.path.exists(socket_path)
+
+    servers = []
+    real_make_server = serve.make_server
+
+    def make_server(*args: object, **kwargs: object) -> object:
+        servers.append(real_make_server(*args, **kwargs))
+        return servers[-1]
+
+    monkeypatch.setattr(serve, "make_server", make_server)
+    thread = threading.Thread(target=main, args=(["serve", "--socket", socket_path],))
+    thread.start()
+    for _ in range(100):
+        if servers:
+            break
+        time.sleep(0.05)
+    servers[0].shutdown()
+    thread.join()
+    assert not os.path.exists(socket_path)
+
+
+def test_main_run_dir_named_like_subcommand(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name, run in zip(["serve", "index"], sorted(strict_runs), strict=False):
+        (tmp_path / name).mkdir()
+        for event_file in glob(f"{run}/events.out.tfevents.*"):
+            with open(event_file, "rb") as file:
+                (tmp_path / name / os.path.basename(event_file)).write_bytes(
+                    file.read()
+                )
+    monkeypatch.chdir(tmp_path)
+    main(["serve", "index", "-o", "reduced.csv", "-r", "mean"])
+    df_out = pd.read_csv("reduced.csv", header=[0, 1], index_col=0)
+    assert df_out.columns.tolist() == [("strict/foo", "mean")]
@@ -0,0 +1,77 @@
+"""Tests for downsampled pyramid levels of reductions."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tensorboard_reducer as tbr
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+rng = np.random.default_rng(0)
+
+
+def _bucket_ref(series: pd.Series, stride: int) -> pd.DataFrame:
+    buckets = series.groupby(np.arange(len(series)) // stride)
+    out = pd.DataFrame(
+        {"min": buckets.min(), "mean": buckets.mean(), "max": buckets.max()}
+    )
+    out.index = series.index[::stride]
+    return out
+
+
+@pytest.mark.parametrize("n_steps", [1, 999, 1001, 25_000])
+def test_add_pyramid_levels(n_steps: int) -> None:
+    series = pd.Series(rng.normal(size=n_steps), index=np.arange(n_steps) * 5)
+    series.iloc[rng.random(n_steps) < 0.1] = np.nan  # noqa: PLR2004
+    reductions = {"mean": {"tag": series}, "max": {"tag": series + 1}}
+    out = tbr.add_pyramid_levels(reductions)
+
+    # levels until one has at most 1000 points
+    strides = [10**k for k in range(1, 4) if n_steps > 1000 * 10 ** (k - 1)]
+    expected_ops = [
+        f"{op}{sfx}" for op in reductions for sfx in ["", *(f"-x{s}" for s in strides)]
+    ]
+    assert list(out) == expected_ops
+    assert out["mean"]["tag"] is series
+    for stride in strides:
+        pd.testing.assert_frame_equal(
+            out[f"mean-x{stride}"]["tag"], _bucket_ref(series, stride)
+        )
+
+
+def test_add_pyramid_levels_n_levels() -> None:
+    series = pd.Series(np.arange(30.0))
+    out = tbr.add_pyramid_levels({"mean": {"tag": series}}, factor=3, n_levels=5)
+    # coarsest level is a single bucket, no need to go on
+    assert list(out) == ["mean", "mean-x3", "mean-x9", "mean-x27", "mean-x81"]
+    assert out["mean-x81"]["tag"].to_dict("records") == [
+        {"min": 0, "mean": 14.5, "max": 29}
+    ]
+
+    for kwargs, error in [
+        ({"factor": 1}, "factor must be"),
+        ({"n_levels": 0}, "n_levels"),
+    ]:
+        with pytest.raises(ValueError, match=error):
+            tbr.add_pyramid_levels({"mean": {"tag": series}}, **kwargs)
+
+
+def test_write_pyramid(tmp_path: Path) -> None:
+    series = pd.Series(np.arange(50.0))
+    out = tbr.add_pyramid_levels({"mean": {"tag": series}}, n_levels=1)
+    out_path = f"{tmp_path}/pyramid.csv"
+    tbr.write_data_file(out, out_path)
+    df_out = pd.read_csv(out_path, header=[0, 1], index_col=0)
+    assert list(df_out.columns.get_level_values(1)) == [
+        "mean",
+        "mean-x10-min",
+        "mean-x10-mean",
+        "mean-x10-max",
+    ]
+    assert df_out["tag"]["mean-x10-max"].dropna().tolist() == [9, 19, 29, 39, 49]
@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+from glob import glob
 from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 import pytest
 
-from tensorboard_reducer import reduce_events
+from tensorboard_reducer import (
+    RaggedScalars,
+    iter_reduced_tags,
+    load_tb_events,
+    reduce_events,
+    register_reduce_op,
+)
+from tensorboard_reducer.load import _to_ragged
+from tensorboard_reducer.reduce import _plan_tasks
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -134,3 +143,168 @@ def test_reduce_events_empty_input(reduce_ops: Sequence[str]) -> None:
     """Test reduce_events with empty input dictionary."""
     reduced_events = reduce_events({}, reduce_ops)
     assert reduced_events == {op: {} for op in reduce_ops}
+
+
+@pytest.mark.parametrize(
+    "reduce_op", ["mean", "std", "var", "min", "max", "median", "sum", "count", "sem"]
+)
+def test_reduce_events_ragged_matches_dense(reduce_op: str) -> None:
+    """Ragged kernels must skip NaNs exactly like pandas does on dense arrays."""
+    rng = np.random.default_rng(0)
+    n_steps, n_runs = 50, 4
+    data = rng.random((n_steps, n_runs))
+    skip_prob = 0.3
+    data[rng.random((n_steps, n_runs)) < skip_prob] = np.nan  # runs skipping steps
+    data[7] = np.nan  # step no run recorded
+    data[9, 1:] = np.nan  # step only one run recorded
+    df_dense = pd.DataFrame(data, index=pd.Index(np.arange(n_steps) * 10, name="step"))
+
+    run_dfs = [df_dense[[col]].dropna() for col in df_dense]
+    ragged = _to_ragged(run_dfs, min_runs_per_step=1)
+    # _to_ragged() drops steps without any value, do the same for the dense array
+    df_dense = df_dense.dropna(how="all")
+
+    expected = reduce_events({"tag": df_dense}, reduce_op)[reduce_op]["tag"]
+    actual = reduce_events({"tag": ragged}, reduce_op)[reduce_op]["tag"]
+
+    np.testing.assert_allclose(actual, expected, equal_nan=True)
+    np.testing.assert_array_equal(actual.index, expected.index)
+
+
+@pytest.mark.parametrize(
+    ("run_glob", "strict"),
+    [("tests/runs/strict/run_*", True), ("tests/runs/lax/run_*", False)],
+)
+def test_iter_reduced_tags(run_glob: str, strict: bool) -> None:
+    input_dirs = sorted(glob(run_glob))
+    ops = ["mean", "std", "max"]
+    kwargs = {"strict_tags": strict, "strict_steps": strict}
+    expected = reduce_events(load_tb_events(input_dirs, **kwargs), ops)
+
+    n_tags = 0
+    for tag, reductions in iter_reduced_tags(input_dirs, ops, **kwargs):
+        assert list(reductions) == ops
+        for op, series in reductions.items():
+            pd.testing.assert_series_equal(series, expected[op][tag])
+        n_tags += 1
+    assert n_tags == len(expected["mean"])
+
+
+def test_iter_reduced_tags_errors() -> None:
+    tag_iter = iter_reduced_tags(sorted(glob("tests/runs/lax/run_*")), "mean")
+    # nothing is loaded until the first tag is requested, then strict checks run
+    # before any tag is yielded
+    with pytest.raises(ValueError, match="Some tags are in some logs but not others"):
+        next(tag_iter)
+
+    with pytest.raises(ValueError, match="Expected non-empty list of input"):
+        next(iter_reduced_tags([], "mean"))
+
+    runs = sorted(glob("tests/runs/strict/run_*"))
+    with pytest.raises(ValueError, match="Got input directories more than once"):
+        next(iter_reduced_tags([*runs, runs[0]], "mean"))
+
+
+@pytest.mark.parametrize("workers", [2, None])
+def test_reduce_events_workers(
+    monkeypatch: pytest.MonkeyPatch, workers: int | None
+) -> None:
+    # small task size so the sample data gets both batched and split
+    monkeypatch.setattr("tensorboard_reducer.reduce._MIN_TASK_SIZE", 50)
+    events_dict = generate_sample_data(n_tags=6, n_runs=10, n_steps=5)
+    events_dict["big_tag"] = generate_sample_data(n_runs=10, n_steps=97)["tag_0"]
+    events_dict["ragged"] = _to_ragged(
+        [events_dict["tag_0"].iloc[:, [idx]] for idx in range(3)], None
+    )
+    ops = ["mean", "std", "median"]
+
+    serial = reduce_events(events_dict, ops)
+    parallel = reduce_events(events_dict, ops, workers=workers)
+
+    for op in ops:
+        assert list(parallel[op]) == list(serial[op])
+        for tag, series in serial[op].items():
+            pd.testing.assert_series_equal(parallel[op][tag], series)
+
+
+def test_plan_tasks(monkeypatch: pytest.MonkeyPatch) -> None:
+    min_task_size = 100
+    monkeypatch.setattr("tensorboard_reducer.reduce._MIN_TASK_SIZE", min_task_size)
+    events_dict = generate_sample_data(n_tags=10, n_runs=10, n_steps=2)
+    events_dict["big_tag"] = generate_sample_data(n_runs=10, n_steps=55)["tag_0"]
+
+    tasks = _plan_tasks(events_dict, workers=2)
+
+    # 10 tiny tags of 20 values are batched 5 per task, the big one split in 6
+    batched = [task for task in tasks if task[0][1] is None]
+    split = [task for task in tasks if task[0][1] is not None]
+    assert [len(task) for task in batched] == [5, 5]
+    assert [task[0][0] for task in split] == ["big_tag"] * 6
+    assert sum(task[0][1].stop - task[0][1].start for task in split) >= len(
+        events_dict["big_tag"]
+    )
+
+    with pytest.raises(ValueError, match="Expected positive number of workers"):
+        reduce_events(events_dict, "mean", workers=0)
+
+
+def sem(block: np.ndarray) -> np.ndarray:
+    """Standard error of the mean, referenced as 'tests.test_reduce:sem'."""
+    n_valid = np.count_nonzero(~np.isnan(block), axis=1)
+    return np.nanstd(block, axis=1, ddof=1) / np.sqrt(n_valid)
+
+
+def test_register_reduce_op(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tensorboard_reducer.reduce._CUSTOM_OPS", {})
+    register_reduce_op("sem", sem)
+
+    @register_reduce_op("spread")
+    def spread(block: np.ndarray) -> np.ndarray:
+        return np.nanmax(block, axis=1) - np.nanmin(block, axis=1)
+
+    events_dict = generate_sample_data(n_tags=2, n_runs=7, n_steps=4)
+    events_dict["ragged"] = _to_ragged(
+        [events_dict["tag_0"].iloc[:, [idx]] for idx in range(3)], None
+    )
+    ops = ["mean", "sem", "spread", "tests.test_reduce:sem"]
+    reduced = reduce_events(events_dict, ops)
+
+    assert list(reduced) == ops
+    for tag, df in events_dict.items():
+        dense = df.to_frame() if isinstance(df, RaggedScalars) else df
+        expected_sem = dense.sem(axis=1)
+        pd.testing.assert_series_equal(
+            reduced["sem"][tag], expected_sem, check_names=False
+        )
+        pd.testing.assert_series_equal(
+            reduced["tests.test_reduce:sem"][tag], expected_sem, check_names=False
+        )
+        expected_spread = dense.max(axis=1) - dense.min(axis=1)
+        np.testing.assert_allclose(reduced["spread"][tag], expected_spread)
+
+
+def test_reduce_op_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tensorboard_reducer.reduce._CUSTOM_OPS", {})
+    events_dict = generate_sample_data()
+
+    with pytest.raises(ValueError, match="Unknown reduce op 'foo'"):
+        reduce_events(events_dict, "foo")
+    with pytest.raises(ValueError, match=r"Failed to import reduce op 'tests\.nope:f'"):
+        reduce_events(events_dict, "tests.nope:f")
+    with pytest.raises(ValueError, match="Importing reduce op 'os:getcwd' is not"):
+        reduce_events(events_dict, "os:getcwd", allow_import=False)
+    with pytest.raises(ValueError, match="Unknown reduce op 'to_csv'"):
+        reduce_events(events_dict, "to_csv@ema0.5", allow_import=False)
+
+    register_reduce_op("bad", lambda block: block[:2, 0])
+    with pytest.raises(ValueError, match="returned shape"):
+        reduce_events(events_dict, "bad")
+
+
+def test_plan_tasks_non_per_step_ops(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tensorboard_reducer.reduce._MIN_TASK_SIZE", 10)
+    events_dict = generate_sample_data(n_tags=1, n_runs=10, n_steps=50)
+
+    assert len(_plan_tasks(events_dict, workers=2)) > 1
+    tasks = _plan_tasks(events_dict, workers=2, split_steps=False)
+    assert tasks == [[("tag_0", None)]]
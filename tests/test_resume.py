@@ -0,0 +1,103 @@
+"""Tests for checkpointed, resumable reductions."""
+
+from __future__ import annotations
+
+import os
+from glob import glob
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pytest
+
+from tensorboard_reducer import load_tb_events, main, reduce_events, resume
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+lax_runs = sorted(glob("tests/runs/lax/run_*"))
+lax_kwargs = {"strict_tags": False, "strict_steps": False, "ragged": True}
+
+
+def _assert_same_reductions(
+    actual: dict[str, dict[str, pd.Series]], expected: dict[str, dict[str, pd.Series]]
+) -> None:
+    assert list(actual) == list(expected)
+    for op, tag_dict in expected.items():
+        assert list(actual[op]) == list(tag_dict)
+        for tag, result in tag_dict.items():
+            if isinstance(result, pd.DataFrame):
+                pd.testing.assert_frame_equal(actual[op][tag], result)
+            else:
+                pd.testing.assert_series_equal(actual[op][tag], result)
+
+
+def test_reduce_with_checkpoints_resumes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ops = ["mean", "std", "ci90"]
+    expected = reduce_events(load_tb_events(lax_runs, **lax_kwargs), ops)
+    n_tags = len(expected["mean"])
+
+    # simulate a crash after reducing 2 tags
+    n_reduced = 0
+    reduce_events_orig = resume.reduce_events
+
+    def crashing_reduce_events(*args: object, **kwargs: object) -> dict:
+        nonlocal n_reduced
+        if n_reduced == 2:  # noqa: PLR2004
+            raise MemoryError
+        n_reduced += 1
+        return reduce_events_orig(*args, **kwargs)
+
+    monkeypatch.setattr(resume, "reduce_events", crashing_reduce_events)
+    with pytest.raises(MemoryError):
+        resume.reduce_with_checkpoints(str(tmp_path), lax_runs, ops, **lax_kwargs)
+    assert len(glob(f"{tmp_path}/runs/*.npz")) == len(lax_runs)
+    assert len(glob(f"{tmp_path}/tags/*/*.npz")) == n_reduced
+
+    # the rerun parses no runs and reduces only the remaining tags
+    n_loads, n_reduced = 0, -n_tags
+    load_run_orig = resume.load_run
+
+    def counting_load_run(*args: object, **kwargs: object) -> dict:
+        nonlocal n_loads
+        n_loads += 1
+        return load_run_orig(*args, **kwargs)
+
+    monkeypatch.setattr(resume, "load_run", counting_load_run)
+    resumed = resume.reduce_with_checkpoints(str(tmp_path), lax_runs, ops, **lax_kwargs)
+    assert n_loads == 0
+    assert n_reduced == -2  # noqa: PLR2004
+    _assert_same_reductions(resumed, expected)
+
+    # different options don't reuse checkpoints of others
+    resume.reduce_with_checkpoints(
+        str(tmp_path), lax_runs, ["max"], tags=["lax/foo"], **lax_kwargs
+    )
+    assert n_loads == len(lax_runs)
+
+
+def test_reduce_with_checkpoints_reparses_changed_runs(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    event_file = glob(f"{lax_runs[0]}/events.out.tfevents.*")[0]
+    event_path = run_dir / os.path.basename(event_file)
+    with open(event_file, "rb") as file:
+        event_path.write_bytes(file.read())
+
+    state_dir = str(tmp_path / "state")
+    resume.reduce_with_checkpoints(state_dir, [str(run_dir)], "mean")
+    stat = event_path.stat()
+    os.utime(event_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    resume.reduce_with_checkpoints(state_dir, [str(run_dir)], "mean")
+    assert len(glob(f"{state_dir}/runs/*.npz")) == 2  # noqa: PLR2004
+
+
+def test_main_resume(tmp_path: Path) -> None:
+    fresh_file, resumed_file = f"{tmp_path}/fresh.csv", f"{tmp_path}/resumed.csv"
+    args = [*lax_runs, "--lax-tags", "--lax-steps", "-r", "mean,std"]
+    main([*args, "-o", fresh_file])
+    for _ in range(2):
+        main([*args, "-o", resumed_file, "-f", "--resume", f"{tmp_path}/state"])
+        with open(fresh_file) as fresh, open(resumed_file) as resumed:
+            assert resumed.read() == fresh.read()
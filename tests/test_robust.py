@@ -0,0 +1,93 @@
+"""Tests for partition-based robust statistics reduce ops."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tensorboard_reducer import reduce_events, robust
+
+rng = np.random.default_rng(0)
+NAN_FRACTION = 0.3
+
+
+def _sample_block(*, with_nans: bool) -> np.ndarray:
+    block = rng.normal(size=(20, 13))
+    if with_nans:
+        block[rng.random(block.shape) < NAN_FRACTION] = np.nan
+        block[3] = np.nan  # a step no run recorded
+    return block
+
+
+def _trimmed_mean_ref(row: np.ndarray, cut: float) -> float:
+    row = np.sort(row[~np.isnan(row)])
+    n_cut = int(cut / 100 * len(row))
+    kept = row[n_cut : len(row) - n_cut]
+    return kept.mean() if len(kept) else np.nan
+
+
+@pytest.mark.parametrize("with_nans", [False, True])
+@pytest.mark.parametrize("q", [0, 5, 25, 50, 97.5, 100])
+def test_percentile(with_nans: bool, q: float) -> None:
+    block = _sample_block(with_nans=with_nans)
+    part = robust.partition_rows(block, robust.percentile_kth(block.shape[1], q))
+    with pytest.warns(RuntimeWarning) if with_nans else np.errstate():
+        expected = np.nanpercentile(block, q, axis=1)
+    np.testing.assert_allclose(robust.percentile(part, q), expected)
+
+
+@pytest.mark.parametrize("with_nans", [False, True])
+@pytest.mark.parametrize("cut", [0, 10, 25, 40])
+def test_trimmed_mean(with_nans: bool, cut: float) -> None:
+    block = _sample_block(with_nans=with_nans)
+    kth = robust.trimmed_mean_kth(block.shape[1], cut)
+    actual = robust.trimmed_mean(robust.partition_rows(block, kth), cut)
+    expected = [_trimmed_mean_ref(row, cut) for row in block]
+    np.testing.assert_allclose(actual, expected)
+
+
+@pytest.mark.parametrize("with_nans", [False, True])
+def test_mad(with_nans: bool) -> None:
+    block = _sample_block(with_nans=with_nans)
+    part = robust.partition_rows(block, robust.median_kth(block.shape[1]))
+    with pytest.warns(RuntimeWarning) if with_nans else np.errstate():
+        median = np.nanmedian(block, axis=1, keepdims=True)
+        expected = np.nanmedian(np.abs(block - median), axis=1)
+    np.testing.assert_allclose(robust.mad(part), expected)
+
+
+def test_robust_reduce_ops(monkeypatch: pytest.MonkeyPatch) -> None:
+    block = _sample_block(with_nans=False)
+    events_dict = {"tag": pd.DataFrame(block)}
+
+    n_partitions = 0
+    partition_rows = robust.partition_rows
+
+    def counting_partition_rows(block: np.ndarray, kth: list[int]) -> np.ndarray:
+        nonlocal n_partitions
+        n_partitions += 1
+        return partition_rows(block, kth)
+
+    monkeypatch.setattr(robust, "partition_rows", counting_partition_rows)
+    ops = ["mean", "p5", "p50", "p97.5", "iqm", "trimmed_mean", "trimmed_mean_20"]
+    reduced = reduce_events(events_dict, ops)
+
+    # all order statistic ops of a tag share a single partition
+    assert n_partitions == 1
+    np.testing.assert_allclose(reduced["p50"]["tag"], np.median(block, axis=1))
+    np.testing.assert_allclose(
+        reduced["p97.5"]["tag"], np.percentile(block, 97.5, axis=1)
+    )
+    for op, cut in [("iqm", 25), ("trimmed_mean", 10), ("trimmed_mean_20", 20)]:
+        expected = [_trimmed_mean_ref(row, cut) for row in block]
+        np.testing.assert_allclose(reduced[op]["tag"], expected)
+
+
+@pytest.mark.parametrize(
+    ("op", "error"),
+    [("p101", "Percentile must be between"), ("trimmed_mean_50", "less than 50%")],
+)
+def test_robust_reduce_op_errors(op: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        reduce_events({"tag": pd.DataFrame(np.ones((2, 2)))}, op)
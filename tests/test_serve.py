@@ -0,0 +1,260 @@
+"""Tests for the local reduction server and its cache of parsed runs."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+from glob import glob
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pytest
+
+from tensorboard_reducer import load_tb_events, reduce_events
+from tensorboard_reducer.serve import RunCache, make_server
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+strict_runs = sorted(glob("tests/runs/strict/run_*"))
+lax_runs = sorted(glob("tests/runs/lax/run_*"))
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    server = make_server(RunCache(2**30), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url: str, body: dict[str, Any]) -> tuple[int, Any]:
+    request = urllib.request.Request(  # noqa: S310
+        f"{url}/reduce", data=json.dumps(body).encode(), method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.load(exc)
+
+
+@pytest.mark.parametrize(
+    ("input_dirs", "strict"), [(strict_runs, True), (lax_runs, False)]
+)
+def test_reduce_endpoint(server_url: str, input_dirs: list[str], strict: bool) -> None:
+    ops = ["mean", "max"]
+    body = {
+        "input_dirs": input_dirs,
+        "reduce_ops": ops,
+        "strict_tags": strict,
+        "strict_steps": strict,
+    }
+    expected = reduce_events(
+        load_tb_events(input_dirs, strict_tags=strict, strict_steps=strict), ops
+    )
+
+    for _ in range(2):  # second request is served from the cache
+        status, out = _post(server_url, body)
+        assert status == HTTPStatus.OK
+        assert set(out) == set(ops)
+        for op in ops:
+            assert set(out[op]) == set(expected[op])
+            for tag, series in expected[op].items():
+                assert out[op][tag]["steps"] == series.index.tolist()
+                values = np.array(out[op][tag]["values"], dtype=float)
+                np.testing.assert_allclose(values, series.to_numpy())
+
+    with urllib.request.urlopen(f"{server_url}/stats") as response:  # noqa: S310
+        stats = json.load(response)
+    assert stats["misses"] == len(input_dirs)
+    assert stats["hits"] == len(input_dirs)
+
+
+@pytest.mark.parametrize(
+    ("body", "error"),
+    [
+        ({"reduce_ops": ["mean"]}, "Expected non-empty list of input_dirs"),
+        ({"input_dirs": strict_runs}, "Missing reduce_ops"),
+        ({"input_dirs": strict_runs, "reduce_ops": "mean", "foo": 1}, "Unknown"),
+        ({"input_dirs": lax_runs, "reduce_ops": "mean"}, "Some tags are in some"),
+        ({"input_dirs": strict_runs, "reduce_ops": "mean", "format": "xml"}, "xml"),
+        ({"input_dirs": strict_runs, "reduce_ops": "not_an_op"}, "not_an_op"),
+        (
+            {"input_dirs": [*strict_runs, strict_runs[0]], "reduce_ops": "mean"},
+            "more than once",
+        ),
+    ],
+)
+def test_reduce_endpoint_bad_request(
+    server_url: str, body: dict[str, Any], error: str
+) -> None:
+    status, out = _post(server_url, body)
+    assert status == HTTPStatus.BAD_REQUEST
+    assert error in out["error"]
+
+
+@pytest.mark.parametrize(
+    "reduce_ops", ["os:getcwd", "no_such_module:func", "to_pickle", ["mean@ema0.5", 1]]
+)
+def test_reduce_endpoint_rejects_untrusted_ops(
+    server_url: str, reduce_ops: str | list[Any]
+) -> None:
+    status, out = _post(
+        server_url, {"input_dirs": strict_runs, "reduce_ops": reduce_ops}
+    )
+    assert status == HTTPStatus.BAD_REQUEST
+    assert "error" in out
+    # ops are checked before any run is loaded
+    with urllib.request.urlopen(f"{server_url}/stats") as response:  # noqa: S310
+        assert json.load(response)["misses"] == 0
+
+
+def test_run_cache_invalidates_changed_runs(tmp_path: Path) -> None:
+    event_file = glob(f"{strict_runs[0]}/events.out.tfevents.*")[0]
+    run_dir = tmp_path / "run_1"
+    run_dir.mkdir()
+    event_path = run_dir / os.path.basename(event_file)
+    with open(event_file, "rb") as file:
+        event_path.write_bytes(file.read())
+
+    cache = RunCache(2**30)
+    first = cache.get(str(run_dir))
+    assert cache.get(str(run_dir)) is first
+    assert cache.stats()["hits"] == 1
+
+    # touching an event file means the run may have new data
+    stat = event_path.stat()
+    os.utime(event_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = cache.get(str(run_dir))
+    assert second is not first
+    assert cache.stats()["misses"] == cache.stats()["runs"] + 1
+
+    # different filters are cached separately
+    third = cache.get(str(run_dir), steps=(0, 100))
+    assert third is not second
+    assert cache.get(str(run_dir)) is second
+
+
+def test_run_cache_evicts_least_recently_used() -> None:
+    run_bytes = RunCache(2**30)
+    run_bytes.get(strict_runs[0])
+    one_run = run_bytes.stats()["bytes"]
+
+    max_runs = 2
+    cache = RunCache(max_runs * one_run)
+    for run_dir in strict_runs:
+        cache.get(run_dir)
+    stats = cache.stats()
+    assert stats["runs"] == max_runs
+    assert stats["bytes"] <= stats["max_bytes"]
+    # the first run was evicted, the last one is still cached
+    cache.get(strict_runs[-1])
+    assert cache.stats()["hits"] == 1
+    cache.get(strict_runs[0])
+    assert cache.stats()["misses"] == len(strict_runs) + 1
+
+    # runs larger than the whole budget are returned but not cached
+    tiny = RunCache(1)
+    assert tiny.get(strict_runs[0])
+    assert tiny.stats()["runs"] == 0
+    assert tiny._key_locks == {}  # noqa: SLF001
+
+
+def test_run_cache_drops_locks_of_failed_loads(tmp_path: Path) -> None:
+    cache = RunCache(2**30)
+    with pytest.raises(FileNotFoundError):
+        cache.get(str(tmp_path / "missing"))
+    event_file = glob(f"{strict_runs[0]}/events.out.tfevents.*")[0]
+    with open(event_file, "rb") as file:
+        data = bytearray(file.read())
+    data[20] ^= 0xFF  # flip bits inside the first payload
+    (tmp_path / os.path.basename(event_file)).write_bytes(data)
+    with pytest.raises(ValueError, match="Corrupted record payload"):
+        cache.get(str(tmp_path))
+    assert cache._key_locks == {}  # noqa: SLF001
+
+
+def test_reduce_endpoint_internal_error(
+    server_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broken(*_args: object) -> None:
+        raise KeyError("boom")
+
+    monkeypatch.setattr("tensorboard_reducer.serve.reduce_request", broken)
+    status, out = _post(server_url, {"input_dirs": strict_runs, "reduce_ops": "mean"})
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert out == {"error": "KeyError: 'boom'"}
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_unix_socket(tmp_path: Path) -> None:
+    socket_path = str(tmp_path / "tbr.sock")
+    server = make_server(RunCache(2**30), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    class UnixConnection(http.client.HTTPConnection):
+        def connect(self) -> None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+
+    conn = UnixConnection("localhost")
+    body = {"input_dirs": strict_runs, "reduce_ops": "mean"}
+    conn.request("POST", "/reduce", body=json.dumps(body))
+    response = conn.getresponse()
+    out = json.load(response)
+    conn.close()
+    server.shutdown()
+    server.server_close()
+
+    assert response.status == HTTPStatus.OK
+    assert list(out["mean"]) == ["strict/foo"]
+
+
+def test_arrow_output(server_url: str) -> None:
+    pa = pytest.importorskip("pyarrow")
+    body = {"input_dirs": strict_runs, "reduce_ops": ["mean"], "format": "arrow"}
+    request = urllib.request.Request(  # noqa: S310
+        f"{server_url}/reduce", data=json.dumps(body).encode(), method="POST"
+    )
+    with urllib.request.urlopen(request) as response:  # noqa: S310
+        table = pa.ipc.open_stream(response.read()).read_all()
+    assert table.column_names == ["tag", "op", "step", "value"]
+    assert table.num_rows == len(
+        reduce_events(load_tb_events(strict_runs), "mean")["mean"]["strict/foo"]
+    )
+
+
+@pytest.mark.parametrize("out_format", ["json", "arrow"])
+def test_multi_output_ops(server_url: str, out_format: str) -> None:
+    if out_format == "arrow":
+        pa = pytest.importorskip("pyarrow")
+    body = {"input_dirs": strict_runs, "reduce_ops": ["mean", "ci95"]}
+    expected = reduce_events(load_tb_events(strict_runs), body["reduce_ops"])
+    request = urllib.request.Request(  # noqa: S310
+        f"{server_url}/reduce",
+        data=json.dumps({**body, "format": out_format}).encode(),
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:  # noqa: S310
+        assert response.status == HTTPStatus.OK
+        raw = response.read()
+
+    for output in ("lower", "upper"):
+        series = expected["ci95"]["strict/foo"][output]
+        if out_format == "json":
+            values = json.loads(raw)[f"ci95-{output}"]["strict/foo"]["values"]
+        else:
+            table = pa.ipc.open_stream(raw).read_all().to_pandas()
+            values = table[table["op"] == f"ci95-{output}"]["value"]
+        np.testing.assert_allclose(np.array(values, dtype=float), series.to_numpy())
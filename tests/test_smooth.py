@@ -0,0 +1,97 @@
+"""Tests for EMA and rolling window smoothing along steps."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tensorboard_reducer import reduce_events, smooth
+
+rng = np.random.default_rng(0)
+NAN_FRACTION = 0.2
+
+
+def _ema_ref(column: np.ndarray, weight: float) -> np.ndarray:
+    """TensorBoard's debiased EMA loop, skipping non-finite values."""
+    out, last, n_seen = column.copy(), 0.0, 0
+    for idx, value in enumerate(column):
+        if not np.isfinite(value):
+            continue
+        last = last * weight + (1 - weight) * value
+        n_seen += 1
+        out[idx] = last / (1 - weight**n_seen) if weight > 0 else last
+    return out
+
+
+@pytest.mark.parametrize("with_nans", [False, True])
+@pytest.mark.parametrize("weight", [0, 0.6, 0.99])
+@pytest.mark.parametrize("n_steps", [1, 127, 1000])
+def test_ema(with_nans: bool, weight: float, n_steps: int) -> None:
+    values = rng.normal(size=(n_steps, 3))
+    if with_nans:
+        values[rng.random(values.shape) < NAN_FRACTION] = np.nan
+    expected = np.column_stack([_ema_ref(col, weight) for col in values.T])
+    np.testing.assert_allclose(smooth.ema(values, weight), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("with_nans", [False, True])
+@pytest.mark.parametrize("window", [1, 4, 11])
+def test_rolling(with_nans: bool, window: int) -> None:
+    values = rng.normal(size=(50, 3))
+    if with_nans:
+        values[rng.random(values.shape) < NAN_FRACTION] = np.nan
+    rolling = pd.DataFrame(values).rolling(window, center=True, min_periods=1)
+    np.testing.assert_allclose(
+        smooth.rolling_mean(values, window), rolling.mean().to_numpy()
+    )
+    np.testing.assert_allclose(
+        smooth.rolling_median(values, window), rolling.median().to_numpy()
+    )
+
+
+@pytest.mark.parametrize(
+    ("name", "error"),
+    [
+        ("ema1", "EMA weight must be in"),
+        ("rolling_mean0", "at least 1 step"),
+        ("gaussian3", "Unknown smoother"),
+    ],
+)
+def test_parse_smoother_errors(name: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        smooth.parse_smoother(name)
+
+
+def test_smoothed_reduce_ops() -> None:
+    values = rng.normal(size=(30, 4))
+    events_dict = {"tag": pd.DataFrame(values)}
+    ops = ["mean@ema0.6", "mean", "max@rolling_median5", "ci90@rolling_mean3"]
+    reduced = reduce_events(events_dict, ops)
+
+    assert list(reduced) == ops
+    mean = reduced["mean"]["tag"]
+    np.testing.assert_allclose(
+        reduced["mean@ema0.6"]["tag"], _ema_ref(mean.to_numpy(), 0.6)
+    )
+    max_ = pd.Series(values.max(axis=1)).rolling(5, center=True, min_periods=1)
+    np.testing.assert_allclose(reduced["max@rolling_median5"]["tag"], max_.median())
+    # multi-output ops are smoothed per output
+    ci = reduce_events(events_dict, "ci90")["ci90"]["tag"]
+    smoothed_ci = reduced["ci90@rolling_mean3"]["tag"]
+    assert list(smoothed_ci.columns) == list(ci.columns)
+    expected = ci.rolling(3, center=True, min_periods=1).mean()
+    np.testing.assert_allclose(smoothed_ci, expected)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_smooth_runs(workers: int) -> None:
+    values = rng.normal(size=(40, 5))
+    values[rng.random(values.shape) < NAN_FRACTION] = np.nan
+    reduced = reduce_events(
+        {"tag": pd.DataFrame(values)}, "mean", workers=workers, smooth_runs="ema0.9"
+    )
+    expected = np.nanmean(
+        np.column_stack([_ema_ref(col, 0.9) for col in values.T]), axis=1
+    )
+    np.testing.assert_allclose(reduced["mean"]["tag"], expected)
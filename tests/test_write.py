@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import ast
 import itertools
+import mmap
 import os
+from glob import glob
 from typing import TYPE_CHECKING
 
 import pandas as pd
@@ -111,3 +113,130 @@ def test_write_data_file_with_bad_ext(
 ) -> None:
     with pytest.raises(ValueError, match="has unknown extension, should be one of"):
         tbr.write_data_file(reduced_events, "foo.bad_ext")
+
+
+@pytest.mark.parametrize("extension", [".csv", ".json", ".csv.bz2", ".json.xz"])
+@pytest.mark.parametrize("chunk_size", [7, 10_000])
+def test_write_data_file_streaming_matches_pandas(
+    extension: str,
+    chunk_size: int,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Streamed output must read back into the same DataFrame pandas would write,
+    including tags with different steps that need outer-joining.
+    """
+    monkeypatch.setattr("tensorboard_reducer.write._CHUNK_SIZE", chunk_size)
+    events_dict = tbr.load_tb_events(
+        glob("tests/runs/lax/run_*"), strict_tags=False, strict_steps=False
+    )
+    reduced = tbr.reduce_events(events_dict, ["mean", "std", "count"])
+    file_path = f"{tmp_path}/lax{extension}"
+    tbr.write_data_file(reduced, file_path)
+
+    dict_of_dfs = {op: pd.DataFrame(dic) for op, dic in reduced.items()}
+    df_expected = pd.concat(dict_of_dfs, axis=1)
+    df_expected.columns = df_expected.columns.swaplevel(i=0, j=1)
+    df_expected.index.name = "step"
+
+    if ".csv" in extension:
+        df_actual = pd.read_csv(file_path, header=[0, 1], index_col=0)
+    else:
+        df_actual = pd.read_json(file_path)
+        df_actual.columns = pd.MultiIndex.from_tuples(
+            map(ast.literal_eval, df_actual.columns)
+        )
+        df_actual.index.name = "step"
+    pd.testing.assert_frame_equal(
+        df_actual, df_expected, check_dtype=False, check_column_type=False
+    )
+
+
+def test_write_multi_output_ops(
+    events_dict: dict[str, pd.DataFrame], tmp_path: Path
+) -> None:
+    reduced = tbr.reduce_events(events_dict, ["mean", "ci95"])
+
+    out_dirs = tbr.write_tb_events(reduced, f"{tmp_path}/reduced")
+    assert sorted(map(os.path.basename, out_dirs)) == [
+        "reduced-ci95-lower",
+        "reduced-ci95-upper",
+        "reduced-mean",
+    ]
+
+    csv_path = tbr.write_data_file(reduced, f"{tmp_path}/reduced.csv")
+    df_csv = pd.read_csv(csv_path, header=[0, 1], index_col=0)
+    assert list(df_csv.columns.get_level_values(1)) == [
+        "mean",
+        "ci95-lower",
+        "ci95-upper",
+    ]
+    lower = reduced["ci95"]["strict/foo"]["lower"]
+    assert df_csv["strict/foo", "ci95-lower"].to_numpy() == pytest.approx(lower)
+
+
+@pytest.mark.parametrize("mmap_mode", ["r", None])
+def test_write_npy_dir(
+    events_dict: dict[str, pd.DataFrame], tmp_path: Path, mmap_mode: str | None
+) -> None:
+    reduced = tbr.reduce_events(events_dict, ["mean", "max", "ci95"])
+    out_dir = tbr.write_npy_dir(reduced, f"{tmp_path}/reduced.npy")
+
+    # all tags have the same steps so share one steps file
+    assert len(glob(f"{out_dir}/steps-*.npy")) == 1
+    loaded = tbr.read_npy_dir(out_dir, mmap_mode=mmap_mode)
+    assert list(loaded) == ["mean", "max", "ci95-lower", "ci95-upper"]
+    for op in loaded:
+        assert list(loaded[op]) == list(events_dict)
+    for tag in events_dict:
+        expected = {
+            "mean": reduced["mean"][tag],
+            "ci95-upper": reduced["ci95"][tag]["upper"],
+        }
+        for op, series in expected.items():
+            pd.testing.assert_series_equal(
+                loaded[op][tag], series, check_names=False, check_index_type=False
+            )
+
+    # values are views of the mapped files
+    base = loaded["mean"][next(iter(events_dict))].to_numpy()
+    while getattr(base, "base", None) is not None:
+        base = base.base
+    assert isinstance(base, mmap.mmap) == (mmap_mode is not None)
+
+    with pytest.raises(FileExistsError):
+        tbr.write_npy_dir(reduced, out_dir)
+    tbr.write_npy_dir({"mean": reduced["mean"]}, out_dir, overwrite=True)
+    assert list(tbr.read_npy_dir(out_dir)) == ["mean"]
+
+
+@pytest.mark.parametrize(
+    ("manifest", "extra_file"),
+    [
+        ("{}", None),  # no version or reductions
+        ("not json", None),
+        (None, "notes.txt"),  # unrelated file next to a valid manifest
+        (None, "99.npy"),  # .npy file not listed in the manifest
+    ],
+)
+def test_write_npy_dir_refuses_foreign_dirs(
+    reduced_events: dict, tmp_path: Path, manifest: str | None, extra_file: str | None
+) -> None:
+    out_dir = tbr.write_npy_dir(reduced_events, f"{tmp_path}/reduced.npy")
+    if manifest is not None:
+        with open(f"{out_dir}/manifest.json", "w") as file:
+            file.write(manifest)
+    if extra_file is not None:
+        with open(f"{out_dir}/{extra_file}", "w") as file:
+            file.write("keep me")
+
+    with pytest.raises(ValueError, match="does not look like it was written"):
+        tbr.write_npy_dir(reduced_events, out_dir, overwrite=True)
+    assert os.path.isfile(f"{out_dir}/manifest.json")
+
+
+def test_main_npy_output(tmp_path: Path) -> None:
+    out_dir = f"{tmp_path}/reduced.npy"
+    tbr.main([*glob("tests/runs/strict/run_*"), "-o", out_dir, "-r", "mean,std"])
+    loaded = tbr.read_npy_dir(out_dir)
+    assert sorted(loaded) == ["mean", "std"]